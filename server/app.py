@@ -1,14 +1,52 @@
 from flask import Flask, jsonify, request
 from flask_cors import CORS
-import time
+from datetime import date
 import os
+import sys
+import threading
+import time
+
+SERVER_DIR = os.path.dirname(os.path.abspath(__file__))
+# Scraper modules live next to the Node code; make them importable here, along
+# with the instrumentation module shared with the embedding service
+sys.path[:0] = [os.path.join(SERVER_DIR, "scripts"), os.path.join(SERVER_DIR, "src", "services"),
+                os.path.join(SERVER_DIR, "python")]
+
+from dedup import DEDUP_ENABLED, EventDeduper  # noqa: E402
+from event_stats import EventStats  # noqa: E402
+from event_store import (DEVPOST_NDJSON_CACHE, MLH_NDJSON_CACHE, EventStore,  # noqa: E402
+                         cache_timestamps, load_cached_events)
+from instrumentation import REGISTRY, instrument_flask, timer  # noqa: E402
+from refresh_scheduler import RefreshScheduler  # noqa: E402
+from response_cache import ResponseCache  # noqa: E402
+from search_index import DEFAULT_ALPHA, EMBEDDING_URL, HybridSearch  # noqa: E402
+from snapshot import MANIFEST, Snapshot  # noqa: E402
 
 app = Flask(__name__)
+instrument_flask(app)
 
 # CORS allowed origin from env
 FRONTEND_URL = os.getenv("FRONTEND_URL", "*")
 CORS(app, origins=[FRONTEND_URL])
 
+DATA_DIR = os.getenv("HACKATHON_DATA_DIR", os.path.join(SERVER_DIR, "data"))
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", os.path.join(DATA_DIR, "snapshot"))
+DEFAULT_PAGE_SIZE = int(os.getenv("HACKATHONS_PAGE_SIZE", 100))
+MAX_PAGE_SIZE = 1000
+
+# Background refresh: every REFRESH_INTERVAL_MINUTES +/- REFRESH_JITTER (fraction)
+REFRESH_INTERVAL = int(os.getenv("REFRESH_INTERVAL_MINUTES", 360)) * 60
+REFRESH_JITTER = float(os.getenv("REFRESH_JITTER", 0.1))
+REFRESH_ENABLED = os.getenv("REFRESH_SCHEDULER", "True") == "True"
+DEVPOST_MAX_PAGES = int(os.getenv("DEVPOST_MAX_PAGES", 10))
+RESPONSE_MAX_AGE = int(os.getenv("RESPONSE_CACHE_MAX_AGE", 60))
+MLH_SEASONS = [s.strip() for s in os.getenv("MLH_SEASONS", "2026").split(",") if s.strip()]
+# Push events to the embedding service's /recommend after every load, and
+# again every RECOMMEND_SYNC_MINUTES so a restarted service catches up
+RECOMMEND_SYNC = os.getenv("RECOMMEND_SYNC", "True") == "True" and bool(EMBEDDING_URL)
+RECOMMEND_SYNC_INTERVAL = int(os.getenv("RECOMMEND_SYNC_MINUTES", 15)) * 60
+RECOMMEND_FIELDS = ("id", "title", "themes", "description", "start_date", "deadline", "is_online", "url", "source")
+
 
 # Sample hackathon data
 sample_hackathons = [
@@ -46,48 +84,295 @@ sample_hackathons = [
 ]
 
 
+store = EventStore()
+search_index = HybridSearch()
+deduper = EventDeduper()
+response_cache = ResponseCache(max_age=RESPONSE_MAX_AGE)
+
+
+REGISTRY.gauge("hackathons_loaded", "Events in the event store", fn=lambda: len(store))
+REGISTRY.gauge("hackathon_cache_age_seconds", "Age of each source's newest scraper cache", ("source",),
+               fn=lambda: {(source, ): time.time() - written
+                           for source, written in cache_timestamps(DATA_DIR).items() if written})
+
+
+def load_store():
+    """(Re)load the store from the scraper caches, falling back to the sample data."""
+    with timer("load.read_caches"):
+        events = load_cached_events(DATA_DIR)
+    if not events:
+        events = [{**h, "id": str(h["id"]), "start_date": None} for h in sample_hackathons]
+    if DEDUP_ENABLED:
+        with timer("load.dedup"):
+            events = deduper.update(events)
+    with timer("load.store"):
+        store.replace_all(events)
+    with timer("load.search_sync"):
+        changes = search_index.sync(events)
+    print(f"Loaded {len(store)} hackathons into the event store (search index: {changes}, "
+          f"merged duplicate groups: {deduper.stats().get('groups', 0)})")
+    if RECOMMEND_SYNC:
+        _recommend_push.set()
+    return len(store)
+
+
+_recommend_push = threading.Event()
+_recommend_status = {"enabled": RECOMMEND_SYNC, "last_sync": None, "last_result": None, "error": None}
+
+
+def push_recommender_events() -> dict:
+    """Send the store's events to the embedding service; it only embeds new or changed ones."""
+    import requests
+
+    events = [{field: event.get(field) for field in RECOMMEND_FIELDS} for event in store.all()]
+    response = requests.post(f"{EMBEDDING_URL}/events/sync", json={"events": events}, timeout=120)
+    response.raise_for_status()
+    return response.json()
+
+
+def recommend_sync_loop():
+    while True:
+        _recommend_push.wait(timeout=RECOMMEND_SYNC_INTERVAL)
+        _recommend_push.clear()
+        try:
+            with timer("recommend.push"):
+                result = push_recommender_events()
+            _recommend_status.update(last_sync=time.time(), last_result=result, error=None)
+        except Exception as e:
+            _recommend_status["error"] = str(e)
+            print(f"Recommender sync failed, retrying in {RECOMMEND_SYNC_INTERVAL // 60} min: {e}")
+
+
+def preload_snapshot_vectors():
+    """Reuse the embeddings of a backup snapshot (scripts/backup.py) instead of re-embedding at startup."""
+    if not os.path.exists(os.path.join(SNAPSHOT_DIR, MANIFEST)):
+        return
+    try:
+        snapshot = Snapshot(SNAPSHOT_DIR)
+        if snapshot.embeddings is not None and "text_hash" in snapshot.columns:
+            search_index.preload_vectors(snapshot.column("text_hash"), snapshot.embeddings)
+            print(f"Preloading {len(snapshot)} event embeddings from {SNAPSHOT_DIR}")
+    except Exception as e:
+        print(f"Could not read snapshot {SNAPSHOT_DIR}: {e}")
+
+
+preload_snapshot_vectors()
+load_store()
+if RECOMMEND_SYNC:
+    threading.Thread(target=recommend_sync_loop, name="recommend-sync", daemon=True).start()
+
+
+def refresh_devpost():
+    from devpost_scraper import DevpostScraper
+
+    scraper = DevpostScraper()
+    hackathons = scraper.scrape_all_hackathons(max_pages=DEVPOST_MAX_PAGES, concurrency=4)
+    if not hackathons:
+        raise RuntimeError("Devpost returned no hackathons, keeping the previous cache")
+    scraper.save_to_ndjson(os.path.join(DATA_DIR, DEVPOST_NDJSON_CACHE))
+    return {"scraped": len(hackathons), "events": load_store()}
+
+
+def refresh_mlh():
+    from mlh_scraper import SEASON_URL, MLHHackathonScraper, create_session
+    from ndjson_cache import write_cache
+
+    session = create_session()
+    events = []
+    failed = []
+    for season in MLH_SEASONS:
+        scraper = MLHHackathonScraper(SEASON_URL.format(season=season), session=session)
+        html = scraper.fetch_page()
+        if not html:
+            failed.append(season)
+            continue
+        events.extend(event for event in scraper.parse_events(html) if event)
+    # Writing only the seasons that worked would drop the failed seasons' events
+    if failed:
+        raise RuntimeError(f"MLH season(s) {', '.join(failed)} failed, keeping the previous cache")
+    if not events:
+        raise RuntimeError("MLH returned no events, keeping the previous cache")
+    write_cache(os.path.join(DATA_DIR, MLH_NDJSON_CACHE), events, source="mlh", seasons=MLH_SEASONS)
+    return {"scraped": len(events), "events": load_store()}
+
+
+scheduler = RefreshScheduler(interval=REFRESH_INTERVAL, jitter=REFRESH_JITTER)
+cached_at = cache_timestamps(DATA_DIR)
+scheduler.add("devpost", refresh_devpost, last_success=cached_at["devpost"])
+scheduler.add("mlh", refresh_mlh, last_success=cached_at["mlh"])
+
+# Under the Flask reloader only the serving child process runs the scheduler
+if REFRESH_ENABLED and (not app.debug or os.environ.get("WERKZEUG_RUN_MAIN") == "true"):
+    scheduler.start()
+
+
+_stats_snapshot = {"version": None, "stats": None}
+_stats_lock = threading.Lock()
+
+
+def stats_engine() -> EventStats:
+    """Columnar statistics snapshot of the store, rebuilt once per data version."""
+    with _stats_lock:
+        if _stats_snapshot["version"] != store.version:
+            version = store.version
+            _stats_snapshot["stats"] = EventStats.from_records(store.all())
+            _stats_snapshot["version"] = version
+        return _stats_snapshot["stats"]
+
+
+def parse_date_arg(name):
+    value = request.args.get(name)
+    return date.fromisoformat(value) if value else None
+
+
 @app.route("/")
 def home():
     return jsonify({"message": "Hackathon Scraper API is running!", "status": "healthy"})
 
 
 @app.route("/api/hackathons", methods=["GET"])
+@response_cache.cached(lambda: store.version)
 def get_hackathons():
-    source = request.args.get("source")
-    status = request.args.get("status")
     online_only = request.args.get("online_only")
+    filters = {
+        "source": request.args.get("source"),
+        "status": request.args.get("status"),
+        "prize_bucket": request.args.get("prize_bucket"),
+        "is_online": True if online_only and online_only.lower() == "true" else None,
+    }
 
-    filtered = sample_hackathons
+    try:
+        limit = min(max(int(request.args.get("limit", DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+        with timer("api.query"):
+            hackathons, next_cursor, total = store.query(
+                filters,
+                start_from=parse_date_arg("start_from"),
+                start_to=parse_date_arg("start_to"),
+                cursor=request.args.get("cursor"),
+                limit=limit,
+            )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
-    if source:
-        filtered = [h for h in filtered if h.get("source") == source]
-    if status:
-        filtered = [h for h in filtered if h.get("status") == status]
-    if online_only and online_only.lower() == "true":
-        filtered = [h for h in filtered if h.get("is_online")]
+    with timer("api.serialize"):
+        return jsonify({
+            "hackathons": hackathons,
+            "total": total,
+            "next_cursor": next_cursor,
+            "last_updated": store.updated_at,
+            "sources": ["devpost", "hackerearth", "mlh", "eventbrite"]
+        })
 
-    return jsonify({
-        "hackathons": filtered,
-        "total": len(filtered),
-        "last_updated": time.time(),
-        "sources": ["devpost", "hackerearth", "mlh", "eventbrite"]
+
+@app.route("/api/hackathons/search", methods=["GET"])
+@response_cache.cached(lambda: (store.version, search_index.version))
+def search_hackathons():
+    query = (request.args.get("q") or "").strip()
+    if not query:
+        return jsonify({"error": "q is required"}), 400
+
+    online_only = request.args.get("online_only")
+    allow = store.matching_ids({
+        "source": request.args.get("source"),
+        "status": request.args.get("status"),
+        "prize_bucket": request.args.get("prize_bucket"),
+        "is_online": True if online_only and online_only.lower() == "true" else None,
     })
 
+    try:
+        limit = min(max(int(request.args.get("limit", 20)), 1), 100)
+        alpha = float(request.args.get("alpha", DEFAULT_ALPHA))
+        mode = request.args.get("mode", "linear")
+        with timer("api.search"):
+            ranked, semantic = search_index.search(query, limit=limit, alpha=alpha, mode=mode, allow=allow)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    results = []
+    for event_id, score, keyword_score, semantic_score in ranked:
+        event = store.get(event_id)
+        if event is not None:
+            results.append({**event, "score": round(score, 4), "bm25": round(keyword_score, 4),
+                            "similarity": round(semantic_score, 4)})
+
+    with timer("api.serialize"):
+        response = jsonify({
+            "query": query,
+            "results": results,
+            "mode": mode,
+            "alpha": alpha,
+            "semantic": semantic,
+            "index": search_index.stats(),
+        })
+    if search_index.semantic_enabled and alpha < 1 and not semantic:
+        # Keyword-only because the embedding service failed: don't let the
+        # response cache keep serving it after the service recovers
+        response.headers["Cache-Control"] = "no-store"
+    return response
+
 
 @app.route("/api/statistics", methods=["GET"])
+@response_cache.cached(lambda: store.version)
 def get_statistics():
-    return jsonify({
-        "total": len(sample_hackathons),
-        "by_source": {"devpost": 2, "hackerearth": 1},
-        "online_count": 2,
-        "total_prize": 50000,
-        "average_prize": 16666.67
-    })
+    try:
+        top = min(max(int(request.args.get("top", 10)), 1), 100)
+        engine = stats_engine()
+        return jsonify({
+            **store.statistics(),
+            "by_state": engine.group("state"),
+            "by_theme": engine.group("theme", top=top),
+            "by_organization": engine.group("organization", top=top),
+            "prize_percentiles": engine.prize_percentiles(),
+            "registration_histogram": engine.registration_histogram(),
+            "trends": engine.trends(request.args.get("freq", "M")),
+        })
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
 
 @app.route("/api/refresh", methods=["POST"])
 def refresh_data():
-    return jsonify({"message": "Data refreshed!", "count": len(sample_hackathons), "last_updated": time.time()})
+    """
+    Trigger a refresh of one source (?source=devpost|mlh) or all of them.
+
+    Concurrent calls join the run already in flight. Without ?wait=true this
+    returns 202 immediately and the current data keeps being served until
+    the refresh lands.
+    """
+    try:
+        futures = scheduler.trigger(request.args.get("source"))
+    except KeyError as e:
+        return jsonify({"error": str(e.args[0])}), 400
+
+    wait = (request.args.get("wait") or "").lower() == "true"
+    if wait:
+        for future in futures.values():
+            try:
+                future.result()
+            except Exception:
+                pass  # reported in the job status below
+
+    return jsonify({
+        "message": "Data refreshed!" if wait else "Refresh started",
+        "count": len(store),
+        "last_updated": store.updated_at,
+        "jobs": {name: scheduler.jobs[name].status() for name in futures},
+    }), 200 if wait else 202
+
+
+@app.route("/api/refresh/status", methods=["GET"])
+def refresh_status():
+    return jsonify({**scheduler.status(), "count": len(store), "last_updated": store.updated_at,
+                    "response_cache": response_cache.stats(),
+                    "dedup": deduper.stats() if DEDUP_ENABLED else {"enabled": False},
+                    "recommender_sync": _recommend_status})
+
+
+@app.before_request
+def roll_statuses():
+    # Statuses are derived from dates at load; bump them (and the store version,
+    # which keys the response cache) on the first request of a new day
+    store.refresh_statuses()
 
 
 @app.after_request
@@ -0,0 +1,40 @@
+"""
+Hackathon API benchmarks: /api/hackathons latency under concurrent load,
+both for repeated queries (answered from the response cache) and for
+distinct ones that reach the event store.
+"""
+import os
+import sys
+from datetime import date, timedelta
+
+from harness import Target, load_metrics, run_load
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+REPEATED = [
+    "/api/hackathons",
+    "/api/hackathons?source=mlh",
+    "/api/hackathons?status=open&limit=20",
+    "/api/hackathons?online_only=true&limit=50",
+]
+
+
+def distinct_query(i: int) -> str:
+    start = date(2025, 1, 1) + timedelta(days=i // 200)
+    return f"/api/hackathons?limit={20 + i % 200}&start_from={start.isoformat()}"
+
+
+def run(args) -> dict:
+    sys.path.insert(0, SERVER_DIR)
+    # No background scrapes while measuring
+    os.environ.setdefault("REFRESH_SCHEDULER", "False")
+    import app as api
+
+    target = Target(api.app, args.api_url)
+    metrics = {}
+    result = run_load(lambda i: target.request("GET", REPEATED[i % len(REPEATED)]) == 200,
+                      args.requests, args.concurrency)
+    metrics.update(load_metrics("hackathons.cached", result))
+    result = run_load(lambda i: target.request("GET", distinct_query(i)) == 200, args.requests, args.concurrency)
+    metrics.update(load_metrics("hackathons.uncached", result))
+    return metrics
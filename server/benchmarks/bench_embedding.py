@@ -0,0 +1,49 @@
+"""
+Embedding service benchmarks: model.encode throughput per batch size and
+/embed and /similarity latency under concurrent load.
+
+Runs against embedding_service's Flask app in-process unless --embedding-url
+points at a running server (e.g. gunicorn with several workers).
+"""
+import os
+import statistics
+import sys
+import uuid
+
+import numpy as np
+
+from harness import Target, load_metrics, metric, run_load, time_calls
+
+PYTHON_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "python")
+
+SENTENCE = "Team of three building a climate data dashboard with React, Flask and PyTorch"
+
+
+def run(args) -> dict:
+    sys.path.insert(0, PYTHON_DIR)
+    # Load the model at import instead of in the background
+    os.environ.setdefault("EMBED_PRELOAD", "True")
+    import embedding_service as service
+
+    metrics = {}
+    model = service.loader.get(timeout=600)
+    for size in args.batch_sizes:
+        texts = [f"{SENTENCE} #{i}" for i in range(size)]
+        timings = time_calls(lambda: model.encode(texts, batch_size=size), runs=args.runs)
+        metrics[f"encode.batch_{size}.texts_per_s"] = metric(size / statistics.median(timings), "texts/s", "higher")
+
+    target = Target(service.app, args.embedding_url)
+    # Unique texts so every request misses the embedding cache and reaches the model
+    run_id = uuid.uuid4().hex[:8]
+    result = run_load(
+        lambda i: target.request("POST", "/embed", {"text": f"{SENTENCE} {run_id}-{i}"}) == 200,
+        args.requests, args.concurrency)
+    metrics.update(load_metrics("embed", result))
+
+    rng = np.random.default_rng(0)
+    pairs = rng.standard_normal((16, 2, service.EMBEDDING_DIM)).astype(np.float32).tolist()
+    result = run_load(
+        lambda i: target.request("POST", "/similarity", {"vec1": pairs[i % 16][0], "vec2": pairs[i % 16][1]}) == 200,
+        args.requests, args.concurrency)
+    metrics.update(load_metrics("similarity", result))
+    return metrics
@@ -0,0 +1,56 @@
+"""
+Scraper parsing benchmarks on the recorded data in server/data: the MLH
+season page fixture, the Devpost cache records and loading every cache into
+normalized events.
+"""
+import json
+import os
+import re
+import sys
+
+from harness import time_calls, timing_metrics
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(SERVER_DIR, "data")
+MLH_FIXTURE = os.path.join(DATA_DIR, "fixtures", "mlh_events_2026.html")
+DEVPOST_CACHE = os.path.join(DATA_DIR, "devpost_hackathons_cache.json")
+
+
+def api_record(cached: dict) -> dict:
+    """Rebuild the Devpost API shape extract_hackathon_data() expects from a camelCase cache record."""
+    record = {re.sub(r"(?<!^)(?=[A-Z])", "_", key).lower(): value for key, value in cached.items()}
+    record.update({
+        "prize_amount": cached.get("prizeAmountRaw"),
+        "online": cached.get("isOnline"),
+        "displayed_location": {"location": cached.get("displayedLocation")},
+    })
+    return record
+
+
+def run(args) -> dict:
+    sys.path[:0] = [os.path.join(SERVER_DIR, "scripts"), os.path.join(SERVER_DIR, "src", "services"), SERVER_DIR]
+    from devpost_scraper import DevpostScraper, record_hash
+    from event_store import load_cached_events, normalize_devpost
+    from mlh_scraper import MLHHackathonScraper
+
+    metrics = {}
+    with open(MLH_FIXTURE, "r", encoding="utf-8") as f:
+        html = f.read()
+    scraper = MLHHackathonScraper()
+    metrics.update(timing_metrics(f"mlh.parse_events.{scraper.parser}",
+                                  time_calls(lambda: scraper.parse_events(html), runs=args.runs)))
+
+    with open(DEVPOST_CACHE, "r", encoding="utf-8") as f:
+        text = f.read()
+    metrics.update(timing_metrics("devpost.json_load", time_calls(lambda: json.loads(text), runs=args.runs)))
+    cached = json.loads(text)["events"]
+    raw = [api_record(r) for r in cached]
+    devpost = DevpostScraper()
+    metrics.update(timing_metrics("devpost.extract", time_calls(
+        lambda: [record_hash(devpost.extract_hackathon_data(r)) for r in raw], runs=args.runs)))
+    metrics.update(timing_metrics("devpost.normalize", time_calls(
+        lambda: [normalize_devpost(r) for r in cached], runs=args.runs)))
+
+    metrics.update(timing_metrics("caches.load_cached_events", time_calls(
+        lambda: load_cached_events(DATA_DIR), runs=args.runs)))
+    return metrics
@@ -0,0 +1,196 @@
+"""
+Timing, load generation and baseline comparison shared by the benchmarks.
+
+Every benchmark returns metrics as {name: {"value", "unit", "better"}} where
+`better` is "lower" (latencies) or "higher" (throughput). A run is written
+as JSON together with the machine it ran on, and compare() checks a run
+against a saved baseline metric by metric.
+"""
+import json
+import os
+import platform
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+# Relative slowdown tolerated before a metric counts as a regression
+DEFAULT_TOLERANCE = 0.2
+
+
+def metric(value: float, unit: str, better: str = "lower") -> Dict:
+    return {"value": round(float(value), 4), "unit": unit, "better": better}
+
+
+def time_calls(fn: Callable[[], object], runs: int = 5, warmup: int = 1) -> List[float]:
+    """Wall-clock seconds of `runs` calls to fn after `warmup` untimed ones."""
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def timing_metrics(prefix: str, timings: List[float]) -> Dict[str, Dict]:
+    """Best and median of repeated runs, in milliseconds."""
+    return {
+        f"{prefix}.best_ms": metric(min(timings) * 1000, "ms"),
+        f"{prefix}.median_ms": metric(statistics.median(timings) * 1000, "ms"),
+    }
+
+
+def run_load(call: Callable[[int], bool], requests: int, concurrency: int) -> Dict:
+    """
+    Issue `requests` calls from `concurrency` threads and collect latencies.
+
+    Args:
+        call: Makes request number i; returns whether it succeeded
+        requests: Total number of calls
+        concurrency: Number of threads issuing calls
+
+    Returns:
+        {"latencies": [seconds], "errors": int, "seconds": total wall time}
+    """
+    latencies, errors = [], 0
+    lock = threading.Lock()
+    counter = iter(range(requests))
+
+    def worker():
+        nonlocal errors
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            started = time.perf_counter()
+            ok = call(i)
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+                errors += not ok
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in [pool.submit(worker) for _ in range(concurrency)]:
+            future.result()
+    return {"latencies": latencies, "errors": errors, "seconds": time.perf_counter() - started}
+
+
+def load_metrics(prefix: str, result: Dict) -> Dict[str, Dict]:
+    """Latency percentiles, throughput and error rate of a run_load() result."""
+    latencies = np.asarray(result["latencies"]) * 1000
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+    return {
+        f"{prefix}.p50_ms": metric(p50, "ms"),
+        f"{prefix}.p90_ms": metric(p90, "ms"),
+        f"{prefix}.p99_ms": metric(p99, "ms"),
+        f"{prefix}.throughput_rps": metric(len(latencies) / result["seconds"], "req/s", "higher"),
+        f"{prefix}.error_rate": metric(result["errors"] / max(len(latencies), 1), "ratio"),
+    }
+
+
+def environment() -> Dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+    }
+
+
+def save_results(path: str, metrics: Dict[str, Dict], config: Optional[Dict] = None):
+    payload = {"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "environment": environment(),
+               "config": config or {}, "metrics": dict(sorted(metrics.items()))}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+        f.write("\n")
+
+
+def load_results(path: str) -> Dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(baseline: Dict[str, Dict], current: Dict[str, Dict], tolerance: float = DEFAULT_TOLERANCE) -> List[Dict]:
+    """
+    Compare two metric sets; one row per metric present in both.
+
+    A metric regresses when it is more than `tolerance` (relative) worse
+    than the baseline in its `better` direction. Error rates regress on any
+    increase.
+
+    Returns:
+        [{"name", "baseline", "current", "change", "regression"}] sorted by name
+    """
+    rows = []
+    for name in sorted(set(baseline) & set(current)):
+        before, after = baseline[name]["value"], current[name]["value"]
+        lower_is_better = current[name].get("better", "lower") == "lower"
+        change = (after - before) / before if before else (0.0 if after == before else float("inf"))
+        if name.endswith("error_rate"):
+            regression = after > before
+        elif lower_is_better:
+            regression = change > tolerance
+        else:
+            regression = change < -tolerance
+        rows.append({"name": name, "baseline": before, "current": after, "unit": current[name]["unit"],
+                     "change": change, "regression": regression})
+    return rows
+
+
+def print_metrics(metrics: Dict[str, Dict], out=sys.stdout):
+    width = max((len(name) for name in metrics), default=10)
+    for name, m in sorted(metrics.items()):
+        print(f"  {name:<{width}} {m['value']:>12.3f} {m['unit']}", file=out)
+
+
+def print_comparison(rows: List[Dict], out=sys.stdout):
+    width = max((len(row["name"]) for row in rows), default=10)
+    print(f"  {'metric':<{width}} {'baseline':>12} {'current':>12} {'change':>8}", file=out)
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(f"  {row['name']:<{width}} {row['baseline']:>12.3f} {row['current']:>12.3f} "
+              f"{row['change']:>+8.1%}{flag}", file=out)
+
+
+class Target:
+    """
+    Sends requests to a Flask app in-process (one test client per thread) or,
+    when base_url is given, to a running server over HTTP.
+    """
+
+    def __init__(self, app=None, base_url: Optional[str] = None):
+        if app is None and not base_url:
+            raise ValueError("Need an app or a base_url")
+        self.app = app
+        self.base_url = base_url.rstrip("/") if base_url else None
+        self._local = threading.local()
+
+    def _client(self):
+        client = getattr(self._local, "client", None)
+        if client is None:
+            if self.base_url:
+                import requests
+                client = requests.Session()
+            else:
+                client = self.app.test_client()
+            self._local.client = client
+        return client
+
+    def request(self, method: str, path: str, json: Optional[Dict] = None) -> int:
+        """Status code of one request (599 when it could not be sent)."""
+        client = self._client()
+        try:
+            if self.base_url:
+                return client.request(method, self.base_url + path, json=json, timeout=60).status_code
+            return client.open(path, method=method, json=json).status_code
+        except Exception:
+            return 599
@@ -0,0 +1,97 @@
+"""
+Benchmark and load-test suite for the Python services.
+
+    python benchmarks/run.py                                 # every suite, print results
+    python benchmarks/run.py --suite scrapers --suite api    # selected suites
+    python benchmarks/run.py --save-baseline                 # record benchmarks/baseline.json
+    python benchmarks/run.py --compare                       # exit 1 on regressions vs the baseline
+    python benchmarks/run.py --embedding-url http://localhost:5002 --suite embedding
+
+Suites:
+    embedding  model.encode throughput per batch size; /embed and /similarity latency
+    api        /api/hackathons latency, response-cache hits and misses
+    scrapers   MLH fixture parsing, Devpost record extraction, cache loading
+
+Load tests run through Flask test clients in-process unless a server URL is
+given. Suites whose dependencies are not installed are skipped. Baselines
+are only comparable on the same machine and configuration; the environment
+is stored alongside the metrics.
+"""
+import argparse
+import os
+import sys
+
+import harness
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+SUITES = ("embedding", "api", "scrapers")
+
+
+def run_suite(name: str, args) -> dict:
+    if name == "embedding":
+        import bench_embedding as suite
+    elif name == "api":
+        import bench_api as suite
+    else:
+        import bench_scrapers as suite
+    return suite.run(args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--suite", action="append", choices=SUITES, help="Suite to run (repeatable, default: all)")
+    parser.add_argument("--runs", type=int, default=5, help="Timed repetitions per micro-benchmark")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per load test")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients per load test")
+    parser.add_argument("--batch-sizes", type=lambda s: [int(x) for x in s.split(",")], default=[1, 8, 32, 128],
+                        help="Comma-separated model.encode batch sizes")
+    parser.add_argument("--embedding-url", help="Load-test a running embedding service instead of the in-process app")
+    parser.add_argument("--api-url", help="Load-test a running hackathon API instead of the in-process app")
+    parser.add_argument("--output", help="Write this run's results to a JSON file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="Write this run as the baseline")
+    parser.add_argument("--compare", action="store_true", help="Compare against the baseline; exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=harness.DEFAULT_TOLERANCE,
+                        help="Relative slowdown allowed before a metric is a regression")
+    args = parser.parse_args()
+
+    metrics, skipped = {}, []
+    for name in args.suite or SUITES:
+        print(f"Running {name} benchmarks...")
+        try:
+            results = run_suite(name, args)
+        except ImportError as e:
+            print(f"  skipped ({e.name or e} not installed)")
+            skipped.append(name)
+            continue
+        harness.print_metrics(results)
+        metrics.update({f"{name}.{metric}": value for metric, value in results.items()})
+
+    config = {key: getattr(args, key) for key in ("runs", "requests", "concurrency", "batch_sizes",
+                                                  "embedding_url", "api_url")}
+    config["skipped"] = skipped
+    if args.output:
+        harness.save_results(args.output, metrics, config)
+        print(f"Results written to {args.output}")
+    if args.save_baseline:
+        harness.save_results(args.baseline, metrics, config)
+        print(f"Baseline written to {args.baseline}")
+
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            sys.exit(f"No baseline at {args.baseline}; record one with --save-baseline")
+        baseline = harness.load_results(args.baseline)
+        if baseline.get("environment") != harness.environment():
+            print("Warning: the baseline was recorded in a different environment")
+        rows = harness.compare(baseline["metrics"], metrics, args.tolerance)
+        print(f"\nCompared with {args.baseline} (tolerance {args.tolerance:.0%}):")
+        harness.print_comparison(rows)
+        regressions = [row["name"] for row in rows if row["regression"]]
+        if regressions:
+            sys.exit(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        print("No regressions")
+
+
+if __name__ == "__main__":
+    main()
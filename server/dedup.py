@@ -0,0 +1,368 @@
+"""
+Cross-source deduplication of hackathons.
+
+MLH and Devpost often list the same event. Comparing every pair would be
+O(N²), so candidates are blocked first:
+
+- MinHash/LSH over character 3-gram shingles of the title's distinctive
+  part (lowercased, years and generic words such as "hacks" removed), so
+  "Hoya Hacks" and "Hoya Hacks 2026" share LSH buckets;
+- the host of the event URL ("www." stripped);
+
+and only pairs from different sources whose start dates lie within
+DEDUP_DATE_WINDOW_DAYS of each other (or where one date is unknown) are
+scored. The score is the string similarity of the titles, plus a bonus for
+a shared host; pairs in the gray zone below the threshold are re-scored with
+the embedding service's cosine similarity when it is configured. Matches are
+grouped with union-find and each group is merged into one canonical event
+that records where its fields came from.
+
+EventDeduper.update() is incremental: only new or changed events (by title,
+URL, start date and source) are signed and compared again; edges between
+unchanged events are kept from the previous refresh.
+"""
+import difflib
+import hashlib
+import os
+import re
+import threading
+import time
+import zlib
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+import numpy as np
+
+from search_index import EMBEDDING_URL, embed_texts
+
+DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "True") == "True"
+THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", 0.85))
+# String scores in [GRAY_ZONE, THRESHOLD) are re-scored with embeddings
+GRAY_ZONE = float(os.getenv("DEDUP_GRAY_ZONE", 0.6))
+EMBED_WEIGHT = float(os.getenv("DEDUP_EMBED_WEIGHT", 0.3))
+DATE_WINDOW_DAYS = int(os.getenv("DEDUP_DATE_WINDOW_DAYS", 3))
+# Earlier sources win when picking the canonical record of a group
+SOURCE_PRIORITY = [s.strip() for s in os.getenv("DEDUP_SOURCE_PRIORITY", "devpost,mlh").split(",") if s.strip()]
+DOMAIN_BONUS = 0.1
+
+# 16 bands of 4 rows: pairs with shingle Jaccard 0.5 collide ~64% of the time, 0.8 ~99.9%
+BANDS = 16
+ROWS = 4
+MERSENNE = (1 << 31) - 1
+
+YEAR = re.compile(r"\b(19|20)\d{2}\b")
+GENERIC = re.compile(r"hack(athon|ing|s)?|\b(the|annual|edition|season|mlh|devpost)\b")
+
+_rng = np.random.default_rng(20240601)
+_PERM_A = _rng.integers(1, MERSENNE, size=BANDS * ROWS, dtype=np.uint64)
+_PERM_B = _rng.integers(0, MERSENNE, size=BANDS * ROWS, dtype=np.uint64)
+
+
+def normalize_title(title: str) -> str:
+    """Lowercased alphanumeric title with years removed ("Hoya Hacks 2026" -> "hoyahacks")."""
+    return re.sub(r"[^a-z0-9]+", "", YEAR.sub(" ", (title or "").lower()))
+
+
+def title_core(title: str) -> str:
+    """The distinctive part of a title: generic hackathon words removed ("Hoya Hacks 2026" -> "hoya")."""
+    text = YEAR.sub(" ", (title or "").lower())
+    return re.sub(r"[^a-z0-9]+", "", GENERIC.sub(" ", text))
+
+
+def url_host(url: str) -> str:
+    try:
+        host = urlparse(url or "").hostname or ""
+    except ValueError:
+        return ""
+    return host[4:] if host.startswith("www.") else host
+
+
+def shingles(text: str, k: int = 3) -> Set[str]:
+    if len(text) <= k:
+        return {text} if text else set()
+    return {text[i:i + k] for i in range(len(text) - k + 1)}
+
+
+def minhash(shingle_set: Set[str]) -> np.ndarray:
+    """MinHash signature (BANDS * ROWS uint64 values) of a shingle set."""
+    hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) % MERSENNE for s in shingle_set), dtype=np.uint64,
+                         count=len(shingle_set))
+    # (a * x + b) mod p for every permutation and shingle, all operands < 2**31
+    permuted = (np.outer(_PERM_A, hashes) + _PERM_B[:, None]) % MERSENNE
+    return permuted.min(axis=1)
+
+
+def band_keys(signature: np.ndarray) -> List[Tuple[int, bytes]]:
+    rows = signature.reshape(BANDS, ROWS)
+    return [(band, rows[band].tobytes()) for band in range(BANDS)]
+
+
+def title_similarity(a: str, b: str) -> float:
+    """Max of difflib's ratio on normalized titles and the Jaccard of their title words."""
+    ratio = difflib.SequenceMatcher(None, normalize_title(a), normalize_title(b)).ratio()
+    words_a = set(re.findall(r"[a-z0-9]+", YEAR.sub(" ", (a or "").lower())))
+    words_b = set(re.findall(r"[a-z0-9]+", YEAR.sub(" ", (b or "").lower())))
+    jaccard = len(words_a & words_b) / len(words_a | words_b) if words_a and words_b else 0.0
+    return max(ratio, jaccard)
+
+
+def _ordinal(value) -> Optional[int]:
+    try:
+        return date.fromisoformat(str(value)[:10]).toordinal() if value else None
+    except ValueError:
+        return None
+
+
+def _empty(value) -> bool:
+    return value is None or value == "" or value == [] or value == 0
+
+
+class _Entry:
+    """What the deduper remembers about one event between refreshes."""
+
+    __slots__ = ("id", "source", "title", "host", "day", "digest", "bands", "vector")
+
+    def __init__(self, event: Dict, digest: str):
+        self.id = event["id"]
+        self.source = event.get("source")
+        self.title = event.get("title") or ""
+        self.host = url_host(event.get("url"))
+        self.day = _ordinal(event.get("start_date"))
+        self.digest = digest
+        core = title_core(self.title)
+        self.bands = band_keys(minhash(shingles(core))) if core else []
+        self.vector = None
+
+
+class EventDeduper:
+    """
+    Incremental cross-source deduplication.
+
+        deduper = EventDeduper()
+        merged = deduper.update(events)     # at load and on every refresh
+        deduper.stats()
+    """
+
+    def __init__(self, threshold: float = THRESHOLD, date_window: int = DATE_WINDOW_DAYS,
+                 use_embeddings: Optional[bool] = None):
+        self.threshold = threshold
+        self.date_window = date_window
+        self.use_embeddings = bool(EMBEDDING_URL) if use_embeddings is None else use_embeddings
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._buckets = defaultdict(set)
+        self._hosts = defaultdict(set)
+        self._edges = defaultdict(dict)
+        self._last = {}
+        self._rejected_groups = 0
+        self.embed_error = None
+
+    @staticmethod
+    def digest(event: Dict) -> str:
+        key = "\0".join(str(event.get(f) or "") for f in ("source", "title", "url", "start_date"))
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def _insert(self, entry: _Entry):
+        self._entries[entry.id] = entry
+        for key in entry.bands:
+            self._buckets[key].add(entry.id)
+        if entry.host:
+            self._hosts[entry.host].add(entry.id)
+
+    def _remove(self, event_id: str):
+        entry = self._entries.pop(event_id)
+        for key in entry.bands:
+            bucket = self._buckets[key]
+            bucket.discard(event_id)
+            if not bucket:
+                del self._buckets[key]
+        if entry.host:
+            self._hosts[entry.host].discard(event_id)
+            if not self._hosts[entry.host]:
+                del self._hosts[entry.host]
+        for other in self._edges.pop(event_id, {}):
+            self._edges[other].pop(event_id, None)
+            if not self._edges[other]:
+                del self._edges[other]
+
+    def _candidates(self, entry: _Entry) -> Set[str]:
+        found = set()
+        for key in entry.bands:
+            found |= self._buckets.get(key, set())
+        if entry.host:
+            found |= self._hosts.get(entry.host, set())
+        window = self.date_window
+        return {other for other in found
+                if self._entries[other].source != entry.source
+                and (entry.day is None or self._entries[other].day is None
+                     or abs(entry.day - self._entries[other].day) <= window)}
+
+    def _string_score(self, a: _Entry, b: _Entry) -> float:
+        score = title_similarity(a.title, b.title)
+        if a.host and a.host == b.host:
+            score += DOMAIN_BONUS
+        return min(score, 1.0)
+
+    def _embed(self, entries: List[_Entry], events: Dict[str, Dict]) -> bool:
+        """Fill in missing title vectors; False when the embedding service is unavailable."""
+        missing = [e for e in entries if e.vector is None]
+        if not missing:
+            return True
+        texts = [". ".join(p for p in (e.title, events[e.id].get("location")) if p) for e in missing]
+        try:
+            vectors = embed_texts(texts)
+            self.embed_error = None
+        except Exception as e:
+            self.embed_error = str(e)
+            print(f"Dedup embedding failed, using string similarity only: {e}")
+            return False
+        for entry, vector in zip(missing, vectors):
+            entry.vector = vector / (np.linalg.norm(vector) or 1.0)
+        return True
+
+    def update(self, events: Iterable[Dict]) -> List[Dict]:
+        """
+        Deduplicate the full current event list, re-checking only new or changed events.
+
+        Args:
+            events: Normalized events from every source (unique ids)
+
+        Returns:
+            The events with each duplicate group replaced by one merged event
+        """
+        started = time.time()
+        events = list(events)
+        by_id = {event["id"]: event for event in events}
+        with self._lock:
+            removed = [event_id for event_id in self._entries if event_id not in by_id]
+            dirty = []
+            for event in events:
+                digest = self.digest(event)
+                entry = self._entries.get(event["id"])
+                if entry is not None and entry.digest == digest:
+                    continue
+                if entry is not None:
+                    self._remove(event["id"])
+                dirty.append(_Entry(event, digest))
+            for event_id in removed:
+                self._remove(event_id)
+
+            candidates, gray = 0, []
+            for entry in dirty:
+                others = self._candidates(entry)
+                candidates += len(others)
+                for other_id in others:
+                    other = self._entries[other_id]
+                    score = self._string_score(entry, other)
+                    if score >= self.threshold:
+                        self._link(entry.id, other_id, score)
+                    elif score >= GRAY_ZONE and self.use_embeddings:
+                        gray.append((entry, other, score))
+                self._insert(entry)
+
+            embedded = False
+            if gray and self._embed(list({id(e): e for pair in gray for e in pair[:2]}.values()), by_id):
+                embedded = True
+                for a, b, score in gray:
+                    combined = (1 - EMBED_WEIGHT) * score + EMBED_WEIGHT * float(a.vector @ b.vector)
+                    if combined >= self.threshold:
+                        self._link(a.id, b.id, combined)
+
+            merged, groups = self._merge(events)
+            self._last = {
+                "events": len(events),
+                "output": len(merged),
+                "groups": groups,
+                "checked": len(dirty),
+                "removed": len(removed),
+                "candidates": candidates,
+                "gray_zone": len(gray),
+                "rejected_groups": self._rejected_groups,
+                "embeddings_used": embedded,
+                "seconds": round(time.time() - started, 4),
+            }
+        return merged
+
+    def _link(self, a: str, b: str, score: float):
+        score = round(score, 4)
+        self._edges[a][b] = score
+        self._edges[b][a] = score
+
+    def _best_links(self) -> List[Tuple[str, str]]:
+        """
+        Edges that are each endpoint's best match in the other's source, so
+        one listing can't chain two distinct listings of the same source
+        together through a shared match.
+        """
+        best = {}
+        for a, neighbours in self._edges.items():
+            for b, score in neighbours.items():
+                key = (a, self._entries[b].source)
+                if key not in best or (score, best[key][1]) > (best[key][0], b):
+                    best[key] = (score, b)
+        return [(a, b) for a, neighbours in self._edges.items() for b in neighbours
+                if a < b and best[(a, self._entries[b].source)][1] == b
+                and best[(b, self._entries[a].source)][1] == a]
+
+    def _merge(self, events: List[Dict]) -> Tuple[List[Dict], int]:
+        parent = {}
+
+        def find(x):
+            while parent.get(x, x) != x:
+                parent[x] = parent.get(parent[x], parent[x])
+                x = parent[x]
+            return x
+
+        linked = set()
+        for a, b in self._best_links():
+            linked.update((a, b))
+            ra, rb = find(a), find(b)
+            if ra != rb:
+                parent[max(ra, rb)] = min(ra, rb)
+
+        members = defaultdict(list)
+        for event in events:
+            if event["id"] in linked:
+                members[find(event["id"])].append(event)
+        # A group may hold at most one listing per source; otherwise leave it unmerged
+        rejected = {root for root, group in members.items()
+                    if len({e.get("source") for e in group}) != len(group)}
+        self._rejected_groups = len(rejected)
+
+        merged, emitted = [], set()
+        for event in events:
+            root = find(event["id"]) if event["id"] in linked else None
+            if root is None or root in rejected:
+                merged.append(event)
+                continue
+            if root not in emitted:
+                emitted.add(root)
+                merged.append(self._merge_group(members[root]))
+        return merged, len(emitted)
+
+    def _merge_group(self, group: List[Dict]) -> Dict:
+        """Canonical record of a duplicate group: the preferred source's event, gaps filled from the rest."""
+        rank = {source: i for i, source in enumerate(SOURCE_PRIORITY)}
+        group = sorted(group, key=lambda e: (rank.get(e.get("source"), len(rank)), e["id"]))
+        canonical = dict(group[0])
+        for other in group[1:]:
+            for field, value in other.items():
+                if _empty(canonical.get(field)) and not _empty(value):
+                    canonical[field] = value
+        canonical["themes"] = list(dict.fromkeys(t for e in group for t in e.get("themes") or []))
+        canonical["sources"] = sorted({e.get("source") for e in group})
+        edges = self._edges[group[0]["id"]]
+        canonical["provenance"] = [{
+            "source": e.get("source"),
+            "id": e["id"],
+            "url": e.get("url"),
+            "score": 1.0 if i == 0 else edges.get(e["id"], max(self._edges[e["id"]].values())),
+        } for i, e in enumerate(group)]
+        return canonical
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {**self._last, "threshold": self.threshold, "date_window_days": self.date_window,
+                    "embeddings_enabled": self.use_embeddings, "embed_error": self.embed_error}
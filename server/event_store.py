@@ -0,0 +1,496 @@
+"""
+In-memory hackathon store with secondary indexes.
+
+Every event is normalized to the /api/hackathons schema and filed under
+posting lists for source, status, online flag and prize bucket. Posting
+lists are kept sorted by (start date, id), which is also the order results
+are paged in, so a filtered page is a bisect into the smallest matching
+list followed by membership checks against the others until the page is
+full. The global order list doubles as the start-date index for ranges.
+"""
+import base64
+import bisect
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+INDEXED_FIELDS = ("source", "status", "is_online", "prize_bucket")
+
+# (lower bound, label) pairs, highest first
+PRIZE_BUCKETS = ((50000, "50k+"), (10000, "10k-50k"), (1000, "1k-10k"), (1, "1-1k"), (0, "none"))
+
+# Batches larger than this are indexed by append + sort / filter instead of bisect
+BULK_THRESHOLD = 64
+
+# Events without a known start date sort after all dated ones
+NO_DATE = date.max.toordinal()
+
+MONTHS = {m: i for i, m in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], 1)}
+
+
+def prize_bucket(amount) -> str:
+    amount = amount or 0
+    for lower, label in PRIZE_BUCKETS:
+        if amount >= lower:
+            return label
+    return "none"
+
+
+def parse_iso_date(value) -> Optional[date]:
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+def parse_period(text: str) -> Tuple[Optional[date], Optional[date]]:
+    """
+    Parse Devpost submission periods such as "Aug 31 - Nov 19, 2025",
+    "Nov 01 - 30, 2025" or "Dec 15, 2025 - Jan 05, 2026".
+    """
+    if not text or " - " not in text:
+        return None, None
+    left, right = (part.strip() for part in text.split(" - ", 1))
+    left_match = re.match(r"([A-Za-z]{3})\w*\s+(\d{1,2})(?:,\s*(\d{4}))?", left)
+    right_match = re.match(r"(?:([A-Za-z]{3})\w*\s+)?(\d{1,2}),\s*(\d{4})", right)
+    if not left_match or not right_match:
+        return None, None
+
+    try:
+        start_month = MONTHS[left_match.group(1).lower()]
+        end_month = MONTHS[(right_match.group(1) or left_match.group(1)).lower()]
+        end_year = int(right_match.group(3))
+        start_year = int(left_match.group(3)) if left_match.group(3) else end_year
+        if not left_match.group(3) and start_month > end_month:
+            start_year -= 1
+        return (date(start_year, start_month, int(left_match.group(2))),
+                date(end_year, end_month, int(right_match.group(2))))
+    except (KeyError, ValueError):
+        return None, None
+
+
+def status_for(start: Optional[date], end: Optional[date], today: Optional[date] = None) -> str:
+    today = today or date.today()
+    if start and today < start:
+        return "upcoming"
+    if end and today > end:
+        return "ended"
+    return "open"
+
+
+def _first(event: Dict, *keys):
+    for key in keys:
+        if event.get(key) is not None:
+            return event[key]
+    return None
+
+
+def normalize_devpost(event: Dict) -> Dict:
+    """
+    Map a cached Devpost event to the API schema. Accepts both the camelCase
+    records devpost.service.js caches and the snake_case ones written by
+    scripts/devpost_scraper.py.
+    """
+    period = _first(event, "submissionPeriodDates", "submission_period_dates") or ""
+    start, end = parse_period(period)
+    location = _first(event, "displayedLocation", "displayed_location") or event.get("location") or ""
+    thumbnail = _first(event, "thumbnailUrl", "thumbnail_url") or ""
+    return {
+        "id": f"devpost-{_first(event, 'devpostId', 'id') or event.get('url')}",
+        "title": event.get("title") or "",
+        "url": event.get("url") or "",
+        "description": event.get("description") or "",
+        "prize_amount": _first(event, "prizeAmount", "prize_amount") or 0,
+        "location": location,
+        "date": period,
+        "registration_count": _first(event, "registrationsCount", "registrations_count") or 0,
+        "is_online": bool(_first(event, "isOnline", "is_online")) or location.lower() == "online",
+        "organization": _first(event, "organizationName", "organization_name") or "",
+        "source": "devpost",
+        "image_url": "https:" + thumbnail if thumbnail.startswith("//") else thumbnail,
+        "deadline": end.isoformat() if end else _first(event, "submissionDeadline", "submission_deadline"),
+        "status": _first(event, "openState", "open_state") or status_for(start, end),
+        "start_date": start.isoformat() if start else None,
+        "themes": [t.get("name") for t in event.get("themes") or [] if t.get("name")],
+    }
+
+
+def normalize_mlh(event: Dict) -> Dict:
+    """Map a cached MLH event (mlh_scraper.py output) to the API schema."""
+    start, end = parse_iso_date(event.get("start_date")), parse_iso_date(event.get("end_date"))
+    location = event.get("location") or ""
+    return {
+        "id": f"mlh-{event.get('url') or event.get('name')}",
+        "title": event.get("title") or event.get("name", ""),
+        "url": event.get("url", ""),
+        "description": event.get("dates", ""),
+        "prize_amount": 0,
+        "location": location,
+        "date": event.get("dates", ""),
+        "registration_count": 0,
+        "is_online": "online" in location.lower() or "digital" in location.lower(),
+        "organization": "Major League Hacking",
+        "source": "mlh",
+        "image_url": event.get("image", ""),
+        "deadline": end.isoformat() if end else None,
+        "status": status_for(start, end),
+        "start_date": start.isoformat() if start else None,
+        "themes": [],
+    }
+
+
+def encode_cursor(sort_key: Tuple[int, str]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(sort_key)).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[int, str]:
+    try:
+        ordinal, event_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return int(ordinal), str(event_id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+
+class RunningStats:
+    """Aggregates kept up to date as events are added and removed."""
+
+    def __init__(self):
+        self.total = 0
+        self.online_count = 0
+        self.total_prize = 0
+        self.by_source = Counter()
+        self.by_status = Counter()
+
+    def add(self, event: Dict, sign: int = 1):
+        self.total += sign
+        self.online_count += sign if event["is_online"] else 0
+        self.total_prize += sign * event["prize_amount"]
+        self.by_source[event["source"]] += sign
+        self.by_status[event["status"]] += sign
+
+    def remove(self, event: Dict):
+        self.add(event, sign=-1)
+
+    def snapshot(self) -> Dict:
+        return {
+            "total": self.total,
+            "by_source": {k: v for k, v in self.by_source.items() if v},
+            "by_status": {k: v for k, v in self.by_status.items() if v},
+            "online_count": self.online_count,
+            "total_prize": self.total_prize,
+            "average_prize": round(self.total_prize / self.total, 2) if self.total else 0,
+        }
+
+
+class EventStore:
+    """
+    Events keyed by id with sorted posting lists per indexed field value.
+
+        store.upsert_many(events)
+        page, next_cursor, total = store.query({"source": "mlh", "is_online": True}, limit=50)
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._events = {}
+        self._sort_keys = {}
+        self._order = []
+        self._postings = {field: defaultdict(list) for field in INDEXED_FIELDS}
+        self._members = {field: defaultdict(set) for field in INDEXED_FIELDS}
+        self._count_cache = {}
+        self.stats = RunningStats()
+        self.version = 0
+        self.updated_at = None
+        # Day the date-derived statuses were last computed for (see refresh_statuses)
+        self._status_day = date.today()
+
+    def __len__(self):
+        return len(self._events)
+
+    def get(self, event_id: str) -> Optional[Dict]:
+        return self._events.get(event_id)
+
+    def all(self) -> List[Dict]:
+        with self._lock:
+            return list(self._events.values())
+
+    @staticmethod
+    def _sort_key(event: Dict) -> Tuple[int, str]:
+        start = parse_iso_date(event.get("start_date"))
+        return (start.toordinal() if start else NO_DATE, event["id"])
+
+    @staticmethod
+    def _field_values(event: Dict):
+        for field in INDEXED_FIELDS:
+            if field == "prize_bucket":
+                yield field, prize_bucket(event.get("prize_amount"))
+            else:
+                yield field, event.get(field)
+
+    def _unindex(self, event_ids: List[str]):
+        if len(event_ids) <= BULK_THRESHOLD:
+            for event_id in event_ids:
+                event = self._events.pop(event_id)
+                key = self._sort_keys.pop(event_id)
+                self._order.pop(bisect.bisect_left(self._order, key))
+                for field, value in self._field_values(event):
+                    postings = self._postings[field][value]
+                    postings.pop(bisect.bisect_left(postings, key))
+                    self._members[field][value].discard(event_id)
+                self.stats.remove(event)
+            return
+
+        # Many removals: filter each list once instead of popping one at a time
+        removed = set()
+        for event_id in event_ids:
+            event = self._events.pop(event_id)
+            removed.add(self._sort_keys.pop(event_id))
+            for field, value in self._field_values(event):
+                self._members[field][value].discard(event_id)
+            self.stats.remove(event)
+        self._order = [key for key in self._order if key not in removed]
+        for postings in self._postings.values():
+            for value, keys in postings.items():
+                postings[value] = [key for key in keys if key not in removed]
+
+    def _index(self, event: Dict, bulk: bool = False):
+        key = self._sort_key(event)
+        event_id = event["id"]
+        self._events[event_id] = event
+        self._sort_keys[event_id] = key
+        insert = list.append if bulk else bisect.insort
+        insert(self._order, key)
+        for field, value in self._field_values(event):
+            insert(self._postings[field][value], key)
+            self._members[field][value].add(event_id)
+        self.stats.add(event)
+
+    def _bump(self):
+        self.version += 1
+        self.updated_at = time.time()
+        self._count_cache.clear()
+
+    def upsert(self, event: Dict):
+        self.upsert_many([event])
+
+    def upsert_many(self, events: Iterable[Dict]) -> int:
+        """
+        Insert or replace events by id; unchanged events are skipped. Large
+        batches are appended and each posting list sorted once.
+        """
+        with self._lock:
+            events = [event for event in {event["id"]: event for event in events}.values()
+                      if self._events.get(event["id"]) != event]
+            if not events:
+                return 0
+            bulk = len(events) > BULK_THRESHOLD
+            # Drop replaced events first, while every posting list is still sorted
+            self._unindex([event["id"] for event in events if event["id"] in self._events])
+            for event in events:
+                self._index(event, bulk=bulk)
+            if bulk:
+                self._order.sort()
+                for postings in self._postings.values():
+                    for keys in postings.values():
+                        keys.sort()
+            self._bump()
+        return len(events)
+
+    def delete(self, event_ids: Iterable[str]) -> int:
+        with self._lock:
+            event_ids = [event_id for event_id in set(event_ids) if event_id in self._events]
+            if event_ids:
+                self._unindex(event_ids)
+                self._bump()
+        return len(event_ids)
+
+    def replace_all(self, events: Iterable[Dict]) -> int:
+        """
+        Make the store hold exactly these events: missing ones are deleted and
+        only new or changed ones are re-indexed. Returns the number written.
+        """
+        events = list(events)
+        with self._lock:
+            fresh = {event["id"] for event in events}
+            self.delete([event_id for event_id in list(self._events) if event_id not in fresh])
+            return self.upsert_many(events)
+
+    def refresh_statuses(self, today: Optional[date] = None) -> int:
+        """
+        Re-derive upcoming/open/ended from each event's start date and
+        deadline once the day has rolled over, so a long-running process
+        does not keep serving the statuses computed at load. Events without
+        dates keep their status. Returns the number of events changed.
+        """
+        today = today or date.today()
+        with self._lock:
+            if today == self._status_day:
+                return 0
+            self._status_day = today
+            changed = []
+            for event in self._events.values():
+                start, end = parse_iso_date(event.get("start_date")), parse_iso_date(event.get("deadline"))
+                if start or end:
+                    status = status_for(start, end, today)
+                    if status != event.get("status"):
+                        changed.append({**event, "status": status})
+            return self.upsert_many(changed)
+
+    def query(self, filters: Dict, start_from: Optional[date] = None, start_to: Optional[date] = None,
+              cursor: Optional[str] = None, limit: int = 50) -> Tuple[List[Dict], Optional[str], int]:
+        """
+        Return one page of matching events in (start date, id) order.
+
+        Args:
+            filters: Indexed field -> required value (None values are ignored)
+            start_from: Earliest start date (inclusive)
+            start_to: Latest start date (inclusive)
+            cursor: next_cursor from the previous page
+            limit: Page size
+
+        Returns:
+            (events, next_cursor or None, total matching events)
+        """
+        filters = {field: value for field, value in filters.items() if value is not None}
+        unknown = set(filters) - set(INDEXED_FIELDS)
+        if unknown:
+            raise ValueError(f"Cannot filter on {', '.join(sorted(unknown))}")
+
+        with self._lock:
+            if filters:
+                lists = [self._postings[field].get(value, []) for field, value in filters.items()]
+                driver_at = min(range(len(lists)), key=lambda i: len(lists[i]))
+                driver = lists[driver_at]
+                others = [self._members[field].get(value, set())
+                          for i, (field, value) in enumerate(filters.items()) if i != driver_at]
+            else:
+                driver, others = self._order, []
+
+            lo = bisect.bisect_left(driver, (start_from.toordinal(), "")) if start_from else 0
+            hi = bisect.bisect_left(driver, (start_to.toordinal() + 1, "")) if start_to else len(driver)
+
+            total = self._count(filters, start_from, start_to, driver, lo, hi, others)
+
+            position = bisect.bisect_right(driver, decode_cursor(cursor), lo, hi) if cursor else lo
+            page = []
+            # One extra match tells us whether there is a next page
+            while position < hi and len(page) <= limit:
+                key = driver[position]
+                position += 1
+                if all(key[1] in members for members in others):
+                    page.append(key)
+
+            next_cursor = None
+            if len(page) > limit:
+                page.pop()
+                next_cursor = encode_cursor(page[-1]) if page else None
+            return [self._events[key[1]] for key in page], next_cursor, total
+
+    def matching_ids(self, filters: Dict) -> Optional[Set[str]]:
+        """Ids matching all filters (None when no filter is set, meaning everything)."""
+        filters = {field: value for field, value in filters.items() if value is not None}
+        if not filters:
+            return None
+        with self._lock:
+            return set.intersection(*sorted(
+                [self._members[field].get(value, set()) for field, value in filters.items()], key=len))
+
+    def _count(self, filters, start_from, start_to, driver, lo, hi, others) -> int:
+        if not others:
+            return hi - lo
+        cache_key = (tuple(sorted(filters.items(), key=lambda item: item[0])), start_from, start_to)
+        total = self._count_cache.get(cache_key)
+        if total is None:
+            if start_from is None and start_to is None:
+                total = len(set.intersection(*sorted(
+                    [self._members[field].get(value, set()) for field, value in filters.items()], key=len)))
+            else:
+                total = sum(1 for key in driver[lo:hi] if all(key[1] in members for members in others))
+            self._count_cache[cache_key] = total
+        return total
+
+    def statistics(self) -> Dict:
+        with self._lock:
+            return self.stats.snapshot()
+
+
+DEVPOST_JSON_CACHE = "devpost_hackathons_cache.json"
+DEVPOST_NDJSON_CACHE = "devpost_hackathons.ndjson"
+MLH_NDJSON_CACHE = "mlh_hackathons_cache.ndjson"
+
+
+_json_timestamps = {}
+
+
+def _devpost_json_timestamp(path: str) -> Optional[float]:
+    """The Node cache's "timestamp", re-read only when the file changes (it is checked on every scrape)."""
+    mtime = os.path.getmtime(path)
+    cached = _json_timestamps.get(path)
+    if cached is None or cached[0] != mtime:
+        with open(path, "r", encoding="utf-8") as f:
+            cached = _json_timestamps[path] = (mtime, json.load(f).get("timestamp"))
+    return cached[1]
+
+
+def cache_timestamps(data_dir: str) -> Dict[str, Optional[float]]:
+    """When each source's newest cache in data_dir was written (None if missing)."""
+    from ndjson_cache import read_header
+
+    devpost = [(read_header(os.path.join(data_dir, DEVPOST_NDJSON_CACHE)) or {}).get("timestamp")]
+    json_file = os.path.join(data_dir, DEVPOST_JSON_CACHE)
+    if os.path.exists(json_file):
+        devpost.append(_devpost_json_timestamp(json_file))
+    mlh = (read_header(os.path.join(data_dir, MLH_NDJSON_CACHE)) or {}).get("timestamp")
+    return {"devpost": max((t for t in devpost if t), default=None), "mlh": mlh}
+
+
+def cache_files(data_dir: str) -> Dict[str, str]:
+    """
+    The cache file to read per source. For Devpost the newer of the Node
+    JSON cache and the scraper's NDJSON file is used.
+    """
+    from ndjson_cache import read_header
+
+    files = {}
+    json_file = os.path.join(data_dir, DEVPOST_JSON_CACHE)
+    ndjson_file = os.path.join(data_dir, DEVPOST_NDJSON_CACHE)
+    ndjson_header = read_header(ndjson_file)
+    json_timestamp = _devpost_json_timestamp(json_file) if os.path.exists(json_file) else None
+    if ndjson_header and (json_timestamp is None or ndjson_header["timestamp"] >= json_timestamp):
+        files["devpost"] = ndjson_file
+    elif json_timestamp is not None:
+        files["devpost"] = json_file
+
+    mlh_file = os.path.join(data_dir, MLH_NDJSON_CACHE)
+    if os.path.exists(mlh_file):
+        files["mlh"] = mlh_file
+    return files
+
+
+def iter_cache_file(path: str) -> Iterable[Dict]:
+    """Raw records of an NDJSON cache (streamed) or a Node JSON cache."""
+    from ndjson_cache import iter_records
+
+    if path.endswith(".ndjson"):
+        return iter_records(path)
+    with open(path, "r", encoding="utf-8") as f:
+        return iter(json.load(f).get("events", []))
+
+
+NORMALIZERS = {"devpost": normalize_devpost, "mlh": normalize_mlh}
+
+
+def load_cached_events(data_dir: str) -> List[Dict]:
+    """Normalized events from the Devpost and MLH caches in data_dir."""
+    events = []
+    for source, path in cache_files(data_dir).items():
+        events.extend(map(NORMALIZERS[source], iter_cache_file(path)))
+    return events
@@ -0,0 +1,111 @@
+"""
+Compare the embedding inference backends on one exported model directory.
+
+    python backend_bench.py ./models/all-MiniLM-L6-v2 [--runs 50] [--threads 2]
+
+Each backend (see model_loader.BACKENDS) runs in its own subprocess so load
+time and peak memory are not polluted by the others. Reports model load
+time, single-text latency, batch-32 throughput, max RSS and, for the ONNX
+backends, the cosine similarity of their embeddings to the torch ones.
+Backends whose runtime is not installed or whose export is missing are
+skipped. Export the model first with export_onnx.py --quantize.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from model_loader import BACKENDS, ModelLoader
+from onnx_backend import cosine_agreement
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+BATCH_SIZE = 32
+
+TEXTS = [
+    "Full-stack developer, React and Node.js, looking for a hackathon team",
+    "Machine learning engineer interested in climate and sustainability projects",
+    "Beginner-friendly online hackathon with prizes for the best social impact hack",
+    "iOS developer (Swift, SwiftUI) and UI/UX designer",
+    "Data science, pandas, PyTorch, computer vision",
+    "Blockchain, Solidity, smart contracts, DeFi",
+    "Game jam: build a game in 48 hours with Unity or Godot",
+    "AI agents, LLMs, retrieval-augmented generation and vector databases",
+]
+
+
+def run_backend(backend: str, model_dir: str, runs: int, threads: int) -> dict:
+    """Time one backend in this process (called in the child)."""
+    loader = ModelLoader(MODEL_NAME, local_dir=model_dir, threads=threads, backend=backend)
+    loader.load()
+    if loader.state != "ready":
+        return {"backend": backend, "error": loader.error}
+    model = loader.model
+
+    single = []
+    for i in range(runs + 1):
+        started = time.perf_counter()
+        model.encode([TEXTS[i % len(TEXTS)]])
+        single.append(time.perf_counter() - started)
+    single = np.asarray(single[1:]) * 1000
+
+    batch = [TEXTS[i % len(TEXTS)] + f" #{i}" for i in range(BATCH_SIZE)]
+    model.encode(batch, batch_size=BATCH_SIZE)
+    started = time.perf_counter()
+    for _ in range(max(runs // 10, 1)):
+        model.encode(batch, batch_size=BATCH_SIZE)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "backend": backend,
+        "load_s": loader.load_seconds,
+        "p50_ms": round(float(np.percentile(single, 50)), 2),
+        "p95_ms": round(float(np.percentile(single, 95)), 2),
+        "batch_texts_per_s": round(max(runs // 10, 1) * BATCH_SIZE / elapsed, 1),
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "embeddings": np.asarray(model.encode(TEXTS)).tolist(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("model_dir", nargs="?", default=f"models/{MODEL_NAME}")
+    parser.add_argument("--runs", type=int, default=50, help="Timed single-text encodes per backend")
+    parser.add_argument("--threads", type=int, default=0, help="Intra-op threads (default: the runtime's)")
+    parser.add_argument("--backend", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.backend:
+        print(json.dumps(run_backend(args.backend, args.model_dir, args.runs, args.threads or None)))
+        return
+
+    results = []
+    for backend in BACKENDS:
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), args.model_dir, "--backend", backend,
+             "--runs", str(args.runs), "--threads", str(args.threads)],
+            capture_output=True, text=True,
+        )
+        if out.returncode != 0:
+            print(f"  {backend:<10} skipped ({out.stderr.strip().splitlines()[-1] if out.stderr.strip() else 'failed'})")
+            continue
+        r = json.loads(out.stdout.strip().splitlines()[-1])
+        if r.get("error"):
+            print(f"  {backend:<10} skipped ({r['error']})")
+            continue
+        results.append(r)
+
+    reference = next((np.asarray(r["embeddings"]) for r in results if r["backend"] == "torch"), None)
+    print(f"\n{'backend':<10} {'load s':>7} {'p50 ms':>8} {'p95 ms':>8} {'batch/s':>9} {'max RSS MB':>11} {'min cos':>8}")
+    for r in results:
+        cos = "-" if reference is None else cosine_agreement(reference, np.asarray(r["embeddings"]))["min"]
+        print(f"{r['backend']:<10} {r['load_s']:>7} {r['p50_ms']:>8} {r['p95_ms']:>8} "
+              f"{r['batch_texts_per_s']:>9} {r['max_rss_mb']:>11} {cos:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Sequence
+
+
+class QueueFull(Exception):
+    """Raised when the encode queue has no room left for a request's texts."""
+
+
+class MicroBatcher:
+    """
+    Groups concurrent encode requests into batched calls on one inference thread.
+
+    Requests are queued by submit() / submit_many(); a worker thread waits for
+    the first item, then keeps collecting for up to `window_ms` (or until
+    `max_batch_size` items are queued) and runs them through `encode_fn` in a
+    single call. The queue holds at most `max_queue` texts; requests that do
+    not fit are rejected with QueueFull instead of waiting behind the backlog.
+    """
+
+    def __init__(self, encode_fn: Callable[[List[str]], Sequence], window_ms: float = 5.0,
+                 max_batch_size: int = 64, max_queue: int = 0):
+        self.encode_fn = encode_fn
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self.max_queue = max_queue
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+        self._worker_pid = None
+        self.batches = 0
+        self.items = 0
+        self.rejected = 0
+        self.in_flight = 0
+
+    def _ensure_worker(self):
+        # The worker is started lazily (and restarted after a fork) because
+        # threads created before a pre-fork server forks do not survive it.
+        pid = os.getpid()
+        if self._worker is not None and self._worker_pid == pid and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is not None and self._worker_pid == pid and self._worker.is_alive():
+                return
+            self._worker = threading.Thread(target=self._run, name="embed-batcher", daemon=True)
+            self._worker_pid = pid
+            self._worker.start()
+
+    def submit(self, text: str) -> Future:
+        """Queue a single text and return a Future resolving to its embedding."""
+        return self.submit_many([text])[0]
+
+    def submit_many(self, texts: List[str]) -> List[Future]:
+        """Queue all texts or none of them (QueueFull); one Future per text."""
+        self._ensure_worker()
+        futures = [Future() for _ in texts]
+        with self._lock:
+            if self.max_queue and self._queue.qsize() + len(texts) > self.max_queue:
+                self.rejected += 1
+                raise QueueFull(f"Encode queue is full ({self._queue.qsize()}/{self.max_queue} texts)")
+            for text, future in zip(texts, futures):
+                self._queue.put((text, future))
+        return futures
+
+    @property
+    def depth(self) -> int:
+        """Texts waiting to be encoded (not counting the batch being encoded)."""
+        return self._queue.qsize()
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            # Skip texts whose caller gave up (cancelled futures)
+            batch = [(text, future) for text, future in self._collect() if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            texts = [text for text, _ in batch]
+            self.in_flight = len(batch)
+            try:
+                vectors = self.encode_fn(texts)
+                if len(vectors) != len(batch):
+                    raise RuntimeError(f"encode returned {len(vectors)} vectors for {len(batch)} texts")
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            finally:
+                self.in_flight = 0
+
+            self.batches += 1
+            self.items += len(batch)
+            for (_, future), vector in zip(batch, vectors):
+                future.set_result(vector)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0,
+            "window_ms": self.window * 1000.0,
+            "max_batch_size": self.max_batch_size,
+            "queue_depth": self.depth,
+            "in_flight": self.in_flight,
+            "max_queue": self.max_queue,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,253 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+
+def normalize_for_key(text: str) -> str:
+    """Collapse whitespace so trivially different payloads share a cache entry."""
+    return " ".join(text.split())
+
+
+MAX_DISK_WORKERS = 64
+
+
+def claim_worker_dir(base_dir: str):
+    """
+    Claim a `worker-<n>` subdirectory of base_dir for this process.
+
+    A DiskTier has a single writer: its slot counter, index and key log live
+    in one process. Each gunicorn worker therefore takes the lowest-numbered
+    directory whose lock file it can flock, which keeps the directories
+    stable across restarts. The lock is held until the returned file is
+    closed (or the process exits).
+
+    Returns:
+        (directory, open lock file)
+    """
+    try:
+        import fcntl
+    except ImportError:
+        # No flock on this platform: fall back to one directory per process
+        path = os.path.join(base_dir, f"worker-pid{os.getpid()}")
+        os.makedirs(path, exist_ok=True)
+        return path, None
+
+    for n in range(MAX_DISK_WORKERS):
+        path = os.path.join(base_dir, f"worker-{n}")
+        os.makedirs(path, exist_ok=True)
+        lock = open(os.path.join(path, "lock"), "a")
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return path, lock
+        except OSError:
+            lock.close()
+    raise RuntimeError(f"All {MAX_DISK_WORKERS} embedding cache directories in {base_dir} are in use")
+
+
+class DiskTier:
+    """
+    Fixed-size on-disk vector store backed by a memory-mapped float32 file.
+
+    Vectors live in `vectors.f32` (capacity x dim); `keys.log` is an
+    append-only log of "<key> <slot>" lines replayed on startup. Slots are
+    reused round-robin once the store is full, so the oldest entries are the
+    first to be overwritten. Only one process may write a directory; see
+    claim_worker_dir().
+    """
+
+    def __init__(self, directory: str, model_name: str, dim: int, capacity: int = 50000, lock=None):
+        self.directory = directory
+        self.lock = lock
+        self.dim = dim
+        self.capacity = capacity
+        self.index = {}
+        self.slot_keys = [None] * capacity
+        self.next_slot = 0
+
+        os.makedirs(directory, exist_ok=True)
+        meta_path = os.path.join(directory, "meta.json")
+        vectors_path = os.path.join(directory, "vectors.f32")
+        self.keys_path = os.path.join(directory, "keys.log")
+
+        meta = {"model": model_name, "dim": dim, "capacity": capacity}
+        existing = None
+        if os.path.exists(meta_path):
+            with open(meta_path, "r", encoding="utf-8") as f:
+                existing = json.load(f)
+
+        if existing != meta or not os.path.exists(vectors_path):
+            # Model, dimension or capacity changed: start from an empty store
+            for path in (vectors_path, self.keys_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            with open(meta_path, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+            self.vectors = np.memmap(vectors_path, dtype=np.float32, mode="w+", shape=(capacity, dim))
+        else:
+            self.vectors = np.memmap(vectors_path, dtype=np.float32, mode="r+", shape=(capacity, dim))
+            self._replay()
+
+        self._log = open(self.keys_path, "a", encoding="utf-8")
+
+    def _replay(self):
+        if not os.path.exists(self.keys_path):
+            return
+        lines = 0
+        with open(self.keys_path, "r", encoding="utf-8") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) != 2:
+                    continue
+                key, slot = parts[0], int(parts[1])
+                if slot >= self.capacity:
+                    continue
+                self._assign(key, slot)
+                self.next_slot = (slot + 1) % self.capacity
+                lines += 1
+
+        if lines > 2 * self.capacity:
+            self._compact()
+
+    def _compact(self):
+        tmp_path = self.keys_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            # Write the next slot to be reused last so replay resumes from it
+            for offset in range(1, self.capacity + 1):
+                slot = (self.next_slot + offset - 1) % self.capacity
+                key = self.slot_keys[slot]
+                if key is not None:
+                    f.write(f"{key} {slot}\n")
+        os.replace(tmp_path, self.keys_path)
+
+    def _assign(self, key: str, slot: int):
+        previous = self.slot_keys[slot]
+        if previous is not None and self.index.get(previous) == slot:
+            del self.index[previous]
+        old_slot = self.index.get(key)
+        if old_slot is not None and old_slot != slot:
+            self.slot_keys[old_slot] = None
+        self.slot_keys[slot] = key
+        self.index[key] = slot
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        slot = self.index.get(key)
+        if slot is None:
+            return None
+        return np.array(self.vectors[slot])
+
+    def put(self, key: str, vector: np.ndarray):
+        if key in self.index:
+            return
+        slot = self.next_slot
+        self.vectors[slot] = vector
+        self._assign(key, slot)
+        self.next_slot = (slot + 1) % self.capacity
+        self._log.write(f"{key} {slot}\n")
+        self._log.flush()
+
+    def __len__(self):
+        return len(self.index)
+
+    def close(self):
+        self.vectors.flush()
+        self._log.close()
+        if self.lock is not None:
+            self.lock.close()
+
+
+class EmbeddingCache:
+    """
+    Content-addressed embedding cache.
+
+    Keys are the SHA-256 of the model name and the whitespace-normalized
+    text. Lookups go to a bounded in-memory LRU first, then to the optional
+    memory-mapped disk tier (hits there are promoted back into memory).
+
+    The disk tier is opened on first use in each process, in a worker
+    directory of its own under disk_dir, so a gunicorn master that preloads
+    the app never holds one and forked workers never share a writer.
+    """
+
+    def __init__(self, model_name: str, capacity: int = 10000, disk_dir: str = None,
+                 disk_capacity: int = 50000, dim: int = 384):
+        self.model_name = model_name
+        self.capacity = capacity
+        self.dim = dim
+        self.disk_dir = disk_dir
+        self.disk_capacity = disk_capacity
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk = None
+        self._disk_pid = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @property
+    def disk(self) -> Optional[DiskTier]:
+        if not self.disk_dir:
+            return None
+        if self._disk is None or self._disk_pid != os.getpid():
+            # A tier inherited across fork belongs to the parent; leave it alone
+            directory, lock = claim_worker_dir(self.disk_dir)
+            self._disk = DiskTier(directory, self.model_name, self.dim, self.disk_capacity, lock=lock)
+            self._disk_pid = os.getpid()
+            print(f"Embedding disk cache: {directory}")
+        return self._disk
+
+    def key(self, text: str) -> str:
+        payload = f"{self.model_name}\0{normalize_for_key(text)}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        key = self.key(text)
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return vector
+
+            disk = self.disk
+            if disk is not None:
+                vector = disk.get(key)
+                if vector is not None:
+                    self._remember(key, vector)
+                    self.disk_hits += 1
+                    return vector
+
+            self.misses += 1
+            return None
+
+    def put(self, text: str, vector):
+        key = self.key(text)
+        vector = np.asarray(vector, dtype=np.float32)
+        with self._lock:
+            self._remember(key, vector)
+            disk = self.disk
+            if disk is not None:
+                disk.put(key, vector)
+
+    def _remember(self, key: str, vector: np.ndarray):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.capacity:
+            self._memory.popitem(last=False)
+
+    def stats(self) -> dict:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        hits = self.memory_hits + self.disk_hits
+        return {
+            "memory_entries": len(self._memory),
+            "memory_capacity": self.capacity,
+            "disk_entries": len(self._disk) if self._disk is not None else None,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
@@ -1,29 +1,472 @@
-from flask import Flask, request, jsonify
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
+from flask import Flask, Response, request, jsonify
+import numpy as np
 import os
 
+from batcher import MicroBatcher, QueueFull
+from embedding_cache import EmbeddingCache
+from event_recommender import EventRecommender
+from instrumentation import REGISTRY, instrument_flask, timer
+from ivf_index import IVFIndex
+from model_loader import ModelLoader, ModelNotReady
+from vector_index import VectorIndex, cosine_matrix, top_k_rows
+import wire
+
 app = Flask(__name__)
+instrument_flask(app)
+
+# Micro-batching: concurrent /embed calls arriving within this window are
+# encoded together in one forward pass.
+BATCH_WINDOW_MS = float(os.environ.get("EMBED_BATCH_WINDOW_MS", 5))
+MAX_BATCH_SIZE = int(os.environ.get("EMBED_MAX_BATCH_SIZE", 64))
+MAX_BATCH_TEXTS = int(os.environ.get("EMBED_MAX_BATCH_TEXTS", 1024))
+ENCODE_TIMEOUT = float(os.environ.get("EMBED_ENCODE_TIMEOUT", 30))
+MAX_SIMILARITY_CELLS = int(os.environ.get("EMBED_MAX_SIMILARITY_CELLS", 4_000_000))
+# All encoding runs on one inference thread per process; texts beyond this
+# many waiting in its queue are shed with 503 instead of piling up.
+MAX_QUEUE = max(int(os.environ.get("EMBED_MAX_QUEUE", 2 * MAX_BATCH_TEXTS)), MAX_BATCH_TEXTS)
+
+# Embedding cache: in-memory LRU plus an optional memory-mapped disk tier
+CACHE_SIZE = int(os.environ.get("EMBED_CACHE_SIZE", 10000))
+CACHE_DIR = os.environ.get("EMBED_CACHE_DIR")
+CACHE_DISK_SIZE = int(os.environ.get("EMBED_CACHE_DISK_SIZE", 50000))
+
+# Profile search index: "exact" (dense matrix scan) or "ivf" (approximate)
+INDEX_MODE = os.environ.get("EMBED_INDEX_MODE", "exact")
+IVF_NLIST = int(os.environ.get("EMBED_IVF_NLIST", 0))  # 0 = pick from collection size
+IVF_NPROBE = int(os.environ.get("EMBED_IVF_NPROBE", 8))
+IVF_TRAIN_SIZE = int(os.environ.get("EMBED_IVF_TRAIN_SIZE", 2048))
+IVF_RECLUSTER_SECONDS = float(os.environ.get("EMBED_IVF_RECLUSTER_SECONDS", 600))
+IVF_SHADOW = os.environ.get("EMBED_IVF_SHADOW", "False") == "True"
+IVF_SOURCE_DIR = os.environ.get("EMBED_IVF_SOURCE_DIR") or None  # memory-mapped re-clustering copies; default temp dir
+
+# Event recommendations: users with a cached affinity row (LRU), how long a
+# user stays active (scored against new events) and the matmul tile size
+RECOMMEND_USERS = int(os.environ.get("EMBED_RECOMMEND_USERS", 5000))
+RECOMMEND_ACTIVE_SECONDS = float(os.environ.get("EMBED_RECOMMEND_ACTIVE_SECONDS", 86400))
+RECOMMEND_BLOCK = int(os.environ.get("EMBED_RECOMMEND_BLOCK", 1024))
+MAX_RECOMMEND_K = 100
+
+# The profile index lives in process memory: with several gunicorn workers an
+# upsert would reach one worker only and the others would keep ranking on
+# stale vectors, so the index is only served by single-process deployments.
+# gunicorn.conf.py exports the worker count as EMBED_WORKERS.
+WORKERS = int(os.environ.get("EMBED_WORKERS", 1))
+INDEX_ENABLED = WORKERS == 1
+# Intra-op threads per process (torch or onnxruntime): the cores split between the workers
+TORCH_THREADS = int(os.environ.get("EMBED_TORCH_THREADS", 0)) or max(1, (os.cpu_count() or 1) // WORKERS)
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+EMBEDDING_DIM = int(os.environ.get("EMBED_DIM", 384))
+
+# Model loading: in the background by default so the port binds immediately.
+# EMBED_MODEL_DIR points at a pre-downloaded copy (no network at startup);
+# EMBED_PRELOAD=True loads synchronously at import, which together with
+# gunicorn's preload_app lets forked workers share the weights copy-on-write.
+MODEL_DIR = os.environ.get("EMBED_MODEL_DIR")
+PRELOAD = os.environ.get("EMBED_PRELOAD", "False") == "True"
+# Inference runtime: "torch", or "onnx" / "onnx-int8" on an export made with
+# export_onnx.py in EMBED_MODEL_DIR (see model_loader.BACKENDS)
+BACKEND = os.environ.get("EMBED_BACKEND", "torch")
+
+loader = ModelLoader(MODEL_NAME, local_dir=MODEL_DIR, expected_dim=EMBEDDING_DIM, threads=TORCH_THREADS,
+                     backend=BACKEND)
+if PRELOAD:
+    loader.load()
+else:
+    loader.start()
+
+cache = EmbeddingCache(
+    # Backends produce slightly different vectors, so they don't share cache entries
+    MODEL_NAME if BACKEND == "torch" else f"{MODEL_NAME}+{BACKEND}",
+    capacity=CACHE_SIZE,
+    disk_dir=CACHE_DIR,
+    disk_capacity=CACHE_DISK_SIZE,
+    dim=EMBEDDING_DIM,
+)
+
+# Profile vectors keyed by user id, searched with /search
+if not INDEX_ENABLED:
+    index = None
+    print(f"Profile index disabled: it is per-process and {WORKERS} workers are running "
+          f"(set WEB_CONCURRENCY=1 to serve /search)")
+elif INDEX_MODE == "ivf":
+    index = IVFIndex(
+        dim=EMBEDDING_DIM,
+        nlist=IVF_NLIST,
+        nprobe=IVF_NPROBE,
+        train_size=IVF_TRAIN_SIZE,
+        recluster_interval=IVF_RECLUSTER_SECONDS,
+        shadow=IVF_SHADOW,
+        source_dir=IVF_SOURCE_DIR,
+    )
+else:
+    index = VectorIndex(dim=EMBEDDING_DIM)
+
+# Event vectors and per-user affinity rows for /recommend; per-process like the index
+recommender = EventRecommender(
+    dim=EMBEDDING_DIM,
+    max_users=RECOMMEND_USERS,
+    active_seconds=RECOMMEND_ACTIVE_SECONDS,
+    block_size=RECOMMEND_BLOCK,
+) if INDEX_ENABLED else None
+
+
+ENCODE_BATCH_SIZE = REGISTRY.histogram("embed_encode_batch_size", "Texts per model.encode call",
+                                       buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024))
+TEXTS_ENCODED = REGISTRY.counter("embed_texts_encoded_total", "Texts run through the model")
+REQUESTS_SHED = REGISTRY.counter("embed_requests_shed_total",
+                                 "Requests rejected with 503 because the encode queue was full")
+REGISTRY.gauge("embed_queue_depth", "Texts waiting for the inference thread", fn=lambda: batcher.depth)
+REGISTRY.gauge("embed_model_ready", "1 once the model has loaded", fn=lambda: int(loader.ready))
+REGISTRY.gauge("embed_cache_lookups", "Embedding cache lookups since start by result", ("result",),
+               fn=lambda: {(result,): cache.stats()[key] for result, key in
+                           (("memory_hit", "memory_hits"), ("disk_hit", "disk_hits"), ("miss", "misses"))})
+REGISTRY.gauge("embed_cache_entries", "Embeddings held in the memory tier",
+               fn=lambda: cache.stats()["memory_entries"])
+REGISTRY.gauge("recommend_events", "Events held by the recommender",
+               fn=lambda: len(recommender) if recommender is not None else None)
+REGISTRY.gauge("recommend_users", "Users with a cached affinity row",
+               fn=lambda: recommender.stats()["users"] if recommender is not None else None)
+
+
+def normalize_text(text):
+    """Coerce a request payload into a stripped string (None if unusable)."""
+    if isinstance(text, (dict, list)):
+        text = " ".join(str(v) for v in (text.values() if isinstance(text, dict) else text))
+
+    if not isinstance(text, str) or not text.strip():
+        return None
+    return text.strip()
+
+
+def vectors_response(name, matrix, data, single=False, **extra):
+    """
+    Return vectors in the format the client negotiated.
+
+    Raw bytes when the Accept header asks for application/octet-stream,
+    base64-in-JSON when `encoding` is "base64" (body or query string), plain
+    JSON lists otherwise. The wire dtype comes from the X-Embedding-Dtype
+    header, a `dtype` field/query parameter, or defaults to float32.
+    """
+    data = data or {}
+    dtype = request.headers.get(wire.DTYPE_HEADER) or request.args.get("dtype") or data.get("dtype") or "float32"
+    if dtype not in wire.DTYPES:
+        return jsonify({"error": f"Unsupported dtype '{dtype}'"}), 400
+
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix[None, :]
+
+    with timer("embed.serialize"):
+        if wire.OCTET_STREAM in request.headers.get("Accept", ""):
+            return Response(wire.encode(matrix, dtype), mimetype=wire.OCTET_STREAM, headers={
+                wire.DTYPE_HEADER: dtype,
+                wire.SHAPE_HEADER: wire.format_shape(matrix.shape),
+            })
+
+        if (request.args.get("encoding") or data.get("encoding")) == "base64":
+            return jsonify({name: wire.to_base64(matrix, dtype), **extra})
+
+        return jsonify({name: matrix[0].tolist() if single else matrix.tolist(), **extra})
+
+
+def index_disabled():
+    return jsonify({
+        "error": f"Profile index is disabled with {WORKERS} workers; run a single worker to use it",
+    }), 503
+
+
+def model_loading():
+    return jsonify({"error": "Model is not ready", "model": loader.state}), 503, {"Retry-After": "5"}
+
+
+def overloaded(e):
+    REQUESTS_SHED.inc()
+    return jsonify({"error": str(e), "queue_depth": batcher.depth}), 503, {"Retry-After": "1"}
 
-print("Loading all-MiniLM-L6-v2 model...")
-model = SentenceTransformer("all-MiniLM-L6-v2")
-print("Model loaded successfully!")
+
+def encode_texts(texts):
+    model = loader.get()
+    ENCODE_BATCH_SIZE.observe(len(texts))
+    with timer("embed.encode"):
+        vectors = model.encode(texts, batch_size=MAX_BATCH_SIZE)
+    TEXTS_ENCODED.inc(len(texts))
+    return vectors
+
+
+batcher = MicroBatcher(encode_texts, window_ms=BATCH_WINDOW_MS, max_batch_size=MAX_BATCH_SIZE,
+                       max_queue=MAX_QUEUE)
+
+
+def encode_queued(texts):
+    """Encode texts on the inference thread; raises QueueFull when it is backed up."""
+    futures = batcher.submit_many(texts)
+    try:
+        return [future.result(timeout=ENCODE_TIMEOUT) for future in futures]
+    except Exception:
+        # Don't leave the rest of an abandoned request in the queue
+        for future in futures:
+            future.cancel()
+        raise
+
+
+def embed_one(text):
+    """Embed a single text, going through the cache and then the micro-batcher."""
+    vector = cache.get(text)
+    if vector is None:
+        loader.get()
+        vector = encode_queued([text])[0]
+        cache.put(text, vector)
+    return vector
+
+
+def embed_many(texts):
+    """Embed a list of texts, encoding only the distinct cache misses."""
+    vectors = [cache.get(t) for t in texts]
+    missing = list(dict.fromkeys(t for t, v in zip(texts, vectors) if v is None))
+
+    if missing:
+        loader.get()
+        encoded = dict(zip(missing, encode_queued(missing)))
+        for text, vector in encoded.items():
+            cache.put(text, vector)
+        vectors = [v if v is not None else encoded[t] for t, v in zip(texts, vectors)]
+
+    return vectors
 
 
 @app.route("/embed", methods=["POST"])
 def embed():
     try:
         data = request.get_json()
-        text = data.get("text", "")
+        text = normalize_text(data.get("text", ""))
 
-        if isinstance(text, (dict, list)):
-            text = " ".join(str(v) for v in (text.values() if isinstance(text, dict) else text))
-
-        if not isinstance(text, str) or not text.strip():
+        if text is None:
             return jsonify({"error": "Invalid or empty text"}), 400
 
-        embedding = model.encode(text.strip()).tolist()
-        return jsonify({"embedding": embedding})
+        return vectors_response("embedding", embed_one(text), data, single=True)
+    except ModelNotReady:
+        return model_loading()
+    except QueueFull as e:
+        return overloaded(e)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/embed_batch", methods=["POST"])
+def embed_batch():
+    try:
+        data = request.get_json()
+        texts = data.get("texts")
+
+        if not isinstance(texts, list) or not texts:
+            return jsonify({"error": "texts must be a non-empty list"}), 400
+        if len(texts) > MAX_BATCH_TEXTS:
+            return jsonify({"error": f"At most {MAX_BATCH_TEXTS} texts per request"}), 400
+
+        normalized = [normalize_text(t) for t in texts]
+        invalid = [i for i, t in enumerate(normalized) if t is None]
+        if invalid:
+            return jsonify({"error": "Invalid or empty text", "indices": invalid}), 400
+
+        embeddings = np.stack(embed_many(normalized))
+        return vectors_response("embeddings", embeddings, data, count=len(embeddings))
+    except ModelNotReady:
+        return model_loading()
+    except QueueFull as e:
+        return overloaded(e)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/index/upsert", methods=["POST"])
+def index_upsert():
+    if index is None:
+        return index_disabled()
+    try:
+        data = request.get_json()
+        items = data.get("items")
+
+        if not isinstance(items, list) or not items:
+            return jsonify({"error": "items must be a non-empty list"}), 400
+
+        with_vectors = [(str(i["id"]), wire.read_vectors(i["vector"]).reshape(-1))
+                        for i in items if i.get("id") and i.get("vector")]
+        with_text = [(str(i["id"]), normalize_text(i.get("text"))) for i in items
+                     if i.get("id") and not i.get("vector")]
+        with_text = [(item_id, text) for item_id, text in with_text if text is not None]
+
+        if len(with_vectors) + len(with_text) != len(items):
+            return jsonify({"error": "Each item needs an id and a vector or non-empty text"}), 400
+
+        if with_text:
+            vectors = embed_many([text for _, text in with_text])
+            with_vectors += [(item_id, v) for (item_id, _), v in zip(with_text, vectors)]
+
+        count = index.upsert(with_vectors)
+        return jsonify({"upserted": count, "size": len(index)})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except ModelNotReady:
+        return model_loading()
+    except QueueFull as e:
+        return overloaded(e)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/index/delete", methods=["POST"])
+def index_delete():
+    if index is None:
+        return index_disabled()
+    try:
+        data = request.get_json()
+        ids = data.get("ids")
+
+        if not isinstance(ids, list):
+            return jsonify({"error": "ids must be a list"}), 400
+
+        removed = index.delete(str(i) for i in ids)
+        return jsonify({"deleted": removed, "size": len(index)})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/search", methods=["POST"])
+def search():
+    if index is None:
+        return index_disabled()
+    try:
+        data = request.get_json()
+        k = int(data.get("k", 10))
+        allow_ids = data.get("ids")
+        exclude_ids = data.get("exclude")
+
+        if data.get("vector"):
+            query = wire.read_vectors(data["vector"]).reshape(-1)
+            if len(query) != index.dim:
+                return jsonify({"error": f"Expected a {index.dim}-dimensional vector"}), 400
+        else:
+            text = normalize_text(data.get("text", ""))
+            if text is None:
+                return jsonify({"error": "Provide a query text or vector"}), 400
+            query = embed_one(text)
+
+        if allow_ids is not None:
+            allow_ids = [str(i) for i in allow_ids]
+        exclude_ids = [str(i) for i in exclude_ids] if exclude_ids else None
+
+        search_kwargs = {}
+        if INDEX_MODE == "ivf" and data.get("nprobe"):
+            search_kwargs["nprobe"] = int(data["nprobe"])
+
+        ids, scores = index.search(query, k=k, allow_ids=allow_ids, exclude_ids=exclude_ids, **search_kwargs)
+        return jsonify({
+            "results": [{"id": i, "score": s} for i, s in zip(ids, scores)],
+            # Allow-listed ids the index has never seen, so callers can upsert them
+            "missing": index.missing(allow_ids) if allow_ids is not None else [],
+        })
+    except ModelNotReady:
+        return model_loading()
+    except QueueFull as e:
+        return overloaded(e)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/index/recall", methods=["GET"])
+def index_recall():
+    if index is None:
+        return index_disabled()
+    if INDEX_MODE != "ivf":
+        return jsonify({"error": "Recall is only measured in ivf index mode"}), 400
+    try:
+        k = int(request.args.get("k", 10))
+        samples = int(request.args.get("samples", 100))
+        nprobe = request.args.get("nprobe", type=int)
+        recall = index.evaluate_recall(k=k, samples=samples, nprobe=nprobe)
+        return jsonify({"k": k, "nprobe": nprobe or index.nprobe, "recall": recall})
+    except RuntimeError as e:
+        return jsonify({"error": str(e)}), 409
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/events/sync", methods=["POST"])
+def events_sync():
+    """
+    Replace the recommender's event set. Only new or changed events are
+    embedded and scored against the active users; missing ones are dropped.
+
+    Body: {"events": [{"id", "title", "themes", "description", "start_date",
+           "end_date" | "deadline", "is_online", "url", "source"}]}
+    """
+    if recommender is None:
+        return index_disabled()
+    try:
+        data = request.get_json()
+        events = data.get("events")
+
+        if not isinstance(events, list):
+            return jsonify({"error": "events must be a list"}), 400
+        invalid = [i for i, e in enumerate(events)
+                   if not isinstance(e, dict) or not e.get("id") or normalize_text(e.get("title")) is None]
+        if invalid:
+            return jsonify({"error": "Each event needs an id and a title", "indices": invalid}), 400
+
+        with timer("recommend.sync"):
+            changes = recommender.sync(events, embed_many)
+        return jsonify({**changes, "size": len(recommender), "version": recommender.version})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except ModelNotReady:
+        return model_loading()
+    except QueueFull as e:
+        return overloaded(e)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/recommend", methods=["POST"])
+def recommend():
+    """
+    Top-k upcoming events for a profile.
+
+    Body: {"user_id": optional (caches the user's scores), "vector" | "text",
+           "k": 10, "online": optional bool, "start_after" / "start_before":
+           optional ISO dates, "include_past": false, "exclude": [event ids]}
+    """
+    if recommender is None:
+        return index_disabled()
+    try:
+        data = request.get_json()
+        k = min(int(data.get("k", 10)), MAX_RECOMMEND_K)
+        online = data.get("online")
+
+        if online is not None and not isinstance(online, bool):
+            return jsonify({"error": "online must be true, false or omitted"}), 400
+        if data.get("vector"):
+            vector = wire.read_vectors(data["vector"]).reshape(-1)
+        else:
+            text = normalize_text(data.get("text", ""))
+            if text is None:
+                return jsonify({"error": "Provide a profile vector or text"}), 400
+            vector = embed_one(text)
+
+        user_id = data.get("user_id")
+        with timer("recommend.rank"):
+            result = recommender.recommend(
+                str(user_id) if user_id else None, vector, k=k, online=online,
+                start_after=data.get("start_after"), start_before=data.get("start_before"),
+                include_past=bool(data.get("include_past")), exclude=data.get("exclude") or (),
+            )
+        return jsonify(result)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except ModelNotReady:
+        return model_loading()
+    except QueueFull as e:
+        return overloaded(e)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -35,23 +478,87 @@ def similarity():
         vec1 = data.get("vec1")
         vec2 = data.get("vec2")
 
-        if not vec1 or not vec2 or len(vec1) != len(vec2):
+        if not vec1 or not vec2:
             return jsonify({"error": "Invalid vectors"}), 400
 
-        sim = cosine_similarity([vec1], [vec2])[0][0]
+        vec1 = wire.read_vectors(vec1).reshape(-1)
+        vec2 = wire.read_vectors(vec2).reshape(-1)
+        if len(vec1) != len(vec2):
+            return jsonify({"error": "Invalid vectors"}), 400
+
+        sim = cosine_matrix(vec1[None, :], vec2[None, :])[0, 0]
         return jsonify({"similarity": float(sim)})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+def as_matrix(value):
+    """Accept a single vector, a list of vectors or a base64 object as a 2-D float32 array."""
+    matrix = wire.read_vectors(value)
+    if matrix.ndim == 1:
+        matrix = matrix[None, :]
+    if matrix.ndim != 2 or matrix.size == 0:
+        raise ValueError("Expected a vector or a list of equal-length vectors")
+    return matrix
+
+
+@app.route("/similarity_matrix", methods=["POST"])
+def similarity_matrix():
+    """
+    One-vs-many or many-vs-many cosine similarity.
+
+    Body: {"a": vector | [vectors], "b": [vectors], "top_k": optional int,
+           "normalized": optional bool (skip re-normalizing unit vectors)}
+    Vectors may also be base64 objects (see wire.py); the score matrix is
+    returned in the negotiated format (indices stay JSON with top_k).
+    """
+    try:
+        data = request.get_json()
+        try:
+            a = as_matrix(data.get("a"))
+            b = as_matrix(data.get("b"))
+        except (ValueError, TypeError) as e:
+            return jsonify({"error": str(e)}), 400
+
+        if a.shape[1] != b.shape[1]:
+            return jsonify({"error": "Vectors in a and b must have the same dimension"}), 400
+        if a.shape[0] * b.shape[0] > MAX_SIMILARITY_CELLS:
+            return jsonify({"error": f"At most {MAX_SIMILARITY_CELLS} scores per request"}), 400
+
+        scores = cosine_matrix(a, b, normalized=bool(data.get("normalized")))
+
+        top = data.get("top_k")
+        if top:
+            indices, best = top_k_rows(scores, int(top))
+            if wire.OCTET_STREAM in request.headers.get("Accept", ""):
+                return jsonify({"indices": indices.tolist(), "scores": wire.to_base64(best, "float32"),
+                                "shape": list(scores.shape)})
+            return vectors_response("scores", best, data, indices=indices.tolist(), shape=list(scores.shape))
+
+        return vectors_response("scores", scores, data, shape=list(scores.shape))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
 @app.route("/health", methods=["GET"])
 def health():
-    return jsonify({"status": "healthy"})
+    # Answered while the model loads so platform health checks pass at boot
+    status = {"ready": "healthy", "error": "error"}.get(loader.state, "loading")
+    return jsonify({
+        "status": status,
+        "model": loader.stats(),
+        "batching": batcher.stats(),
+        "workers": WORKERS,
+        "cache": cache.stats(),
+        "index": index.stats() if index is not None else {"enabled": False, "workers": WORKERS},
+        "recommender": recommender.stats() if recommender is not None else {"enabled": False},
+    }), 503 if status == "error" else 200
 
 if __name__ == "__main__":
     import os
     
     PORT = int(os.environ.get("PORT", 5002))
 
+    # Development server; production runs gunicorn -c gunicorn.conf.py embedding_service:app
     print(f"EMBEDDING SERVICE STARTING ON PORT {PORT}")
-    app.run(host="0.0.0.0", port=PORT, debug=False)
+    app.run(host="0.0.0.0", port=PORT, debug=False, threaded=True)
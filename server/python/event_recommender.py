@@ -0,0 +1,364 @@
+"""
+Upcoming-event recommendations for profile vectors.
+
+EventRecommender holds one L2-normalized vector per hackathon (built from
+its title, themes and description) and a user x event affinity matrix for
+the users who asked for recommendations recently. A request for a known
+user whose profile vector is unchanged only filters and ranks their cached
+row; results themselves are cached per user until the profile or the event
+set changes.
+
+Updates are incremental: sync() embeds only new or changed events and
+scores just those columns against the active users' vectors, in blocks so
+the temporary product stays small. Removed events drop their column. A
+full row is computed only for a new user or a changed profile, never for
+every pair.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from vector_index import l2_normalize, top_k
+
+NO_DATE = -1
+# Metadata returned with each recommendation
+EVENT_FIELDS = ("title", "url", "source", "start_date", "end_date", "is_online")
+
+
+def event_text(event: Dict) -> str:
+    """Text embedded for an event: title, themes and description."""
+    themes = event.get("themes") or []
+    parts = [event.get("title"), ", ".join(t for t in themes if isinstance(t, str)), event.get("description")]
+    return ". ".join(p.strip() for p in parts if isinstance(p, str) and p.strip())
+
+
+def _ordinal(value) -> int:
+    """Day ordinal of an ISO date (or datetime) string, NO_DATE when missing or invalid."""
+    if not value:
+        return NO_DATE
+    try:
+        return date.fromisoformat(str(value)[:10]).toordinal()
+    except ValueError:
+        return NO_DATE
+
+
+def blocked_scores(users: np.ndarray, events: np.ndarray, out: np.ndarray, block: int = 1024):
+    """
+    Write users @ events.T into `out` one (block x block) tile at a time,
+    so scoring a large batch never allocates more than a tile of scratch.
+    """
+    for i in range(0, len(users), block):
+        for j in range(0, len(events), block):
+            out[i:i + block, j:j + block] = users[i:i + block] @ events[j:j + block].T
+
+
+class EventRecommender:
+    """
+    Ranks events for user vectors from a cached user x event affinity matrix.
+
+        recommender.sync(events, embed)    # at every event refresh
+        recommender.recommend("user-1", profile_vector, k=10, online=True)
+
+    Users are kept LRU-first up to `max_users`; those idle for longer than
+    `active_seconds` are dropped at the next sync instead of being scored
+    against the new events, and get a fresh row when they come back.
+    """
+
+    def __init__(self, dim: int = 384, max_users: int = 5000, active_seconds: float = 86400,
+                 block_size: int = 1024, results_per_user: int = 8, initial_capacity: int = 256):
+        self.dim = dim
+        self.max_users = max_users
+        self.active_seconds = active_seconds
+        self.block_size = block_size
+        self.results_per_user = results_per_user
+        self._lock = threading.RLock()
+        self._sync_lock = threading.Lock()
+
+        # Events: one row of _vectors / column of _affinity each, kept dense
+        self._ids = []
+        self._rows = {}
+        self._hashes = {}
+        self._info = []
+        self._vectors = np.zeros((initial_capacity, dim), dtype=np.float32)
+        self._starts = np.full(initial_capacity, NO_DATE, dtype=np.int64)
+        self._ends = np.full(initial_capacity, NO_DATE, dtype=np.int64)
+        self._online = np.zeros(initial_capacity, dtype=bool)
+
+        # Users: id -> {"row", "digest", "seen", "results"}, least recently used first
+        self._users = OrderedDict()
+        self._user_ids = []
+        self._user_vectors = np.zeros((0, dim), dtype=np.float32)
+        self._affinity = np.zeros((0, initial_capacity), dtype=np.float32)
+
+        # Bumped whenever the event set (vectors, dates or online status) changes
+        self.version = 0
+        self._counts = {"hits": 0, "misses": 0, "user_rows": 0, "incremental_pairs": 0, "syncs": 0}
+
+    def __len__(self):
+        return len(self._ids)
+
+    # Events
+
+    def _grow_events(self, needed: int):
+        capacity = len(self._vectors)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        n = len(self._ids)
+        vectors = np.zeros((capacity, self.dim), dtype=np.float32)
+        vectors[:n] = self._vectors[:n]
+        starts, ends = np.full(capacity, NO_DATE, dtype=np.int64), np.full(capacity, NO_DATE, dtype=np.int64)
+        starts[:n], ends[:n] = self._starts[:n], self._ends[:n]
+        online = np.zeros(capacity, dtype=bool)
+        online[:n] = self._online[:n]
+        affinity = np.zeros((len(self._affinity), capacity), dtype=np.float32)
+        affinity[:, :n] = self._affinity[:, :n]
+        self._vectors, self._starts, self._ends, self._online, self._affinity = \
+            vectors, starts, ends, online, affinity
+
+    def _remove_event(self, event_id: str):
+        row = self._rows.pop(event_id)
+        del self._hashes[event_id]
+        last = len(self._ids) - 1
+        if row != last:
+            moved = self._ids[last]
+            for array in (self._vectors, self._starts, self._ends, self._online):
+                array[row] = array[last]
+            self._affinity[:, row] = self._affinity[:, last]
+            self._ids[row] = moved
+            self._info[row] = self._info[last]
+            self._rows[moved] = row
+        self._ids.pop()
+        self._info.pop()
+
+    def _expire_users(self):
+        """Drop users idle for longer than active_seconds so syncs don't score them."""
+        cutoff = time.time() - self.active_seconds
+        stale = [user_id for user_id, user in self._users.items() if user["seen"] < cutoff]
+        for user_id in stale:
+            self._remove_user(user_id)
+
+    def sync(self, events: Iterable[Dict], embed: Callable[[List[str]], Sequence[np.ndarray]]) -> Dict:
+        """
+        Make the event set match `events`: embed new and changed ones, update
+        dates and online status, drop missing ones. The new columns are scored
+        against the active users only.
+
+        Args:
+            events: Records with an id, title, themes, description, start_date,
+                end_date (or deadline) and is_online
+            embed: Returns one vector per text (called outside the lock)
+
+        Returns:
+            {"added", "changed", "removed", "embedded", "scored_pairs"}
+        """
+        events = {str(e["id"]): e for e in events}
+        with self._sync_lock:
+            with self._lock:
+                texts = {event_id: event_text(event) for event_id, event in events.items()}
+                digests = {event_id: hashlib.sha1(text.encode("utf-8")).hexdigest()
+                           for event_id, text in texts.items()}
+                stale = [event_id for event_id, digest in digests.items() if self._hashes.get(event_id) != digest]
+                removed = [event_id for event_id in self._ids if event_id not in events]
+
+            vectors = l2_normalize(np.stack(embed([texts[i] for i in stale]))) if stale else None
+            if vectors is not None and vectors.shape[1] != self.dim:
+                raise ValueError(f"Expected {self.dim}-dimensional vectors, got {vectors.shape[1]}")
+
+            with self._lock:
+                for event_id in removed:
+                    self._remove_event(event_id)
+
+                added = [event_id for event_id in stale if event_id not in self._rows]
+                self._grow_events(len(self._ids) + len(added))
+                for event_id in added:
+                    self._rows[event_id] = len(self._ids)
+                    self._ids.append(event_id)
+                    self._info.append(None)
+
+                metadata_changed = False
+                for event_id, event in events.items():
+                    row = self._rows[event_id]
+                    info = {field: event.get(field) for field in EVENT_FIELDS}
+                    info.update(id=event_id, end_date=event.get("end_date") or event.get("deadline"),
+                                is_online=bool(event.get("is_online")))
+                    start, end = _ordinal(info["start_date"]), _ordinal(info["end_date"])
+                    online = info["is_online"]
+                    if info != self._info[row]:
+                        metadata_changed = True
+                    self._starts[row], self._ends[row], self._online[row], self._info[row] = start, end, online, info
+
+                stale_rows = np.array([self._rows[i] for i in stale], dtype=np.int64)
+                if len(stale_rows):
+                    self._vectors[stale_rows] = vectors
+                    for event_id in stale:
+                        self._hashes[event_id] = digests[event_id]
+
+                self._expire_users()
+                scored = 0
+                if len(stale_rows) and self._users:
+                    scores = np.empty((len(self._user_ids), len(stale_rows)), dtype=np.float32)
+                    blocked_scores(self._user_vectors[:len(self._user_ids)], vectors, scores, self.block_size)
+                    self._affinity[:len(self._user_ids), stale_rows] = scores
+                    scored = scores.size
+                    self._counts["incremental_pairs"] += scored
+
+                if stale or removed or metadata_changed:
+                    self.version += 1
+                self._counts["syncs"] += 1
+
+        return {"added": len(added), "changed": len(stale) - len(added), "removed": len(removed),
+                "embedded": len(stale), "scored_pairs": scored}
+
+    # Users
+
+    def _remove_user(self, user_id: str):
+        row = self._users.pop(user_id)["row"]
+        last = len(self._user_ids) - 1
+        if row != last:
+            moved = self._user_ids[last]
+            self._user_vectors[row] = self._user_vectors[last]
+            self._affinity[row] = self._affinity[last]
+            self._user_ids[row] = moved
+            self._users[moved]["row"] = row
+        self._user_ids.pop()
+
+    def _user_row(self, user_id: str, vector: np.ndarray, digest: str) -> int:
+        """Row of the user in the affinity matrix, (re)scored when new or when the profile changed."""
+        user = self._users.get(user_id)
+        if user is not None and user["digest"] == digest:
+            self._users.move_to_end(user_id)
+            user["seen"] = time.time()
+            return user["row"]
+
+        if user is None:
+            if len(self._users) >= self.max_users:
+                self._remove_user(next(iter(self._users)))
+            row = len(self._user_ids)
+            if row >= len(self._affinity):
+                capacity = max(16, 2 * len(self._affinity))
+                affinity = np.zeros((capacity, len(self._vectors)), dtype=np.float32)
+                affinity[:row] = self._affinity[:row]
+                vectors = np.zeros((capacity, self.dim), dtype=np.float32)
+                vectors[:row] = self._user_vectors[:row]
+                self._affinity, self._user_vectors = affinity, vectors
+            self._user_ids.append(user_id)
+            user = self._users[user_id] = {"row": row}
+
+        self._users.move_to_end(user_id)
+        user.update(digest=digest, seen=time.time(), results=OrderedDict())
+        row = user["row"]
+        self._user_vectors[row] = vector
+        n = len(self._ids)
+        blocked_scores(vector[None, :], self._vectors[:n], self._affinity[row:row + 1, :n], self.block_size)
+        self._counts["user_rows"] += 1
+        return row
+
+    def forget(self, user_ids: Iterable[str]) -> int:
+        """Drop cached rows (e.g. for deleted accounts). Unknown ids are ignored."""
+        removed = 0
+        with self._lock:
+            for user_id in user_ids:
+                if user_id in self._users:
+                    self._remove_user(user_id)
+                    removed += 1
+        return removed
+
+    # Queries
+
+    def _mask(self, n: int, today: int, online: Optional[bool], start_after: int, start_before: int,
+              include_past: bool) -> np.ndarray:
+        mask = np.ones(n, dtype=bool)
+        starts, ends = self._starts[:n], self._ends[:n]
+        if not include_past:
+            # Upcoming or still running; events without dates are kept
+            last_day = np.where(ends != NO_DATE, ends, starts)
+            mask &= (last_day == NO_DATE) | (last_day >= today)
+        if online is not None:
+            mask &= self._online[:n] == online
+        if start_after != NO_DATE:
+            mask &= (starts != NO_DATE) & (starts >= start_after)
+        if start_before != NO_DATE:
+            mask &= (starts != NO_DATE) & (starts <= start_before)
+        return mask
+
+    def recommend(self, user_id: Optional[str], vector: np.ndarray, k: int = 10, online: Optional[bool] = None,
+                  start_after: Optional[str] = None, start_before: Optional[str] = None,
+                  include_past: bool = False, exclude: Iterable[str] = ()) -> Dict:
+        """
+        Top-k upcoming events for a profile vector.
+
+        Args:
+            user_id: Caches the user's affinity row and results; None scores
+                the vector without caching anything
+            vector: Profile embedding
+            k: Number of events
+            online: Only online (True) or in-person (False) events
+            start_after: Only events starting on or after this ISO date
+            start_before: Only events starting on or before this ISO date
+            include_past: Keep events that have already ended
+            exclude: Event ids to leave out (e.g. already bookmarked)
+
+        Returns:
+            {"results": [{"id", "score", **event fields}], "cached": bool, "events": int}
+        """
+        vector = l2_normalize(np.asarray(vector, dtype=np.float32).reshape(-1))
+        if len(vector) != self.dim:
+            raise ValueError(f"Expected a {self.dim}-dimensional vector")
+        bounds = (_ordinal(start_after), _ordinal(start_before))
+        if (start_after and bounds[0] == NO_DATE) or (start_before and bounds[1] == NO_DATE):
+            raise ValueError("start_after and start_before must be ISO dates")
+        exclude = sorted(set(str(e) for e in exclude))
+        today = date.today().toordinal()
+        key = (k, online, *bounds, include_past, tuple(exclude), today)
+        digest = hashlib.sha1(vector.tobytes()).hexdigest()
+
+        with self._lock:
+            n = len(self._ids)
+            if user_id is None:
+                scores = np.empty((1, n), dtype=np.float32)
+                blocked_scores(vector[None, :], self._vectors[:n], scores, self.block_size)
+                scores = scores[0]
+            else:
+                user = self._users.get(user_id)
+                if user is not None and user["digest"] == digest:
+                    cached = user["results"].get(key)
+                    if cached is not None and cached[0] == self.version:
+                        self._users.move_to_end(user_id)
+                        user["seen"] = time.time()
+                        self._counts["hits"] += 1
+                        return {"results": cached[1], "cached": True, "events": n}
+                row = self._user_row(user_id, vector, digest)
+                scores = self._affinity[row, :n]
+            self._counts["misses"] += 1
+
+            mask = self._mask(n, today, online, bounds[0], bounds[1], include_past)
+            for event_id in exclude:
+                if event_id in self._rows:
+                    mask[self._rows[event_id]] = False
+            candidates = np.flatnonzero(mask)
+            best = candidates[top_k(scores[candidates], k)] if k > 0 and len(candidates) else candidates[:0]
+            results = [{**self._info[i], "score": round(float(scores[i]), 6)} for i in best]
+
+            if user_id is not None:
+                cache = self._users[user_id]["results"]
+                cache[key] = (self.version, results)
+                while len(cache) > self.results_per_user:
+                    cache.popitem(last=False)
+        return {"results": results, "cached": False, "events": n}
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "events": len(self._ids),
+                "users": len(self._users),
+                "version": self.version,
+                "affinity_bytes": int(self._affinity.nbytes),
+                **self._counts,
+            }
@@ -0,0 +1,120 @@
+"""
+Export the embedding model to ONNX (optionally int8-quantized) at build time.
+
+    python export_onnx.py ./models/all-MiniLM-L6-v2 [--quantize] [--min-cosine 0.99]
+
+Downloads the model into the directory first if it is not there yet (as
+prefetch_model.py does), writes onnx/model.onnx (and onnx/model_int8.onnx
+with --quantize), then checks that the ONNX embeddings agree with the
+PyTorch ones: the export fails if any parity text's cosine similarity falls
+below --min-cosine. Serve it with EMBED_MODEL_DIR=<dir> and
+EMBED_BACKEND=onnx or onnx-int8.
+
+Needs torch, onnx and onnxruntime; only onnxruntime and tokenizers are
+needed at runtime.
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+
+from onnx_backend import OnnxEmbedder, cosine_agreement, onnx_path
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+
+# Profile- and hackathon-like texts, one long enough to be truncated
+PARITY_TEXTS = [
+    "Full-stack developer, React and Node.js, looking for a hackathon team",
+    "Machine learning engineer interested in climate and sustainability projects",
+    "Beginner-friendly online hackathon with prizes for the best social impact hack",
+    "iOS developer (Swift, SwiftUI) and UI/UX designer",
+    "Data science, pandas, PyTorch, computer vision",
+    "Blockchain, Solidity, smart contracts, DeFi",
+    "Hack the North 2025",
+    "Game jam: build a game in 48 hours with Unity or Godot",
+    "Looking for teammates who know Rust or Go for a backend-heavy project",
+    "healthcare",
+    "AI agents, LLMs, retrieval-augmented generation and vector databases",
+    " ".join(["Open source contributor who enjoys compilers, databases and distributed systems."] * 40),
+]
+
+
+def export(model, target: str, opset: int):
+    import torch
+
+    class LastHiddenState(torch.nn.Module):
+        def __init__(self, transformer):
+            super().__init__()
+            self.transformer = transformer
+
+        def forward(self, input_ids, attention_mask, token_type_ids=None):
+            return self.transformer(input_ids=input_ids, attention_mask=attention_mask,
+                                    token_type_ids=token_type_ids).last_hidden_state
+
+    wrapper = LastHiddenState(model[0].auto_model).eval()
+    sample = model.tokenizer(["export sample text"], return_tensors="pt")
+    names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with torch.no_grad():
+        torch.onnx.export(
+            wrapper, tuple(sample[name] for name in names), target,
+            input_names=names,
+            output_names=["last_hidden_state"],
+            dynamic_axes={**{name: {0: "batch", 1: "sequence"} for name in names},
+                          "last_hidden_state": {0: "batch", 1: "sequence"}},
+            opset_version=opset,
+            do_constant_folding=True,
+        )
+    print(f"Wrote {target} ({os.path.getsize(target) / 1e6:.1f} MB)")
+
+
+def quantize(source: str, target: str):
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    # Dynamic quantization: int8 weights, activations quantized per batch at run time
+    quantize_dynamic(source, target, weight_type=QuantType.QInt8)
+    print(f"Wrote {target} ({os.path.getsize(target) / 1e6:.1f} MB)")
+
+
+def check_parity(reference: np.ndarray, model_dir: str, quantized: bool, min_cosine: float) -> bool:
+    embedder = OnnxEmbedder(model_dir, quantized=quantized)
+    agreement = cosine_agreement(reference, embedder.encode(PARITY_TEXTS))
+    ok = agreement["min"] >= min_cosine
+    print(f"  {os.path.basename(embedder.path):<16} cosine min {agreement['min']:.6f} "
+          f"mean {agreement['mean']:.6f} {'ok' if ok else f'BELOW {min_cosine}'}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("model_dir", nargs="?", default=f"models/{MODEL_NAME}")
+    parser.add_argument("--quantize", action="store_true", help="Also write a dynamically int8-quantized model")
+    parser.add_argument("--opset", type=int, default=14)
+    parser.add_argument("--min-cosine", type=float, default=0.99,
+                        help="Lowest acceptable cosine similarity to the PyTorch embeddings")
+    parser.add_argument("--check-only", action="store_true", help="Only run the parity check on existing exports")
+    args = parser.parse_args()
+
+    from sentence_transformers import SentenceTransformer
+
+    if not os.path.exists(os.path.join(args.model_dir, "modules.json")):
+        print(f"Downloading {MODEL_NAME} to {args.model_dir}...")
+        SentenceTransformer(MODEL_NAME).save(args.model_dir)
+    model = SentenceTransformer(args.model_dir, device="cpu")
+
+    if not args.check_only:
+        export(model, onnx_path(args.model_dir), args.opset)
+        if args.quantize:
+            quantize(onnx_path(args.model_dir), onnx_path(args.model_dir, quantized=True))
+
+    print(f"Parity against PyTorch on {len(PARITY_TEXTS)} texts:")
+    reference = model.encode(PARITY_TEXTS)
+    results = [check_parity(reference, args.model_dir, quantized, args.min_cosine)
+               for quantized in (False, True) if os.path.exists(onnx_path(args.model_dir, quantized))]
+    if not all(results):
+        sys.exit("ONNX embeddings disagree with PyTorch; do not serve this export")
+
+
+if __name__ == "__main__":
+    main()
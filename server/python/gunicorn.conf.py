@@ -0,0 +1,30 @@
+# gunicorn -c gunicorn.conf.py embedding_service:app
+#
+# With EMBED_PRELOAD=True the app (and the model) is imported once in the
+# master process before forking, so workers share the model weights
+# copy-on-write instead of each loading a private copy.
+#
+# The profile index is per-process, so it is disabled when WEB_CONCURRENCY > 1;
+# /search then answers 503 and the Node API ranks teammates itself.
+#
+# Each worker encodes on a single inference thread; the request threads only
+# queue texts for it. The host's cores are split between the workers'
+# torch intra-op pools (EMBED_TORCH_THREADS overrides the share).
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5002)}"
+workers = int(os.environ.get("WEB_CONCURRENCY", 1))
+# Read by embedding_service: the in-memory profile index (/index/*, /search)
+# is only served when there is a single worker
+os.environ["EMBED_WORKERS"] = str(workers)
+os.environ.setdefault("EMBED_TORCH_THREADS", str(max(1, (os.cpu_count() or 1) // workers)))
+threads = int(os.environ.get("EMBED_THREADS", 4))
+preload_app = os.environ.get("EMBED_PRELOAD", "False") == "True"
+timeout = 120
+
+
+def post_fork(server, worker):
+    # Thread pool sizes set in a preloading master are not guaranteed to carry over a fork
+    from model_loader import set_torch_threads
+
+    set_torch_threads(int(os.environ["EMBED_TORCH_THREADS"]))
@@ -0,0 +1,326 @@
+"""
+Metrics and profiling shared by the embedding service, the hackathon API and
+the scrapers.
+
+Counters, gauges and histograms live in a process-wide registry and are
+rendered in the Prometheus text format by the /metrics route that
+instrument_flask() adds (along with a request latency histogram). Hot paths
+are wrapped in stage timers:
+
+    with timer("mlh.parse"):
+        events = scraper.parse_events(html)
+
+which all feed one `stage_duration_seconds{stage=...}` histogram.
+
+With PROFILING_ENABLED=True, GET /debug/profile?seconds=10 samples every
+thread's stack for the window and returns them in the collapsed format
+flamegraph.pl and speedscope read.
+
+Metrics are per process: with several gunicorn workers each scrape of
+/metrics is answered by one worker, identified by the `process_id` gauge.
+"""
+import bisect
+import math
+import os
+import sys
+import threading
+import time
+from collections import Counter as _Tally
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "False") == "True"
+MAX_PROFILE_SECONDS = 60
+
+# Seconds; covers sub-millisecond cache hits up to slow scrapes
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _key(self, labels: Dict) -> Tuple[str, ...]:
+        if len(labels) != len(self.labelnames) or any(name not in labels for name in self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> Iterable[Tuple[str, str, float]]:
+        """(metric name, label string, value) rows for the exposition format."""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines += [f"{name}{labels} {_format_value(value)}" for name, labels, value in self.samples()]
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonic count, e.g. texts encoded or requests shed."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield self.name, _format_labels(self.labelnames, key), value
+
+
+class Gauge(_Metric):
+    """
+    Current value. Either set() explicitly or computed at scrape time by
+    `fn`, which returns a number or a {label values tuple: number} dict.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), fn: Optional[Callable] = None):
+        super().__init__(name, help, labelnames)
+        self.fn = fn
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def samples(self):
+        if self.fn is not None:
+            try:
+                current = self.fn()
+            except Exception:
+                return
+            items = current.items() if isinstance(current, dict) else [((), current)]
+        else:
+            with self._lock:
+                items = list(self._values.items())
+        for key, value in sorted(items, key=lambda item: item[0]):
+            if value is not None:
+                yield self.name, _format_labels(self.labelnames, key), value
+
+
+class Histogram(_Metric):
+    """Distribution of observations in cumulative buckets plus their sum and count."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            state[0][bisect.bisect_left(self.buckets, value)] += 1
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels) -> int:
+        state = self._values.get(self._key(labels))
+        return state[2] if state else 0
+
+    def samples(self):
+        with self._lock:
+            items = sorted((key, ([*state[0]], state[1], state[2])) for key, state in self._values.items())
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket in zip(self.buckets, counts):
+                cumulative += bucket
+                le = 'le="' + _format_value(bound) + '"'
+                yield f"{self.name}_bucket", _format_labels(self.labelnames, key, le), cumulative
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, count
+
+
+class Registry:
+    """Named metrics of one process; asking for an existing name returns the same metric."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, *args, **kwargs):
+        with self._lock:
+            existing = self._metrics.get(name)
+            if existing is not None:
+                if not isinstance(existing, cls):
+                    raise ValueError(f"{name} is already registered as a {existing.kind}")
+                return existing
+            metric = self._metrics[name] = cls(name, *args, **kwargs)
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = (), fn: Optional[Callable] = None) -> Gauge:
+        gauge = self._get_or_create(Gauge, name, help, labelnames)
+        if fn is not None:
+            gauge.fn = fn
+        return gauge
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+_STARTED = time.time()
+REGISTRY = Registry()
+STAGE_SECONDS = REGISTRY.histogram("stage_duration_seconds", "Time spent in instrumented hot-path stages", ("stage",))
+REGISTRY.gauge("process_id", "PID of the process answering this scrape", fn=os.getpid)
+REGISTRY.gauge("process_start_time_seconds", "Unix time the process started", fn=lambda: _STARTED)
+
+
+@contextmanager
+def timer(stage: str):
+    """Record how long the block takes under stage_duration_seconds{stage=...}."""
+    with STAGE_SECONDS.time(stage=stage):
+        yield
+
+
+def timed(stage: str):
+    """Decorator form of timer()."""
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timer(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+class SamplingProfiler:
+    """
+    Samples the stacks of every other thread at a fixed interval.
+
+    Stacks are aggregated as "thread;module.py:function;..." -> sample count,
+    i.e. the collapsed format flame graph tools consume. Only one profile
+    runs at a time.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _stack(frame) -> str:
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+    def profile(self, seconds: float, interval: float = 0.005) -> Dict[str, int]:
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError("A profile is already running")
+        try:
+            stacks = _Tally()
+            me = threading.get_ident()
+            deadline = time.monotonic() + seconds
+            while time.monotonic() < deadline:
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id != me:
+                        stacks[f"{names.get(thread_id, thread_id)};{self._stack(frame)}"] += 1
+                time.sleep(interval)
+            return dict(stacks)
+        finally:
+            self._lock.release()
+
+
+def collapsed(stacks: Dict[str, int]) -> str:
+    """Collapsed-stack text: one "frame;frame;frame count" line per stack, heaviest first."""
+    return "".join(f"{stack} {count}\n" for stack, count in sorted(stacks.items(), key=lambda item: -item[1]))
+
+
+profiler = SamplingProfiler()
+
+
+def instrument_flask(app, registry: Registry = REGISTRY, profiling: bool = PROFILING_ENABLED):
+    """
+    Time every request of a Flask app and add GET /metrics (and, when
+    profiling is enabled, GET /debug/profile?seconds=&interval_ms=).
+    """
+    from flask import Response, g, jsonify, request
+
+    latency = registry.histogram("http_request_duration_seconds", "Request latency by route",
+                                 ("method", "route", "status"))
+
+    @app.before_request
+    def _start_timer():
+        g._instrumentation_started = time.perf_counter()
+
+    @app.after_request
+    def _record_request(response):
+        started = getattr(g, "_instrumentation_started", None)
+        if started is not None:
+            route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+            latency.observe(time.perf_counter() - started, method=request.method, route=route,
+                            status=response.status_code)
+        return response
+
+    @app.route("/metrics", methods=["GET"])
+    def metrics():
+        return Response(registry.render(), mimetype="text/plain; version=0.0.4")
+
+    if profiling:
+        @app.route("/debug/profile", methods=["GET"])
+        def debug_profile():
+            try:
+                seconds = min(float(request.args.get("seconds", 10)), MAX_PROFILE_SECONDS)
+                interval = max(float(request.args.get("interval_ms", 5)), 1) / 1000.0
+                stacks = profiler.profile(seconds, interval)
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            except RuntimeError as e:
+                return jsonify({"error": str(e)}), 409
+            return Response(collapsed(stacks), mimetype="text/plain")
@@ -0,0 +1,498 @@
+import os
+import tempfile
+import threading
+import time
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from vector_index import VectorIndex, l2_normalize, top_k
+
+
+def spherical_kmeans(vectors: np.ndarray, k: int, iterations: int = 10, max_train: int = 256,
+                     seed: int = 0) -> np.ndarray:
+    """
+    Cluster unit vectors by cosine similarity and return k unit centroids.
+
+    Training uses at most `max_train` points per centroid; assignment is a
+    chunked matrix product so memory stays bounded on large inputs.
+    """
+    rng = np.random.default_rng(seed)
+    if len(vectors) > k * max_train:
+        vectors = vectors[rng.choice(len(vectors), k * max_train, replace=False)]
+    k = min(k, len(vectors))
+    centroids = vectors[rng.choice(len(vectors), k, replace=False)].copy()
+
+    for _ in range(iterations):
+        assign = assign_nearest(vectors, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, vectors)
+        counts = np.bincount(assign, minlength=k)
+        empty = counts == 0
+        if empty.any():
+            # Re-seed empty clusters from random points
+            sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()))]
+        centroids = l2_normalize(sums)
+
+    return centroids
+
+
+def assign_nearest(vectors: np.ndarray, centroids: np.ndarray, chunk: int = 8192) -> np.ndarray:
+    out = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), chunk):
+        out[start:start + chunk] = np.argmax(vectors[start:start + chunk] @ centroids.T, axis=1)
+    return out
+
+
+def quantize_residuals(residuals: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Symmetric per-vector int8 quantization: residual ~= scale * codes."""
+    scales = np.abs(residuals).max(axis=1) / 127.0
+    scales[scales == 0] = 1e-12
+    codes = np.clip(np.rint(residuals / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def recall_at_k(ann, exact: VectorIndex, queries: np.ndarray, k: int = 10, **search_kwargs) -> float:
+    """Fraction of the exact top-k neighbours that the approximate index also returns."""
+    found = 0
+    total = 0
+    for query in queries:
+        truth, _ = exact.search(query, k=k)
+        approx, _ = ann.search(query, k=k, **search_kwargs)
+        found += len(set(truth) & set(approx))
+        total += len(truth)
+    return found / total if total else 1.0
+
+
+class _SourceStore:
+    """
+    float16 copies of the indexed vectors in an unlinked temporary file,
+    memory-mapped so they stay out of the resident set. Only re-clustering
+    and get() read them; searches never do. Re-clustering trains and
+    re-quantizes from these rather than from int8 reconstructions, so
+    repeated re-clusters don't compound quantization error.
+    """
+
+    def __init__(self, dim: int, directory: Optional[str] = None, capacity: int = 1024):
+        self.dim = dim
+        self._file = tempfile.TemporaryFile(dir=directory)
+        self._rows = {}
+        self._free = []
+        self._used = 0
+        self._map = None
+        self._resize(capacity)
+
+    def __len__(self):
+        return len(self._rows)
+
+    @property
+    def file_bytes(self) -> int:
+        return int(self._map.nbytes)
+
+    def _resize(self, capacity: int):
+        if self._map is not None:
+            self._map.flush()
+        self._file.truncate(capacity * self.dim * 2)
+        self._map = np.memmap(self._file, dtype=np.float16, mode="r+", shape=(capacity, self.dim))
+
+    def put(self, item_id: str, vector: np.ndarray):
+        row = self._rows.get(item_id)
+        if row is None:
+            if self._free:
+                row = self._free.pop()
+            else:
+                if self._used == len(self._map):
+                    self._resize(2 * len(self._map))
+                row = self._used
+                self._used += 1
+            self._rows[item_id] = row
+        self._map[row] = vector
+
+    def delete(self, item_id: str):
+        row = self._rows.pop(item_id, None)
+        if row is not None:
+            self._free.append(row)
+
+    def get_many(self, ids: List[str]) -> np.ndarray:
+        rows = np.fromiter((self._rows[i] for i in ids), dtype=np.int64, count=len(ids))
+        return l2_normalize(self._map[rows].astype(np.float32))
+
+
+class _InvertedList:
+    """Growable int8 codes, scales and ids for one IVF cell: all a search reads."""
+
+    def __init__(self, dim: int, capacity: int = 64):
+        self.codes = np.zeros((capacity, dim), dtype=np.int8)
+        self.scales = np.zeros(capacity, dtype=np.float32)
+        self.ids = []
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + self.scales.nbytes
+
+    def append(self, item_id: str, codes: np.ndarray, scale: float) -> int:
+        pos = len(self.ids)
+        if pos == len(self.codes):
+            self.codes = np.concatenate([self.codes, np.zeros_like(self.codes)])
+            self.scales = np.concatenate([self.scales, np.zeros_like(self.scales)])
+        self.codes[pos] = codes
+        self.scales[pos] = scale
+        self.ids.append(item_id)
+        return pos
+
+    def remove(self, pos: int) -> Optional[str]:
+        """Swap-remove the entry at pos; returns the id that moved into pos, if any."""
+        last = len(self.ids) - 1
+        moved = None
+        if pos != last:
+            self.codes[pos] = self.codes[last]
+            self.scales[pos] = self.scales[last]
+            moved = self.ids[last]
+            self.ids[pos] = moved
+        self.ids.pop()
+        return moved
+
+
+class IVFIndex:
+    """
+    Approximate cosine-similarity index: inverted lists over k-means centroids
+    with int8-quantized residuals: dim + 4 resident bytes per vector instead of
+    4 * dim for float32 rows. A float16 copy of every vector is kept in a
+    memory-mapped file (in `source_dir`, default the temp dir) for
+    re-clustering and get().
+
+    Vectors are held in an exact VectorIndex until `train_size` of them have
+    arrived, then clustered into `nlist` cells. A search scores the `nprobe`
+    closest cells only. Adds after training go straight to their nearest
+    cell; a background thread re-clusters once enough new vectors have
+    arrived since the last training run.
+
+    With `shadow=True` an exact copy is kept alongside so recall@k against
+    the exact scan can be measured (costs the memory savings back).
+    """
+
+    # An allow-list covering at least this share of the index is applied after probing
+    DENSE_ALLOW_FRACTION = 0.5
+
+    def __init__(self, dim: int = 384, nlist: int = 0, nprobe: int = 8, train_size: int = 2048,
+                 recluster_interval: float = 600.0, recluster_growth: float = 0.5,
+                 shadow: bool = False, source_dir: Optional[str] = None):
+        self.dim = dim
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.train_size = train_size
+        self.recluster_interval = recluster_interval
+        self.recluster_growth = recluster_growth
+        self.shadow = VectorIndex(dim) if shadow else None
+
+        self._staging = VectorIndex(dim)
+        self._sources = _SourceStore(dim, source_dir)
+        self._centroids = None
+        self._lists = []
+        self._locations = {}
+        self._lock = threading.RLock()
+        self._train_lock = threading.Lock()
+        self._trained_size = 0
+        self._journal = None
+        self._worker = None
+        self._worker_pid = None
+        self.last_trained = None
+        self.last_train_seconds = None
+        self.last_recall = None
+
+    def __len__(self):
+        with self._lock:
+            return len(self._staging) if self._centroids is None else len(self._locations)
+
+    def __contains__(self, item_id):
+        with self._lock:
+            return item_id in self._staging or item_id in self._locations
+
+    @property
+    def trained(self) -> bool:
+        return self._centroids is not None
+
+    # ------------------------------------------------------------------
+    # Training
+    # ------------------------------------------------------------------
+
+    def _choose_nlist(self, n: int) -> int:
+        if self.nlist:
+            return self.nlist
+        return int(min(4096, max(16, 4 * np.sqrt(n))))
+
+    def _build(self, ids: List[str], vectors: np.ndarray):
+        """Cluster and quantize vectors into fresh centroids and inverted lists."""
+        centroids = spherical_kmeans(vectors, self._choose_nlist(len(vectors)))
+        lists = [_InvertedList(self.dim) for _ in range(len(centroids))]
+        locations = {}
+        assign = assign_nearest(vectors, centroids)
+        codes, scales = quantize_residuals(vectors - centroids[assign])
+        for item_id, cell, code, scale in zip(ids, assign, codes, scales):
+            locations[item_id] = (int(cell), lists[cell].append(item_id, code, scale))
+        return centroids, lists, locations
+
+    def _snapshot(self) -> Tuple[List[str], np.ndarray]:
+        if self._centroids is None:
+            ids = list(self._staging._ids)
+            return ids, self._staging._matrix[:len(ids)].copy()
+        # Source vectors, not int8 reconstructions: re-quantizing those would add error every run
+        ids = [item_id for inverted in self._lists for item_id in inverted.ids]
+        return ids, self._sources.get_many(ids) if ids else np.zeros((0, self.dim), np.float32)
+
+    def train(self):
+        """(Re-)cluster every stored vector. Mutations made meanwhile are replayed."""
+        if not self._train_lock.acquire(blocking=False):
+            return
+        try:
+            self._train()
+        finally:
+            self._train_lock.release()
+
+    def _train(self):
+        started = time.perf_counter()
+        with self._lock:
+            ids, vectors = self._snapshot()
+            if len(ids) < 2:
+                return
+            self._journal = []
+
+        centroids, lists, locations = self._build(ids, vectors)
+
+        with self._lock:
+            # Replay upserts/deletes that happened while clustering ran
+            for op, item_id, vector in self._journal:
+                old = locations.pop(item_id, None)
+                if old is not None:
+                    moved = lists[old[0]].remove(old[1])
+                    if moved is not None:
+                        locations[moved] = old
+                if op == "upsert":
+                    locations[item_id] = self._place(centroids, lists, item_id, vector)
+
+            self._journal = None
+            self._centroids = centroids
+            self._lists = lists
+            self._locations = locations
+            self._staging = VectorIndex(self.dim)
+            self._trained_size = len(locations)
+            self.last_trained = time.time()
+            self.last_train_seconds = round(time.perf_counter() - started, 3)
+
+    def _needs_recluster(self) -> bool:
+        if self._centroids is None:
+            return len(self._staging) >= self.train_size
+        return len(self._locations) > self._trained_size * (1 + self.recluster_growth)
+
+    def _ensure_worker(self):
+        pid = os.getpid()
+        if self._worker is not None and self._worker_pid == pid and self._worker.is_alive():
+            return
+        self._worker = threading.Thread(target=self._run, name="ivf-recluster", daemon=True)
+        self._worker_pid = pid
+        self._worker.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.recluster_interval)
+            try:
+                if self._needs_recluster():
+                    self.train()
+            except Exception as e:
+                print(f"IVF re-clustering failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Mutations
+    # ------------------------------------------------------------------
+
+    def _place(self, centroids, lists, item_id: str, vector: np.ndarray) -> Tuple[int, int]:
+        cell = int(np.argmax(centroids @ vector))
+        codes, scales = quantize_residuals((vector - centroids[cell])[None, :])
+        return cell, lists[cell].append(item_id, codes[0], scales[0])
+
+    def _remove(self, item_id: str) -> bool:
+        location = self._locations.pop(item_id, None)
+        if location is None:
+            return False
+        cell, pos = location
+        moved = self._lists[cell].remove(pos)
+        if moved is not None:
+            self._locations[moved] = (cell, pos)
+        return True
+
+    def upsert(self, items: Iterable[Tuple[str, np.ndarray]]) -> int:
+        items = list(items)
+        if not items:
+            return 0
+        ids = [item_id for item_id, _ in items]
+        vectors = l2_normalize(np.stack([np.asarray(v, dtype=np.float32) for _, v in items]))
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected {self.dim}-dimensional vectors, got {vectors.shape[1]}")
+
+        with self._lock:
+            if self.shadow is not None:
+                self.shadow.upsert(zip(ids, vectors))
+            for item_id, vector in zip(ids, vectors):
+                self._sources.put(item_id, vector)
+            if self._centroids is None:
+                self._staging.upsert(zip(ids, vectors))
+            else:
+                for item_id, vector in zip(ids, vectors):
+                    self._remove(item_id)
+                    self._locations[item_id] = self._place(self._centroids, self._lists, item_id, vector)
+            if self._journal is not None:
+                self._journal.extend(("upsert", i, v) for i, v in zip(ids, vectors))
+            train_now = self._centroids is None and len(self._staging) >= self.train_size
+
+        if train_now:
+            self.train()
+        self._ensure_worker()
+        return len(ids)
+
+    def delete(self, ids: Iterable[str]) -> int:
+        removed = 0
+        with self._lock:
+            for item_id in ids:
+                if self.shadow is not None:
+                    self.shadow.delete([item_id])
+                self._sources.delete(item_id)
+                if self._centroids is None:
+                    removed += self._staging.delete([item_id])
+                else:
+                    removed += self._remove(item_id)
+                if self._journal is not None:
+                    self._journal.append(("delete", item_id, None))
+        return removed
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def get(self, item_id: str) -> Optional[np.ndarray]:
+        with self._lock:
+            if self._centroids is None:
+                return self._staging.get(item_id)
+            if item_id not in self._locations:
+                return None
+            return self._sources.get_many([item_id])[0]
+
+    def _score_cells(self, query: np.ndarray, centroid_scores: np.ndarray,
+                     cells: Iterable[int]) -> Tuple[List[str], np.ndarray]:
+        """Scores of every entry in the given cells, from their int8 codes."""
+        ids = []
+        parts = []
+        for cell in cells:
+            inverted = self._lists[cell]
+            n = len(inverted)
+            if n == 0:
+                continue
+            # q . (c + s * codes) = q . c + s * (codes @ q)
+            parts.append(centroid_scores[cell] + inverted.scales[:n] * (inverted.codes[:n] @ query))
+            ids.extend(inverted.ids)
+        return ids, np.concatenate(parts) if parts else np.zeros(0, dtype=np.float32)
+
+    def _score_allowed(self, query: np.ndarray, centroid_scores: np.ndarray,
+                       allowed: List[str]) -> Tuple[List[str], np.ndarray]:
+        """Scores of the allowed ids, one vectorized product per cell they fall in."""
+        located = [(self._locations[i], i) for i in allowed]
+        cells = np.fromiter((loc[0] for loc, _ in located), dtype=np.int64, count=len(located))
+        positions = np.fromiter((loc[1] for loc, _ in located), dtype=np.int64, count=len(located))
+        order = np.argsort(cells, kind="stable")
+        cells, positions = cells[order], positions[order]
+        bounds = np.flatnonzero(np.diff(cells)) + 1
+
+        scores = np.empty(len(located), dtype=np.float32)
+        for start, stop in zip(np.r_[0, bounds], np.r_[bounds, len(cells)]):
+            cell = cells[start]
+            inverted = self._lists[cell]
+            rows = positions[start:stop]
+            scores[start:stop] = centroid_scores[cell] + inverted.scales[rows] * (inverted.codes[rows] @ query)
+        return [located[p][1] for p in order], scores
+
+    def search(self, query: np.ndarray, k: int = 10, allow_ids: Optional[Iterable[str]] = None,
+               exclude_ids: Optional[Iterable[str]] = None,
+               nprobe: Optional[int] = None) -> Tuple[List[str], List[float]]:
+        query = l2_normalize(query)
+        exclude = set(exclude_ids or ())
+
+        with self._lock:
+            if self._centroids is None:
+                return self._staging.search(query, k=k, allow_ids=allow_ids, exclude_ids=exclude)
+
+            if k <= 0:
+                return [], []
+            centroid_scores = self._centroids @ query
+            allowed = None
+            if allow_ids is not None:
+                allowed = {i for i in allow_ids if i in self._locations} - exclude
+                if not allowed:
+                    return [], []
+
+            ids, scores = [], None
+            if allowed is None or len(allowed) >= self.DENSE_ALLOW_FRACTION * len(self._locations):
+                # Unfiltered, or the allow-list covers most of the index (e.g. "everyone
+                # but me"): probe as usual and drop what isn't allowed afterwards
+                probe = top_k(centroid_scores, min(nprobe or self.nprobe, len(self._centroids)))
+                ids, scores = self._score_cells(query, centroid_scores, probe)
+                if exclude or allowed is not None:
+                    for pos, item_id in enumerate(ids):
+                        if item_id in exclude or (allowed is not None and item_id not in allowed):
+                            scores[pos] = -np.inf
+                if allowed is not None and np.isfinite(scores).sum() < min(k, len(allowed)):
+                    ids = []
+
+            if not ids and allowed is not None:
+                # Selective filter: score exactly the allowed entries, cell by cell
+                ids, scores = self._score_allowed(query, centroid_scores, list(allowed))
+            if not ids:
+                return [], []
+            best = top_k(scores, k)
+            best = best[np.isfinite(scores[best])]
+            return [ids[p] for p in best], scores[best].tolist()
+
+    def missing(self, ids: Iterable[str]) -> List[str]:
+        with self._lock:
+            return [i for i in ids if i not in self._locations and i not in self._staging]
+
+    def evaluate_recall(self, k: int = 10, samples: int = 100, nprobe: Optional[int] = None) -> float:
+        """Recall@k against the exact shadow index, using stored vectors as queries."""
+        if self.shadow is None:
+            raise RuntimeError("Recall needs the exact shadow index (EMBED_IVF_SHADOW=True)")
+        with self.shadow._lock:
+            n = len(self.shadow)
+            if n == 0:
+                return 1.0
+            rows = np.random.default_rng().choice(n, min(samples, n), replace=False)
+            queries = self.shadow._matrix[rows].copy()
+        self.last_recall = {"k": k, "nprobe": nprobe or self.nprobe,
+                            "recall": round(recall_at_k(self, self.shadow, queries, k=k, nprobe=nprobe), 4)}
+        return self.last_recall["recall"]
+
+    def stats(self) -> dict:
+        with self._lock:
+            if self._centroids is None:
+                stored = self._staging.stats()["bytes"]
+                vectors = len(self._staging)
+            else:
+                stored = sum(l.nbytes for l in self._lists) + self._centroids.nbytes
+                vectors = len(self._locations)
+            return {
+                "mode": "ivf",
+                "trained": self._centroids is not None,
+                "vectors": vectors,
+                "nlist": len(self._centroids) if self._centroids is not None else self.nlist,
+                "nprobe": self.nprobe,
+                "dim": self.dim,
+                # Resident: codes, scales (including list slack) and centroids
+                "bytes": int(stored),
+                "bytes_per_vector": round(stored / vectors, 1) if vectors else None,
+                "float32_bytes_per_vector": self.dim * 4,
+                # Memory-mapped float16 sources, paged in only by re-clustering and get()
+                "source_file_bytes": self._sources.file_bytes,
+                "last_trained": self.last_trained,
+                "last_train_seconds": self.last_train_seconds,
+                "last_recall": self.last_recall,
+            }
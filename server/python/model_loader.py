@@ -0,0 +1,151 @@
+import os
+import threading
+import time
+
+PROCESS_STARTED = time.time()
+
+# torch: sentence-transformers; onnx / onnx-int8: onnxruntime on a model
+# exported by export_onnx.py into the local model directory
+BACKENDS = ("torch", "onnx", "onnx-int8")
+
+
+class ModelNotReady(Exception):
+    """Raised when the model is requested before it has finished loading."""
+
+
+def memory_usage() -> dict:
+    """Resident (and, where available, proportional) set size of this process in MB."""
+    usage = {}
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    usage["rss_mb"] = round(int(line.split()[1]) / 1024, 1)
+        # PSS splits pages shared copy-on-write between forked workers
+        with open("/proc/self/smaps_rollup", "r") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    usage["pss_mb"] = round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        import resource
+        usage["max_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return usage
+
+
+def set_torch_threads(threads: int) -> bool:
+    """Size torch's intra-op thread pool for this process (False without torch)."""
+    try:
+        import torch
+    except ImportError:
+        return False
+    torch.set_num_threads(threads)
+    return True
+
+
+class ModelLoader:
+    """
+    Loads the SentenceTransformer off the request path.
+
+    `start()` loads in a background thread so the web server can bind and
+    answer health checks immediately; `load()` loads synchronously (used for
+    preload-then-fork, where the parent loads once and workers share the
+    weights copy-on-write). The model is read from `local_dir` when that
+    directory exists, so a pre-warmed image never touches the network.
+    `threads` caps the intra-op threads (torch or onnxruntime) so several
+    workers on one host do not oversubscribe the cores. `backend` picks the
+    inference runtime (see BACKENDS); the ONNX ones only load from
+    `local_dir`, never from the network.
+    """
+
+    def __init__(self, model_name: str, local_dir: str = None, expected_dim: int = None,
+                 threads: int = None, backend: str = "torch"):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}', expected one of {', '.join(BACKENDS)}")
+        self.model_name = model_name
+        self.local_dir = local_dir
+        self.expected_dim = expected_dim
+        self.threads = threads
+        self.backend = backend
+        self.model = None
+        self.state = "idle"
+        self.error = None
+        self.source = None
+        self.load_seconds = None
+        self.ready_at = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def start(self):
+        with self._lock:
+            if self.state != "idle":
+                return
+            self.state = "loading"
+        threading.Thread(target=self.load, name="model-loader", daemon=True).start()
+
+    def load(self):
+        self.state = "loading"
+        started = time.perf_counter()
+        try:
+            model = self._load_torch() if self.backend == "torch" else self._load_onnx()
+
+            dim = model.get_sentence_embedding_dimension()
+            if self.expected_dim and dim != self.expected_dim:
+                raise RuntimeError(f"Model produces {dim}-d vectors, expected {self.expected_dim}")
+
+            # Warm-up encode so the first real request does not pay lazy init costs
+            model.encode(["warm up"])
+
+            self.model = model
+            self.load_seconds = round(time.perf_counter() - started, 2)
+            self.ready_at = time.time()
+            self.state = "ready"
+            self._ready.set()
+            print(f"Model loaded successfully in {self.load_seconds}s!")
+        except Exception as e:
+            self.state = "error"
+            self.error = str(e)
+            print(f"Model failed to load: {e}")
+
+    def _load_torch(self):
+        from sentence_transformers import SentenceTransformer
+
+        if self.threads:
+            set_torch_threads(self.threads)
+
+        self.source = self.local_dir if self.local_dir and os.path.isdir(self.local_dir) else self.model_name
+        print(f"Loading {self.model_name} model from {self.source}...")
+        return SentenceTransformer(self.source)
+
+    def _load_onnx(self):
+        from onnx_backend import OnnxEmbedder
+
+        if not (self.local_dir and os.path.isdir(self.local_dir)):
+            raise RuntimeError(f"The {self.backend} backend needs EMBED_MODEL_DIR with an export from export_onnx.py")
+        model = OnnxEmbedder(self.local_dir, quantized=self.backend == "onnx-int8", threads=self.threads)
+        self.source = model.path
+        print(f"Loading {self.model_name} model from {self.source}...")
+        return model
+
+    def get(self, timeout: float = 0):
+        """Return the model, optionally waiting up to `timeout` seconds for it."""
+        if not self._ready.wait(timeout):
+            raise ModelNotReady(self.error or f"Model is {self.state}")
+        return self.model
+
+    def stats(self) -> dict:
+        return {
+            "name": self.model_name,
+            "state": self.state,
+            "source": self.source,
+            "error": self.error,
+            "load_seconds": self.load_seconds,
+            "backend": self.backend,
+            "threads": self.threads,
+            "startup_seconds": round(self.ready_at - PROCESS_STARTED, 2) if self.ready_at else None,
+            "pid": os.getpid(),
+            **memory_usage(),
+        }
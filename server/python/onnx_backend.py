@@ -0,0 +1,113 @@
+"""
+ONNX Runtime inference for the sentence embedding model.
+
+export_onnx.py writes the model's transformer to <model dir>/onnx/model.onnx
+(and, quantized to int8 weights, model_int8.onnx) next to the files
+SentenceTransformer.save() produces. OnnxEmbedder runs that graph with
+onnxruntime, tokenizes with the saved tokenizer.json and applies the
+model's pooling and normalization itself, so it is a drop-in replacement
+for SentenceTransformer.encode() that needs neither torch nor the network.
+"""
+import json
+import os
+from typing import List, Sequence, Union
+
+import numpy as np
+
+ONNX_FILES = {False: "model.onnx", True: "model_int8.onnx"}
+
+
+def onnx_path(model_dir: str, quantized: bool = False) -> str:
+    return os.path.join(model_dir, "onnx", ONNX_FILES[quantized])
+
+
+def _read_json(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def cosine_agreement(reference: np.ndarray, candidate: np.ndarray) -> dict:
+    """Row-wise cosine similarity between two embedding matrices of the same texts."""
+    reference = np.asarray(reference, dtype=np.float64)
+    candidate = np.asarray(candidate, dtype=np.float64)
+    norms = np.linalg.norm(reference, axis=1) * np.linalg.norm(candidate, axis=1)
+    cosines = (reference * candidate).sum(axis=1) / np.maximum(norms, 1e-12)
+    return {"min": round(float(cosines.min()), 6), "mean": round(float(cosines.mean()), 6)}
+
+
+class OnnxEmbedder:
+    """
+    SentenceTransformer-compatible encoder on an exported ONNX transformer.
+
+        model = OnnxEmbedder("models/all-MiniLM-L6-v2", quantized=True, threads=2)
+        vectors = model.encode(["text", ...], batch_size=64)
+    """
+
+    def __init__(self, model_dir: str, quantized: bool = False, threads: int = None):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        path = onnx_path(model_dir, quantized)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"{path} not found; create it with export_onnx.py")
+        self.path = path
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+            options.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+        st_config = _read_json(os.path.join(model_dir, "sentence_bert_config.json"))
+        self.max_seq_length = st_config.get("max_seq_length", 256)
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(self.max_seq_length)
+        pad_id = self.tokenizer.token_to_id("[PAD]") or 0
+        self.tokenizer.enable_padding(pad_id=pad_id, pad_token=self.tokenizer.id_to_token(pad_id) or "[PAD]")
+
+        modules = _read_json(os.path.join(model_dir, "modules.json")) or []
+        pooling_dir = next((m["path"] for m in modules if m.get("type", "").endswith("Pooling")), "1_Pooling")
+        pooling = _read_json(os.path.join(model_dir, pooling_dir, "config.json"))
+        self.pooling = "cls" if pooling.get("pooling_mode_cls_token") else "mean"
+        self.normalize = any(m.get("type", "").endswith("Normalize") for m in modules)
+        self.dim = (pooling.get("word_embedding_dimension")
+                    or _read_json(os.path.join(model_dir, "config.json")).get("hidden_size"))
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dim
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        feeds = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": np.array([e.attention_mask for e in encodings], dtype=np.int64),
+            "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64),
+        }
+        hidden = self.session.run(None, {k: v for k, v in feeds.items() if k in self.input_names})[0]
+
+        if self.pooling == "cls":
+            pooled = hidden[:, 0]
+        else:
+            mask = feeds["attention_mask"][:, :, None].astype(hidden.dtype)
+            pooled = (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+        if self.normalize:
+            pooled = pooled / np.maximum(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12)
+        return pooled.astype(np.float32)
+
+    def encode(self, texts: Union[str, Sequence[str]], batch_size: int = 32, **kwargs) -> np.ndarray:
+        """Embed texts in batches of similar length (less padding), returned in input order."""
+        single = isinstance(texts, str)
+        texts = [texts] if single else list(texts)
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+
+        order = np.argsort([-len(t) for t in texts], kind="stable")
+        out = np.empty((len(texts), self.dim), dtype=np.float32)
+        for start in range(0, len(texts), batch_size):
+            rows = order[start:start + batch_size]
+            out[rows] = self._encode_batch([texts[i] for i in rows])
+        return out[0] if single else out
@@ -0,0 +1,24 @@
+"""
+Download the embedding model into a local directory at build time.
+
+    python prefetch_model.py ./models/all-MiniLM-L6-v2
+
+Point EMBED_MODEL_DIR at the same directory so the service loads it from
+disk at startup without touching the network.
+"""
+import sys
+
+from sentence_transformers import SentenceTransformer
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+
+
+def main():
+    target = sys.argv[1] if len(sys.argv) > 1 else f"models/{MODEL_NAME}"
+    print(f"Downloading {MODEL_NAME} to {target}...")
+    SentenceTransformer(MODEL_NAME).save(target)
+    print("Done.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import threading
+
+import pytest
+
+from batcher import MicroBatcher, QueueFull
+
+
+def test_concurrent_submits_share_a_batch():
+    batches = []
+
+    def encode(texts):
+        batches.append(list(texts))
+        return [len(t) for t in texts]
+
+    batcher = MicroBatcher(encode, window_ms=50, max_batch_size=8)
+    futures = batcher.submit_many(["a", "bb", "ccc"])
+    assert [f.result(timeout=5) for f in futures] == [1, 2, 3]
+    assert batches == [["a", "bb", "ccc"]]
+    assert batcher.stats()["items"] == 3
+
+
+def test_full_queue_sheds_whole_requests():
+    gate = threading.Event()
+    started = threading.Event()
+
+    def encode(texts):
+        started.set()
+        gate.wait(5)
+        return texts
+
+    batcher = MicroBatcher(encode, window_ms=0, max_batch_size=1, max_queue=3)
+    first = batcher.submit("busy")
+    started.wait(5)  # the worker holds "busy", the queue is empty
+
+    queued = batcher.submit_many(["a", "b"])
+    with pytest.raises(QueueFull):
+        batcher.submit_many(["c", "d"])  # all or nothing: 2 + 2 > 3
+    assert batcher.depth == 2
+    assert batcher.stats()["rejected"] == 1
+    assert batcher.stats()["in_flight"] == 1
+
+    gate.set()
+    assert first.result(timeout=5) == "busy"
+    assert [f.result(timeout=5) for f in queued] == ["a", "b"]
+
+
+def test_cancelled_texts_are_not_encoded():
+    gate = threading.Event()
+    started = threading.Event()
+    encoded = []
+
+    def encode(texts):
+        started.set()
+        gate.wait(5)
+        encoded.extend(texts)
+        return texts
+
+    batcher = MicroBatcher(encode, window_ms=0, max_batch_size=4)
+    first = batcher.submit("busy")
+    started.wait(5)
+    abandoned = batcher.submit_many(["x", "y"])
+    for future in abandoned:
+        assert future.cancel()
+    kept = batcher.submit("z")
+
+    gate.set()
+    assert kept.result(timeout=5) == "z"
+    assert first.result(timeout=5) == "busy"
+    assert encoded == ["busy", "z"]
+
+
+def test_encode_errors_reach_every_caller():
+    def encode(texts):
+        raise RuntimeError("boom")
+
+    batcher = MicroBatcher(encode, window_ms=10)
+    futures = batcher.submit_many(["a", "b"])
+    for future in futures:
+        with pytest.raises(RuntimeError):
+            future.result(timeout=5)
+
+
+def test_short_encode_output_fails_every_caller():
+    batcher = MicroBatcher(lambda texts: texts[:-1], window_ms=10)
+    futures = batcher.submit_many(["a", "b", "c"])
+    for future in futures:
+        with pytest.raises(RuntimeError):
+            future.result(timeout=5)
@@ -0,0 +1,86 @@
+import multiprocessing
+
+import numpy as np
+
+from embedding_cache import DiskTier, EmbeddingCache, claim_worker_dir
+
+
+def vector(seed, dim=8):
+    return np.random.default_rng(seed).random(dim, dtype=np.float32)
+
+
+def test_disk_tier_replays_keys_after_restart(tmp_path):
+    tier = DiskTier(str(tmp_path), "model", dim=8, capacity=4)
+    for i in range(3):
+        tier.put(f"k{i}", vector(i))
+    tier.close()
+
+    tier = DiskTier(str(tmp_path), "model", dim=8, capacity=4)
+    assert len(tier) == 3
+    for i in range(3):
+        np.testing.assert_array_equal(tier.get(f"k{i}"), vector(i))
+
+
+def test_disk_tier_overwrites_oldest_slot_and_replays_wraparound(tmp_path):
+    tier = DiskTier(str(tmp_path), "model", dim=8, capacity=3)
+    for i in range(5):
+        tier.put(f"k{i}", vector(i))
+    assert tier.get("k0") is None and tier.get("k1") is None
+    tier.close()
+
+    tier = DiskTier(str(tmp_path), "model", dim=8, capacity=3)
+    assert sorted(tier.index) == ["k2", "k3", "k4"]
+    np.testing.assert_array_equal(tier.get("k4"), vector(4))
+    # The next write reuses k2's slot, the oldest one
+    tier.put("k5", vector(5))
+    assert tier.get("k2") is None
+    np.testing.assert_array_equal(tier.get("k3"), vector(3))
+
+
+def test_disk_tier_resets_when_model_changes(tmp_path):
+    tier = DiskTier(str(tmp_path), "model-a", dim=8, capacity=4)
+    tier.put("k", vector(1))
+    tier.close()
+    assert len(DiskTier(str(tmp_path), "model-b", dim=8, capacity=4)) == 0
+
+
+def test_cache_promotes_disk_hits_and_survives_restart(tmp_path):
+    cache = EmbeddingCache("model", capacity=1, disk_dir=str(tmp_path), dim=8)
+    cache.put("hello  world", vector(1))
+    cache.put("other", vector(2))
+    np.testing.assert_array_equal(cache.get("hello world"), vector(1))
+    assert cache.stats()["disk_hits"] == 1
+    cache.disk.close()
+
+    restarted = EmbeddingCache("model", capacity=1, disk_dir=str(tmp_path), dim=8)
+    np.testing.assert_array_equal(restarted.get("other"), vector(2))
+
+
+def test_worker_dirs_are_exclusive_and_reusable(tmp_path):
+    first, lock = claim_worker_dir(str(tmp_path))
+    second, lock2 = claim_worker_dir(str(tmp_path))
+    assert first != second
+    lock.close()
+    again, lock3 = claim_worker_dir(str(tmp_path))
+    assert again == first
+    lock2.close()
+    lock3.close()
+
+
+def _claim_in_child(base, queue):
+    cache = EmbeddingCache("model", disk_dir=base, dim=8)
+    queue.put(cache.disk.directory)
+
+
+def test_forked_processes_never_share_a_disk_tier(tmp_path):
+    parent = EmbeddingCache("model", disk_dir=str(tmp_path), dim=8)
+    parent_dir = parent.disk.directory
+    ctx = multiprocessing.get_context("fork")
+    queue = ctx.Queue()
+    children = [ctx.Process(target=_claim_in_child, args=(str(tmp_path), queue)) for _ in range(2)]
+    for child in children:
+        child.start()
+    dirs = {queue.get(timeout=10) for _ in children}
+    for child in children:
+        child.join()
+    assert parent_dir not in dirs
@@ -0,0 +1,133 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from event_recommender import EventRecommender, blocked_scores, event_text
+
+TODAY = date.today()
+AXES = {"ai": 0, "climate": 1, "games": 2, "web": 3}
+
+
+def days(n):
+    return (TODAY + timedelta(days=n)).isoformat()
+
+
+def event(event_id, topic, start=10, end=None, online=False):
+    return {"id": event_id, "title": f"{topic} hack", "themes": [topic], "description": "",
+            "start_date": days(start), "end_date": days(start + 2 if end is None else end), "is_online": online}
+
+
+class FakeEmbedder:
+    """One-hot vector on the axis named by the text's first word; records what it embeds."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        vectors = np.zeros((len(texts), 4), dtype=np.float32)
+        for row, text in enumerate(texts):
+            vectors[row, AXES[text.split()[0]]] = 1
+        return list(vectors)
+
+
+def user(*weights):
+    return np.array(weights, dtype=np.float32)
+
+
+@pytest.fixture
+def recommender():
+    recommender = EventRecommender(dim=4, block_size=2, initial_capacity=2)
+    recommender.sync([event("a", "ai"), event("c", "climate", online=True), event("g", "games"),
+                      event("old", "ai", start=-10, end=-8)], FakeEmbedder())
+    return recommender
+
+
+def test_blocked_scores_match_one_product():
+    rng = np.random.default_rng(0)
+    users, events = rng.normal(size=(5, 8)), rng.normal(size=(7, 8))
+    out = np.empty((5, 7))
+    blocked_scores(users, events, out, block=3)
+    assert np.allclose(out, users @ events.T)
+
+
+def test_event_text_uses_title_themes_and_description():
+    assert event_text({"title": "Hack", "themes": ["AI", "Web"], "description": " Build things "}) == \
+        "Hack. AI, Web. Build things"
+
+
+def test_ranks_upcoming_events_and_filters(recommender):
+    result = recommender.recommend("u1", user(1, 0.5, 0.1, 0), k=10)
+    assert [r["id"] for r in result["results"]] == ["a", "c", "g"]  # "old" has ended
+    assert result["results"][0]["title"] == "ai hack"
+
+    assert [r["id"] for r in recommender.recommend("u1", user(1, 0.5, 0.1, 0), online=True)["results"]] == ["c"]
+    in_window = recommender.recommend("u1", user(1, 0.5, 0.1, 0), start_after=days(5), start_before=days(10))
+    assert {r["id"] for r in in_window["results"]} == {"a", "c", "g"}
+    assert recommender.recommend("u1", user(1, 0, 0, 0), start_after=days(11))["results"] == []
+    assert [r["id"] for r in recommender.recommend("u1", user(1, 0, 0, 0), k=1, include_past=True,
+                                                   exclude=["a"])["results"]] == ["old"]
+
+
+def test_results_are_cached_until_profile_or_events_change(recommender):
+    vector = user(0, 1, 0, 0)
+    assert recommender.recommend("u1", vector)["cached"] is False
+    assert recommender.recommend("u1", vector)["cached"] is True
+
+    changed = recommender.recommend("u1", user(0, 0, 1, 0))
+    assert changed["cached"] is False
+    assert changed["results"][0]["id"] == "g"
+
+    recommender.sync([event("a", "ai"), event("c", "climate", online=True), event("g", "games"),
+                      event("w", "web")], FakeEmbedder())
+    assert recommender.recommend("u1", user(0, 0, 1, 0))["cached"] is False
+
+
+def test_sync_scores_only_new_events_against_active_users(recommender):
+    recommender.recommend("u1", user(1, 0, 0, 0))
+    recommender.recommend("u2", user(0, 0, 0, 1))
+    rows_before = recommender.stats()["user_rows"]
+
+    embedder = FakeEmbedder()
+    changes = recommender.sync([event("a", "ai"), event("c", "climate", online=True), event("g", "games"),
+                                event("w", "web"), event("w2", "web", start=3)], embedder)
+    assert changes == {"added": 2, "changed": 0, "removed": 1, "embedded": 2, "scored_pairs": 4}
+    assert embedder.calls == [["web hack. web", "web hack. web"]]
+
+    top = recommender.recommend("u2", user(0, 0, 0, 1), k=2)
+    assert {r["id"] for r in top["results"]} == {"w", "w2"}
+    assert recommender.recommend("u1", user(1, 0, 0, 0), k=1)["results"][0]["id"] == "a"
+    # Both users were served from their incrementally updated rows
+    assert recommender.stats()["user_rows"] == rows_before
+
+
+def test_unchanged_sync_embeds_nothing(recommender):
+    embedder = FakeEmbedder()
+    version = recommender.version
+    changes = recommender.sync([event("a", "ai"), event("c", "climate", online=True), event("g", "games"),
+                                event("old", "ai", start=-10, end=-8)], embedder)
+    assert changes["embedded"] == 0 and embedder.calls == []
+    assert recommender.version == version
+
+
+def test_idle_and_least_recent_users_are_dropped():
+    recommender = EventRecommender(dim=4, max_users=2, active_seconds=0)
+    recommender.sync([event("a", "ai")], FakeEmbedder())
+    for user_id in ("u1", "u2", "u3"):
+        recommender.recommend(user_id, user(1, 0, 0, 0))
+    assert recommender.stats()["users"] == 2
+
+    # active_seconds=0: nobody is active at the next sync, so nothing is scored
+    changes = recommender.sync([event("a", "ai"), event("w", "web")], FakeEmbedder())
+    assert changes["scored_pairs"] == 0
+    assert recommender.stats()["users"] == 0
+
+
+def test_anonymous_and_invalid_queries(recommender):
+    assert recommender.recommend(None, user(0, 1, 0, 0), k=1)["results"][0]["id"] == "c"
+    assert recommender.stats()["users"] == 0
+    with pytest.raises(ValueError):
+        recommender.recommend("u1", np.ones(3))
+    with pytest.raises(ValueError):
+        recommender.recommend("u1", user(1, 0, 0, 0), start_after="next week")
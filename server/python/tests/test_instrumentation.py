@@ -0,0 +1,91 @@
+import threading
+import time
+
+from flask import Flask
+
+from instrumentation import Registry, SamplingProfiler, collapsed, instrument_flask
+
+
+def test_render_counters_gauges_and_histograms():
+    registry = Registry()
+    requests = registry.counter("requests_total", "Requests", ("status",))
+    requests.inc(status=200)
+    requests.inc(2, status=200)
+    requests.inc(status='5"03')
+    registry.gauge("queue_depth", "Depth", fn=lambda: 7)
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1))
+    for value in (0.05, 0.5, 0.5, 3):
+        latency.observe(value)
+
+    text = registry.render()
+    assert 'requests_total{status="200"} 3' in text
+    assert 'requests_total{status="5\\"03"} 1' in text
+    assert "# TYPE queue_depth gauge\nqueue_depth 7" in text
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="1"} 3' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 4' in text
+    assert "latency_seconds_count 4" in text
+    assert "latency_seconds_sum 4.05" in text
+
+
+def test_registry_returns_existing_metrics():
+    registry = Registry()
+    assert registry.counter("a", "A") is registry.counter("a", "A")
+
+
+def test_labels_must_match():
+    counter = Registry().counter("c", "C", ("stage",))
+    try:
+        counter.inc(other="x")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("wrong labels accepted")
+
+
+def test_histogram_timer():
+    histogram = Registry().histogram("stage_seconds", "Stages", ("stage",))
+    with histogram.time(stage="parse"):
+        time.sleep(0.01)
+    assert histogram.count(stage="parse") == 1
+
+
+def test_profiler_samples_busy_threads():
+    stop = threading.Event()
+
+    def spin_here():
+        while not stop.is_set():
+            sum(range(1000))
+
+    thread = threading.Thread(target=spin_here, name="busy")
+    thread.start()
+    try:
+        stacks = SamplingProfiler().profile(0.2, interval=0.002)
+    finally:
+        stop.set()
+        thread.join()
+
+    busy = {stack: count for stack, count in stacks.items() if stack.startswith("busy;")}
+    assert any("test_instrumentation.py:spin_here" in stack for stack in busy)
+    first = collapsed(stacks).splitlines()[0]
+    assert first.rsplit(" ", 1)[1] == str(max(stacks.values()))
+
+
+def test_instrument_flask_exposes_metrics():
+    app = Flask(__name__)
+    registry = Registry()
+    instrument_flask(app, registry, profiling=True)
+
+    @app.route("/items/<int:item_id>")
+    def item(item_id):
+        return {"id": item_id}
+
+    client = app.test_client()
+    client.get("/items/1")
+    client.get("/items/2")
+    body = client.get("/metrics").get_data(as_text=True)
+    assert 'http_request_duration_seconds_count{method="GET",route="/items/<int:item_id>",status="200"} 2' in body
+
+    profile = client.get("/debug/profile?seconds=0.05&interval_ms=5")
+    assert profile.status_code == 200
+    assert client.get("/debug/profile?seconds=abc").status_code == 400
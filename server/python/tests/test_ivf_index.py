@@ -0,0 +1,108 @@
+import numpy as np
+
+from ivf_index import IVFIndex
+from vector_index import VectorIndex, l2_normalize
+
+
+def clustered_vectors(n, dim=16, clusters=8, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    points = centers[rng.integers(clusters, size=n)] + 0.3 * rng.normal(size=(n, dim))
+    return l2_normalize(points.astype(np.float32))
+
+
+def build(n=400, train_size=200, **kwargs):
+    vectors = clustered_vectors(n)
+    index = IVFIndex(dim=16, nlist=8, nprobe=8, train_size=train_size, recluster_interval=3600, **kwargs)
+    index.upsert((f"u{i}", v) for i, v in enumerate(vectors))
+    return index, vectors
+
+
+def test_trains_once_train_size_is_reached():
+    index = IVFIndex(dim=16, nlist=4, train_size=100, recluster_interval=3600)
+    vectors = clustered_vectors(150)
+    index.upsert((f"u{i}", v) for i, v in enumerate(vectors[:99]))
+    assert not index.trained
+    index.upsert((f"u{i}", v) for i, v in enumerate(vectors[99:], start=99))
+    assert index.trained and len(index) == 150
+
+
+def test_probing_every_cell_matches_the_exact_ranking():
+    index, vectors = build()
+    exact = VectorIndex(16)
+    exact.upsert((f"u{i}", v) for i, v in enumerate(vectors))
+    query = vectors[7]
+    truth, _ = exact.search(query, k=10)
+    found, _ = index.search(query, k=10)
+    assert len(set(truth) & set(found)) >= 9
+
+
+def test_selective_allow_list_scores_only_allowed_ids():
+    index, vectors = build()
+    allowed = [f"u{i}" for i in range(0, 400, 37)]
+    ids, scores = index.search(vectors[0], k=5, allow_ids=allowed + ["unknown"], exclude_ids=["u0"])
+    assert set(ids) <= set(allowed) - {"u0"}
+    assert len(ids) == 5 and scores == sorted(scores, reverse=True)
+
+    exact = VectorIndex(16)
+    exact.upsert((i, vectors[int(i[1:])]) for i in allowed if i != "u0")
+    assert ids[0] == exact.search(vectors[0], k=1)[0][0]
+
+
+def test_dense_allow_list_is_applied_after_probing():
+    index, vectors = build()
+    everyone_but_me = [f"u{i}" for i in range(1, 400)]
+    ids, _ = index.search(vectors[0], k=10, allow_ids=everyone_but_me)
+    unfiltered, _ = index.search(vectors[0], k=11)
+    assert "u0" not in ids
+    assert ids == [i for i in unfiltered if i != "u0"][:10]
+
+
+def test_mutations_during_training_are_replayed():
+    index, vectors = build()
+    fresh = clustered_vectors(3, seed=1)
+    build_fn = index._build
+
+    def build_while_mutating(ids, snapshot):
+        result = build_fn(ids, snapshot)
+        index.upsert([("new", fresh[0]), ("u1", fresh[1])])
+        index.delete(["u2"])
+        return result
+
+    index._build = build_while_mutating
+    index.train()
+    index._build = build_fn
+
+    assert len(index) == 400
+    assert "u2" not in index and "new" in index
+    np.testing.assert_allclose(index.get("u1"), fresh[1], atol=1e-2)
+    assert index.search(fresh[0], k=1)[0] == ["new"]
+    # Every location points at the entry that holds the id
+    for item_id, (cell, pos) in index._locations.items():
+        assert index._lists[cell].ids[pos] == item_id
+
+
+def test_reclustering_does_not_accumulate_quantization_error():
+    index, vectors = build()
+    for _ in range(5):
+        index.train()
+    stored = np.stack([index.get(f"u{i}") for i in range(400)])
+    assert np.abs(stored - vectors).max() < 2e-3
+
+
+def test_stats_report_resident_bytes_without_the_source_copies():
+    index, _ = build(n=4096, train_size=4096)
+    stats = index.stats()
+    # int8 codes + float32 scale, plus list slack and centroids: well under float32's 4 * dim
+    assert 16 + 4 <= stats["bytes_per_vector"] < 0.5 * stats["float32_bytes_per_vector"]
+    assert stats["source_file_bytes"] >= 4096 * 16 * 2
+
+
+def test_deleted_source_rows_are_reused():
+    index, vectors = build()
+    file_bytes = index.stats()["source_file_bytes"]
+    index.delete([f"u{i}" for i in range(100)])
+    index.upsert((f"n{i}", v) for i, v in enumerate(vectors[:100]))
+    assert index.stats()["source_file_bytes"] == file_bytes
+    assert np.abs(index.get("n5") - vectors[5]).max() < 2e-3
+    assert index.get("u5") is None
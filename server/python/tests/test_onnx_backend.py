@@ -0,0 +1,82 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from model_loader import ModelLoader
+from onnx_backend import OnnxEmbedder, cosine_agreement, onnx_path
+
+
+class FakeTokenizer:
+    """Whitespace tokenizer padding to the longest text of the batch."""
+
+    def encode_batch(self, texts):
+        lengths = [len(t.split()) for t in texts]
+        width = max(lengths)
+        return [SimpleNamespace(ids=[1] * n + [0] * (width - n),
+                                attention_mask=[1] * n + [0] * (width - n),
+                                type_ids=[0] * width) for n in lengths]
+
+
+class FakeSession:
+    """Token vectors are [position + 1, 1]; padded positions are huge so leaking them shows."""
+
+    def __init__(self):
+        self.batches = []
+
+    def run(self, outputs, feeds):
+        mask = feeds["attention_mask"]
+        self.batches.append(mask.shape)
+        positions = np.arange(mask.shape[1], dtype=np.float32)[None, :].repeat(mask.shape[0], axis=0)
+        hidden = np.stack([positions + 1, np.ones_like(positions)], axis=-1)
+        hidden[mask == 0] = 1000.0
+        return [hidden]
+
+
+def make_embedder(pooling="mean", normalize=False):
+    model = OnnxEmbedder.__new__(OnnxEmbedder)
+    model.tokenizer = FakeTokenizer()
+    model.session = FakeSession()
+    model.input_names = {"input_ids", "attention_mask"}
+    model.pooling = pooling
+    model.normalize = normalize
+    model.dim = 2
+    return model
+
+
+def test_mean_pooling_ignores_padding_and_keeps_input_order():
+    model = make_embedder()
+    vectors = model.encode(["a", "a b c", "a b"], batch_size=2)
+    # mean of positions 1..n is (n + 1) / 2
+    assert vectors.tolist() == [[1.0, 1.0], [2.0, 1.0], [1.5, 1.0]]
+    assert vectors.dtype == np.float32
+    # longest texts are batched together: (3 tokens, 2 tokens) then (1 token)
+    assert model.session.batches == [(2, 3), (1, 1)]
+
+
+def test_cls_pooling_normalized_single_text():
+    model = make_embedder(pooling="cls", normalize=True)
+    vector = model.encode("a b c")
+    assert vector.shape == (2,)
+    assert np.allclose(vector, [2 ** -0.5, 2 ** -0.5])
+
+
+def test_encode_empty():
+    assert make_embedder().encode([]).shape == (0, 2)
+
+
+def test_cosine_agreement():
+    reference = np.array([[1.0, 0.0], [0.0, 2.0]])
+    assert cosine_agreement(reference, reference * 3) == {"min": 1.0, "mean": 1.0}
+    assert cosine_agreement(reference, np.array([[1.0, 1.0], [0.0, 1.0]]))["min"] == pytest.approx(2 ** -0.5, abs=1e-6)
+
+
+def test_onnx_backends_need_a_local_export(tmp_path):
+    with pytest.raises(ValueError):
+        ModelLoader("m", backend="tensorrt")
+
+    loader = ModelLoader("m", local_dir=str(tmp_path / "missing"), backend="onnx")
+    loader.load()
+    assert loader.state == "error"
+
+    assert onnx_path(str(tmp_path), quantized=True).endswith("model_int8.onnx")
@@ -0,0 +1,167 @@
+import threading
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+def l2_normalize(vectors: np.ndarray) -> np.ndarray:
+    """Return float32 rows scaled to unit length (zero rows stay zero)."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest scores, best first, via argpartition."""
+    if k >= len(scores):
+        return np.argsort(-scores)
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates])]
+
+
+def cosine_matrix(a: np.ndarray, b: np.ndarray, normalized: bool = False) -> np.ndarray:
+    """All-pairs cosine similarity between the rows of a and b in one product."""
+    if not normalized:
+        a, b = l2_normalize(a), l2_normalize(b)
+    return np.asarray(a, dtype=np.float32) @ np.asarray(b, dtype=np.float32).T
+
+
+def top_k_rows(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-row top-k column indices and scores, best first."""
+    k = min(k, scores.shape[1])
+    if k < scores.shape[1]:
+        candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        candidates = np.tile(np.arange(scores.shape[1]), (scores.shape[0], 1))
+    picked = np.take_along_axis(scores, candidates, axis=1)
+    order = np.argsort(-picked, axis=1)
+    return np.take_along_axis(candidates, order, axis=1), np.take_along_axis(picked, order, axis=1)
+
+
+class VectorIndex:
+    """
+    Exact cosine-similarity index over a dense float32 matrix.
+
+    Rows are L2-normalized on insert so a search is a single matrix-vector
+    product followed by argpartition. Storage grows by doubling; deletes
+    move the last row into the freed slot to keep the matrix dense.
+    """
+
+    def __init__(self, dim: int = 384, initial_capacity: int = 1024):
+        self.dim = dim
+        self._matrix = np.zeros((initial_capacity, dim), dtype=np.float32)
+        self._ids = []
+        self._rows = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, item_id):
+        return item_id in self._rows
+
+    def _grow(self, needed: int):
+        capacity = len(self._matrix)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        grown = np.zeros((capacity, self.dim), dtype=np.float32)
+        grown[:len(self._ids)] = self._matrix[:len(self._ids)]
+        self._matrix = grown
+
+    def upsert(self, items: Iterable[Tuple[str, np.ndarray]]) -> int:
+        """Insert or replace vectors by id. Returns the number of rows written."""
+        items = list(items)
+        if not items:
+            return 0
+        ids = [item_id for item_id, _ in items]
+        vectors = l2_normalize(np.stack([np.asarray(v, dtype=np.float32) for _, v in items]))
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected {self.dim}-dimensional vectors, got {vectors.shape[1]}")
+
+        with self._lock:
+            self._grow(len(self._ids) + len(ids))
+            for item_id, vector in zip(ids, vectors):
+                row = self._rows.get(item_id)
+                if row is None:
+                    row = len(self._ids)
+                    self._ids.append(item_id)
+                    self._rows[item_id] = row
+                self._matrix[row] = vector
+        return len(ids)
+
+    def delete(self, ids: Iterable[str]) -> int:
+        """Remove vectors by id. Unknown ids are ignored."""
+        removed = 0
+        with self._lock:
+            for item_id in ids:
+                row = self._rows.pop(item_id, None)
+                if row is None:
+                    continue
+                last = len(self._ids) - 1
+                if row != last:
+                    moved = self._ids[last]
+                    self._matrix[row] = self._matrix[last]
+                    self._ids[row] = moved
+                    self._rows[moved] = row
+                self._ids.pop()
+                removed += 1
+        return removed
+
+    def get(self, item_id: str) -> Optional[np.ndarray]:
+        with self._lock:
+            row = self._rows.get(item_id)
+            return None if row is None else self._matrix[row].copy()
+
+    def search(self, query: np.ndarray, k: int = 10, allow_ids: Optional[Iterable[str]] = None,
+               exclude_ids: Optional[Iterable[str]] = None) -> Tuple[List[str], List[float]]:
+        """
+        Return the ids and cosine scores of the k nearest vectors.
+
+        Args:
+            query: Query vector (normalized here)
+            k: Number of results
+            allow_ids: Optional allow-list; only these ids are scored
+            exclude_ids: Optional ids to leave out of the results
+        """
+        query = l2_normalize(query)
+        exclude = set(exclude_ids or ())
+
+        with self._lock:
+            if allow_ids is not None:
+                rows = np.fromiter(
+                    (self._rows[i] for i in set(allow_ids) if i in self._rows and i not in exclude),
+                    dtype=np.int64,
+                )
+                scores = self._matrix[rows] @ query
+            else:
+                rows = None
+                scores = self._matrix[:len(self._ids)] @ query
+                if exclude:
+                    for item_id in exclude:
+                        row = self._rows.get(item_id)
+                        if row is not None:
+                            scores[row] = -np.inf
+
+            if k <= 0 or len(scores) == 0:
+                return [], []
+            best = top_k(scores, k)
+            best = best[np.isfinite(scores[best])]
+            positions = rows[best] if rows is not None else best
+            return [self._ids[p] for p in positions], scores[best].tolist()
+
+    def missing(self, ids: Iterable[str]) -> List[str]:
+        """Ids from the given list that have no vector in the index."""
+        with self._lock:
+            return [i for i in ids if i not in self._rows]
+
+    def stats(self) -> dict:
+        return {
+            "mode": "exact",
+            "vectors": len(self._ids),
+            "capacity": len(self._matrix),
+            "dim": self.dim,
+            "bytes": int(self._matrix.nbytes),
+        }
@@ -0,0 +1,77 @@
+"""
+Compact wire formats for embedding matrices.
+
+Besides JSON float lists the service speaks two denser encodings:
+
+* raw bytes (`application/octet-stream`) with the dtype and shape carried in
+  the `X-Embedding-Dtype` / `X-Embedding-Shape` headers;
+* base64-in-JSON objects: {"dtype": ..., "shape": [n, dim], "data": "..."}.
+
+Supported dtypes are little-endian float32, float16 and int8. int8 payloads
+are symmetric per-row quantized: the n*dim int8 codes are followed by n
+little-endian float32 scales, and value = code * scale.
+"""
+import base64
+
+import numpy as np
+
+OCTET_STREAM = "application/octet-stream"
+DTYPE_HEADER = "X-Embedding-Dtype"
+SHAPE_HEADER = "X-Embedding-Shape"
+DTYPES = ("float32", "float16", "int8")
+
+
+def encode(matrix: np.ndarray, dtype: str = "float32") -> bytes:
+    """Serialize a 2-D array in the given wire dtype."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if dtype == "float32":
+        return matrix.astype("<f4").tobytes()
+    if dtype == "float16":
+        return matrix.astype("<f2").tobytes()
+    if dtype == "int8":
+        scales = np.abs(matrix).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        codes = np.clip(np.rint(matrix / scales[:, None]), -127, 127).astype(np.int8)
+        return codes.tobytes() + scales.astype("<f4").tobytes()
+    raise ValueError(f"Unsupported dtype '{dtype}', expected one of {', '.join(DTYPES)}")
+
+
+def decode(payload: bytes, dtype: str, shape) -> np.ndarray:
+    """Parse a wire payload back into a float32 array of the given shape."""
+    rows, dim = (int(x) for x in shape)
+    if dtype == "float32":
+        return np.frombuffer(payload, dtype="<f4").reshape(rows, dim).astype(np.float32)
+    if dtype == "float16":
+        return np.frombuffer(payload, dtype="<f2").reshape(rows, dim).astype(np.float32)
+    if dtype == "int8":
+        codes = np.frombuffer(payload, dtype=np.int8, count=rows * dim).reshape(rows, dim)
+        scales = np.frombuffer(payload, dtype="<f4", offset=rows * dim, count=rows)
+        return codes.astype(np.float32) * scales[:, None]
+    raise ValueError(f"Unsupported dtype '{dtype}', expected one of {', '.join(DTYPES)}")
+
+
+def format_shape(shape) -> str:
+    return ",".join(str(int(x)) for x in shape)
+
+
+def parse_shape(value: str):
+    return [int(x) for x in value.split(",")]
+
+
+def to_base64(matrix: np.ndarray, dtype: str = "float32") -> dict:
+    matrix = np.asarray(matrix)
+    return {
+        "dtype": dtype,
+        "shape": list(matrix.shape),
+        "data": base64.b64encode(encode(matrix, dtype)).decode("ascii"),
+    }
+
+
+def read_vectors(value):
+    """
+    Accept either a JSON list (vector or list of vectors) or a base64 object
+    and return a float32 array. Base64 objects always decode to 2-D.
+    """
+    if isinstance(value, dict) and "data" in value:
+        return decode(base64.b64decode(value["data"]), value.get("dtype", "float32"), value["shape"])
+    return np.asarray(value, dtype=np.float32)
@@ -0,0 +1,164 @@
+"""
+Background refresh of the scraper caches.
+
+Each source is a RefreshJob. Jobs run on a jittered interval from a private
+`schedule.Scheduler`, so replicas and sources don't all scrape at the same
+moment, and every trigger — scheduled or from POST /api/refresh — goes
+through single-flight: while a job is running, further triggers join the
+in-flight run instead of starting another scrape. Readers keep getting the
+current (possibly stale) data until a run finishes and swaps in new data.
+"""
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+import schedule
+
+
+class RefreshJob:
+    """
+    One refreshable source with single-flight execution and run status.
+
+    Args:
+        name: Source name used in status output and API parameters
+        fn: Callable doing the refresh; its return value is kept as `result`
+        last_success: Time of the last known good data (e.g. the cache timestamp)
+    """
+
+    def __init__(self, name: str, fn: Callable, last_success: Optional[float] = None):
+        self.name = name
+        self.fn = fn
+        self.state = "idle"
+        self.runs = 0
+        self.failures = 0
+        self.coalesced = 0
+        self.last_started = None
+        self.last_finished = None
+        self.last_success = last_success
+        self.last_duration = None
+        self.last_error = None
+        self.result = None
+        self._future = None
+        self._lock = threading.Lock()
+
+    def trigger(self, executor: ThreadPoolExecutor) -> Future:
+        """Start a run, or return the run already in flight."""
+        with self._lock:
+            if self._future is not None and not self._future.done():
+                self.coalesced += 1
+                return self._future
+            self.state = "running"
+            self.last_started = time.time()
+            self._future = executor.submit(self._run)
+            return self._future
+
+    def _run(self):
+        started = time.perf_counter()
+        try:
+            self.result = self.fn()
+            self.state = "ok"
+            self.last_error = None
+            self.last_success = time.time()
+            return self.result
+        except Exception as e:
+            self.state = "error"
+            self.failures += 1
+            self.last_error = str(e)
+            print(f"Refresh of {self.name} failed: {e}")
+            raise
+        finally:
+            self.runs += 1
+            self.last_finished = time.time()
+            self.last_duration = round(time.perf_counter() - started, 3)
+
+    def age(self) -> Optional[float]:
+        return time.time() - self.last_success if self.last_success else None
+
+    def status(self) -> Dict:
+        age = self.age()
+        return {
+            "state": self.state,
+            "running": self._future is not None and not self._future.done(),
+            "runs": self.runs,
+            "failures": self.failures,
+            "coalesced": self.coalesced,
+            "last_started": self.last_started,
+            "last_finished": self.last_finished,
+            "last_success": self.last_success,
+            "last_duration_seconds": self.last_duration,
+            "last_error": self.last_error,
+            "age_seconds": round(age, 1) if age is not None else None,
+            "result": self.result,
+        }
+
+
+class RefreshScheduler:
+    """
+    Runs RefreshJobs every `interval` seconds, +/- `jitter` (a fraction).
+
+        scheduler = RefreshScheduler(interval=6 * 3600, jitter=0.1)
+        scheduler.add("mlh", refresh_mlh, last_success=cache_timestamp)
+        scheduler.start()
+        scheduler.trigger("mlh")      # single-flight
+    """
+
+    def __init__(self, interval: float, jitter: float = 0.1, tick: float = 1.0):
+        self.interval = interval
+        self.jitter = jitter
+        self.tick = tick
+        self.jobs = {}
+        self._scheduler = schedule.Scheduler()
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="refresh")
+        self._thread = None
+        self._stop = threading.Event()
+
+    def add(self, name: str, fn: Callable, last_success: Optional[float] = None) -> RefreshJob:
+        job = RefreshJob(name, fn, last_success)
+        self.jobs[name] = job
+        low = max(1, int(self.interval * (1 - self.jitter)))
+        high = max(low, int(self.interval * (1 + self.jitter)))
+        # schedule re-draws a random delay in [low, high] after every run
+        self._scheduler.every(low).to(high).seconds.do(self._scheduled, name)
+        return job
+
+    def _scheduled(self, name: str):
+        self.trigger(name)
+
+    def trigger(self, name: Optional[str] = None) -> Dict[str, Future]:
+        """Trigger one job (or all of them). Returns the in-flight future per job."""
+        names = [name] if name else list(self.jobs)
+        unknown = [n for n in names if n not in self.jobs]
+        if unknown:
+            raise KeyError(f"Unknown refresh job: {', '.join(unknown)}")
+        return {n: self.jobs[n].trigger(self._executor) for n in names}
+
+    def start(self):
+        """Start the scheduler thread; jobs whose data is already stale run right away."""
+        if self._thread is not None:
+            return
+        for name, job in self.jobs.items():
+            age = job.age()
+            if age is None or age > self.interval:
+                # Small random delay so replicas starting together don't scrape in lockstep
+                threading.Timer(random.uniform(0, 5), self.trigger, args=(name,)).start()
+        self._thread = threading.Thread(target=self._loop, name="refresh-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        while not self._stop.wait(self.tick):
+            self._scheduler.run_pending()
+
+    def status(self) -> Dict:
+        next_runs = {job.job_func.args[0]: job.next_run.timestamp() for job in self._scheduler.jobs
+                     if job.next_run}
+        return {
+            "interval_seconds": self.interval,
+            "jitter": self.jitter,
+            "running": self._thread is not None and self._thread.is_alive(),
+            "jobs": {name: {**job.status(), "next_run": next_runs.get(name)} for name, job in self.jobs.items()},
+        }
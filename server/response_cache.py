@@ -0,0 +1,175 @@
+"""
+Cache of serialized, pre-compressed GET responses.
+
+Entries are keyed by path + normalized query string and tagged with the data
+version they were built from; when a view's version moves on (a refresh
+changed the store) all of that view's entries are dropped. Each entry keeps
+the identity body plus gzip (and brotli, when the `brotli` package is
+installed) encodings, so a repeat request costs a dict lookup — or just a
+304 when the client already holds the same ETag.
+"""
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import Callable, Dict, Optional
+from urllib.parse import urlencode
+
+from flask import Response, request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_BYTES = 512
+
+
+class CachedBody:
+    def __init__(self, body: bytes, mimetype: str, version):
+        self.version = version
+        self.mimetype = mimetype
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.encodings = {"identity": body}
+        if len(body) >= MIN_COMPRESS_BYTES:
+            self.encodings["gzip"] = gzip.compress(body, compresslevel=6)
+            if brotli is not None:
+                self.encodings["br"] = brotli.compress(body, quality=5)
+        # Strong ETags must differ per content-coding
+        self.etags = {coding: f'"{digest}"' if coding == "identity" else f'"{digest}-{coding}"'
+                      for coding in self.encodings}
+        self.size = sum(len(b) for b in self.encodings.values())
+
+    def negotiate(self, accept_encoding: str) -> str:
+        accepted = {part.split(";")[0].strip() for part in accept_encoding.lower().split(",")}
+        for coding in ("br", "gzip"):
+            if coding in self.encodings and coding in accepted:
+                return coding
+        return "identity"
+
+
+class ResponseCache:
+    """
+    LRU of CachedBody entries for idempotent JSON views.
+
+        response_cache = ResponseCache()
+
+        @app.route("/api/statistics")
+        @response_cache.cached(lambda: store.version)
+        def get_statistics(): ...
+
+    Args:
+        max_entries: Maximum number of cached responses
+        max_bytes: Maximum total size of all stored encodings
+        max_age: Cache-Control max-age (seconds) sent with cached responses
+    """
+
+    def __init__(self, max_entries: int = 512, max_bytes: int = 64 * 1024 * 1024, max_age: int = 60):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._versions = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def key() -> str:
+        """Path plus query parameters in a canonical order."""
+        args = sorted((k, v) for k in request.args for v in request.args.getlist(k))
+        return f"{request.path}?{urlencode(args)}"
+
+    def _lookup(self, view: str, key: str, version) -> Optional[CachedBody]:
+        with self._lock:
+            if self._versions.get(view, version) != version:
+                self._invalidate(view)
+            self._versions[view] = version
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _store(self, view: str, key: str, entry: CachedBody):
+        with self._lock:
+            # The data changed while this response was being built
+            if self._versions.get(view) != entry.version:
+                return
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.size
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+
+    def _invalidate(self, view: str):
+        stale = [key for key in self._entries if key.startswith(view + "\0")]
+        for key in stale:
+            self._bytes -= self._entries.pop(key).size
+        if stale:
+            self.invalidations += 1
+
+    def _respond(self, entry: CachedBody) -> Response:
+        coding = entry.negotiate(request.headers.get("Accept-Encoding", ""))
+        etag = entry.etags[coding]
+        headers = {
+            "ETag": etag,
+            "Cache-Control": f"public, max-age={self.max_age}, must-revalidate",
+            "Vary": "Accept-Encoding",
+        }
+
+        if_none_match = request.headers.get("If-None-Match", "")
+        if if_none_match.strip() == "*" or etag in (t.strip() for t in if_none_match.split(",")):
+            self.not_modified += 1
+            return Response(status=304, headers=headers)
+
+        if coding != "identity":
+            headers["Content-Encoding"] = coding
+        return Response(entry.encodings[coding], mimetype=entry.mimetype, headers=headers)
+
+    def cached(self, version_fn: Callable):
+        """Decorator caching successful responses of a view for the current data version."""
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                version = version_fn()
+                key = f"{view.__name__}\0{self.key()}"
+                entry = self._lookup(view.__name__, key, version)
+                if entry is not None:
+                    self.hits += 1
+                    return self._respond(entry)
+
+                self.misses += 1
+                response = view(*args, **kwargs)
+                # Only plain 200 responses are cached; errors, tuples and responses the
+                # view marked no-store (e.g. degraded by a failing dependency) pass through
+                if not isinstance(response, Response) or response.status_code != 200 \
+                        or "no-store" in response.headers.get("Cache-Control", ""):
+                    return response
+                entry = CachedBody(response.get_data(), response.mimetype, version)
+                self._store(view.__name__, key, entry)
+                return self._respond(entry)
+            return wrapper
+        return decorator
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "versions": {view: str(version) for view, version in self._versions.items()},
+                "hits": self.hits,
+                "misses": self.misses,
+                "not_modified": self.not_modified,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "brotli": brotli is not None,
+            }
@@ -0,0 +1,99 @@
+"""
+Snapshot the cached Devpost and MLH events, plus their embeddings.
+
+    python backup.py [--out ../data/snapshot] [--no-embeddings] [--compare-json]
+
+Events are read from the caches in server/data, normalized to the API
+schema and written in the columnar snapshot format (see snapshot.py).
+Embeddings are fetched from the embedding service (EMBEDDING_API_URL) when
+it is configured, so restores and the search index don't have to re-embed.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+SERVER_DIR = os.path.dirname(SCRIPTS_DIR)
+sys.path[:0] = [SCRIPTS_DIR, SERVER_DIR]
+
+from event_store import load_cached_events  # noqa: E402
+from search_index import EMBEDDING_URL, embed_texts, event_text  # noqa: E402
+from snapshot import Snapshot, write_snapshot  # noqa: E402
+
+DATA_DIR = os.path.join(SERVER_DIR, "data")
+DEFAULT_SNAPSHOT = os.path.join(DATA_DIR, "snapshot")
+
+
+def text_hash(event) -> str:
+    """Hash of the embedded text, so readers can tell which vectors are still valid."""
+    return hashlib.sha1(event_text(event).encode("utf-8")).hexdigest()
+
+
+def create_backup(out_dir: str = DEFAULT_SNAPSHOT, data_dir: str = DATA_DIR, with_embeddings: bool = True):
+    """
+    Write a snapshot of all cached events.
+
+    Args:
+        out_dir: Snapshot directory to (re)write
+        data_dir: Directory holding the scraper caches
+        with_embeddings: Fetch and store event embeddings
+
+    Returns:
+        The snapshot manifest
+    """
+    events = load_cached_events(data_dir)
+    if not events:
+        raise SystemExit(f"No cached events found in {data_dir}")
+    for event in events:
+        event["text_hash"] = text_hash(event)
+
+    embeddings = None
+    if with_embeddings and EMBEDDING_URL:
+        started = time.perf_counter()
+        embeddings = embed_texts([event_text(e) for e in events])
+        print(f"Embedded {len(events)} events in {time.perf_counter() - started:.1f}s")
+    elif with_embeddings:
+        print("EMBEDDING_API_URL is not set, writing the snapshot without embeddings")
+
+    sources = sorted({e["source"] for e in events})
+    return write_snapshot(out_dir, events, embeddings, sources=sources,
+                          model=os.getenv("MODEL_NAME", "all-MiniLM-L6-v2") if embeddings is not None else None)
+
+
+def json_size(snapshot: Snapshot) -> int:
+    """Bytes the snapshot's events (and embeddings) take as indented JSON, one batch at a time."""
+    total = 0
+    for batch in snapshot.iter_batches():
+        total += len(json.dumps(batch, indent=2, ensure_ascii=False).encode("utf-8"))
+    embeddings = snapshot.embeddings
+    if embeddings is not None:
+        for start in range(0, len(embeddings), 1000):
+            total += len(json.dumps(embeddings[start:start + 1000].tolist()).encode("utf-8"))
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--out", default=DEFAULT_SNAPSHOT)
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--no-embeddings", action="store_true")
+    parser.add_argument("--compare-json", action="store_true",
+                        help="Also report the size of the same data as indented JSON (decodes the whole snapshot)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    manifest = create_backup(args.out, args.data_dir, with_embeddings=not args.no_embeddings)
+    seconds = time.perf_counter() - started
+
+    snapshot = Snapshot(args.out)
+    print(f"Snapshot of {manifest['count']} events ({', '.join(manifest['sources'])}) written to "
+          f"{args.out} in {seconds:.2f}s ({snapshot.size_bytes() / 1024:.1f} KB)")
+    if args.compare_json:
+        print(f"  indented JSON: {json_size(snapshot) / 1024:.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
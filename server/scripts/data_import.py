@@ -0,0 +1,377 @@
+"""
+Bulk import of scraped events into MongoDB.
+
+    python data_import.py                       # Devpost + MLH caches in server/data
+    python data_import.py ../data/snapshot      # a backup snapshot (backup.py)
+    python data_import.py --mongomock --workers 0 --checkpoint import.ckpt
+
+Records are streamed from the caches (or a backup snapshot) in chunks of
+`--chunk-size`. Chunks are normalized to the Event model in a process pool,
+deduplicated on the upsert key, and written with unordered bulk upserts
+keyed on (platform, externalId) — the unique index on the Event model.
+At most `--max-in-flight` chunks are read ahead of the writer, so memory
+stays bounded however large the archive is. After every chunk the read
+offset per source is saved to the checkpoint file; an interrupted import
+started again with the same checkpoint resumes where it stopped. A source
+whose cache changed since is imported again from the start, so updated
+events are written over the old ones.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+SERVER_DIR = os.path.dirname(SCRIPTS_DIR)
+sys.path[:0] = [SCRIPTS_DIR, SERVER_DIR]
+
+from event_store import NORMALIZERS, cache_files, iter_cache_file  # noqa: E402
+from snapshot import Snapshot  # noqa: E402
+
+DATA_DIR = os.path.join(SERVER_DIR, "data")
+MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017/hacktrack")
+DEFAULT_CHUNK_SIZE = 500
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
+
+def _as_datetime(value) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.strptime(str(value)[:10], "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+
+def external_id(event: Dict) -> str:
+    """Id the Node importers use: the Devpost id, or the event name for MLH."""
+    prefix = event["source"] + "-"
+    if event["source"] == "mlh":
+        return event.get("title") or event["id"][len(prefix):]
+    return event["id"][len(prefix):] if event["id"].startswith(prefix) else event["id"]
+
+
+def dedup_key(doc: Dict) -> bytes:
+    """
+    8-byte digest of the identity the upsert filters on: (platform,
+    externalId), i.e. the devpostId for Devpost and the event name for MLH.
+    """
+    identity = f"{doc['platform']}\0{doc['externalId']}"
+    return hashlib.blake2b(identity.encode("utf-8"), digest_size=8).digest()
+
+
+def to_event_document(event: Dict) -> Optional[Dict]:
+    """Map an API-schema event to the fields of the Mongo Event model (None if it has no start)."""
+    start = _as_datetime(event.get("start_date"))
+    if not event.get("title") or start is None:
+        return None
+    return {
+        "type": "api",
+        "platform": event["source"],
+        "externalId": external_id(event),
+        "title": event["title"],
+        "url": event.get("url") or "",
+        "description": event.get("description") or "",
+        "start": start,
+        "end": _as_datetime(event.get("deadline")),
+        "location": event.get("location") or "online",
+        "isOnline": bool(event.get("is_online")),
+        "organizer": event.get("organization") or "",
+        "prize": event.get("prize_amount") or 0,
+        "themes": event.get("themes") or [],
+        "bannerImage": event.get("image_url") or "",
+        "isApproved": True,
+    }
+
+
+def normalize_chunk(kind: str, records: List[Dict]) -> Tuple[List[Tuple[bytes, Dict]], int]:
+    """
+    Worker task: raw cache records (kind "devpost" / "mlh") or API-schema
+    events (kind "events") -> (dedup key, Event document) pairs, first record
+    per key, plus the number of records skipped for lacking a title or start.
+    """
+    normalize = NORMALIZERS.get(kind)
+    documents = {}
+    invalid = 0
+    for record in records:
+        doc = to_event_document(normalize(record) if normalize else record)
+        if doc is None:
+            invalid += 1
+        else:
+            documents.setdefault(dedup_key(doc), doc)
+    return list(documents.items()), invalid
+
+
+def upsert_operations(documents: Iterable[Dict]) -> List:
+    from pymongo import UpdateOne
+
+    now = datetime.now(timezone.utc)
+    return [
+        UpdateOne(
+            {"platform": doc["platform"], "externalId": doc["externalId"]},
+            {"$set": {**doc, "updatedAt": now}, "$setOnInsert": {"createdAt": now}},
+            upsert=True,
+        )
+        for doc in documents
+    ]
+
+
+class Checkpoint:
+    """
+    Resume state of an import: records consumed per source, plus the dedup
+    keys written so far for the source being imported, in a sidecar file of
+    8-byte digests. The keys only span one pass over one source: they are
+    dropped when the next source starts, when a source is finished and when
+    a source's fingerprint changes, so a refreshed cache is written again
+    and the sidecar never outgrows a single source. The JSON file is
+    replaced atomically after each chunk is written and records how many
+    digests in the sidecar are valid, so a crash mid-chunk loses nothing.
+
+    Args:
+        path: Checkpoint file, or None to keep the state in memory only
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.sources = {}
+        self.keys = set()
+        self._keys_source = None
+        self._keys_file = None
+        if not path:
+            return
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            self.sources = state.get("sources", {})
+            self._keys_source = state.get("keys_source")
+            count = state.get("keys", 0)
+            if count and self._keys_source:
+                self.keys = {d.tobytes() for d in np.fromfile(self.keys_path, dtype="V8", count=count)}
+        # Drop digests of a chunk that was interrupted before its checkpoint was saved
+        self._keys_file = open(self.keys_path, "r+b" if os.path.exists(self.keys_path) else "wb")
+        self._keys_file.truncate(len(self.keys) * 8)
+        self._keys_file.seek(0, os.SEEK_END)
+
+    @property
+    def keys_path(self) -> str:
+        return self.path + ".keys"
+
+    def start(self, source: str, fingerprint: str) -> int:
+        """
+        Begin importing `source`: the dedup keys are kept only when resuming
+        this same source part way through.
+
+        Returns:
+            Records of `source` already imported (0 if the source changed since)
+        """
+        state = self.sources.get(source)
+        offset = state["offset"] if state and state.get("fingerprint") == fingerprint else 0
+        if not offset or self._keys_source != source:
+            self._reset_keys()
+        self._keys_source = source
+        return offset
+
+    def finish(self, source: str, fingerprint: str, offset: int):
+        """Record `source` as fully imported and drop its dedup keys."""
+        self._reset_keys()
+        self._keys_source = None
+        self.save(source, fingerprint, offset)
+
+    def _reset_keys(self):
+        self.keys = set()
+        if self._keys_file is not None:
+            self._keys_file.truncate(0)
+            self._keys_file.seek(0)
+
+    def add_keys(self, keys: List[bytes]):
+        self.keys.update(keys)
+        if self._keys_file is not None:
+            self._keys_file.write(b"".join(keys))
+
+    def save(self, source: str, fingerprint: str, offset: int):
+        self.sources[source] = {"fingerprint": fingerprint, "offset": offset}
+        if not self.path:
+            return
+        self._keys_file.flush()
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"sources": self.sources, "keys": len(self.keys), "keys_source": self._keys_source,
+                       "updated": time.time()}, f)
+        os.replace(tmp_path, self.path)
+
+    def close(self):
+        if self._keys_file is not None:
+            self._keys_file.close()
+            self._keys_file = None
+
+
+def _fingerprint(path: str) -> str:
+    info = os.stat(path)
+    return f"{info.st_size}:{int(info.st_mtime)}"
+
+
+def cache_sources(data_dir: str) -> List[Tuple[str, str, str, Iterator[Dict]]]:
+    """(name, kind, fingerprint, records) for every scraper cache in data_dir."""
+    return [(source, source, _fingerprint(path), iter_cache_file(path))
+            for source, path in cache_files(data_dir).items()]
+
+
+def snapshot_source(directory: str, batch_size: int = DEFAULT_CHUNK_SIZE) -> Tuple[str, str, str, Iterator[Dict]]:
+    """The same tuple for the events of a backup snapshot."""
+    snapshot = Snapshot(directory)
+    records = (event for batch in snapshot.iter_batches(batch_size) for event in batch)
+    return "snapshot", "events", str(snapshot.manifest["created"]), records
+
+
+def _chunks(records: Iterator[Dict], size: int) -> Iterator[List[Dict]]:
+    while True:
+        chunk = list(islice(records, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_import(sources, collection=None, checkpoint: Optional[Checkpoint] = None,
+               chunk_size: int = DEFAULT_CHUNK_SIZE, workers: int = DEFAULT_WORKERS,
+               max_in_flight: Optional[int] = None) -> Dict:
+    """
+    Normalize, dedupe and upsert the records of each source.
+
+    Args:
+        sources: (name, kind, fingerprint, records) tuples, see cache_sources()
+        collection: pymongo (or mongomock) collection; None for a dry run
+        checkpoint: Resume state; records before its offsets are skipped.
+            Ignored on dry runs, which never persist progress
+        chunk_size: Records per normalization task and bulk write
+        workers: Normalization processes (0 normalizes in this process)
+        max_in_flight: Chunks read ahead of the writer (default 2 per worker)
+
+    Returns:
+        Counts of records read, written, duplicates, skipped, upserted and modified
+    """
+    if collection is None or checkpoint is None:
+        checkpoint = Checkpoint()
+    max_in_flight = max_in_flight or max(1, 2 * workers)
+    totals = {"records": 0, "resumed": 0, "written": 0, "duplicates": 0, "skipped": 0,
+              "upserted": 0, "modified": 0, "chunks": 0}
+    started = time.perf_counter()
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 0 else None
+
+    def write(chunk_len: int, normalized: Tuple[List[Tuple[bytes, Dict]], int]):
+        pairs, invalid = normalized
+        # First record for a key wins, across the chunks of a source and across resumed runs
+        fresh = [(key, doc) for key, doc in pairs if key not in checkpoint.keys]
+        totals["records"] += chunk_len
+        totals["skipped"] += invalid
+        totals["duplicates"] += chunk_len - invalid - len(fresh)
+        totals["chunks"] += 1
+        if collection is not None and fresh:
+            result = collection.bulk_write(upsert_operations(doc for _, doc in fresh), ordered=False)
+            totals["upserted"] += result.upserted_count
+            totals["modified"] += result.modified_count
+        totals["written"] += len(fresh)
+        checkpoint.add_keys([key for key, _ in fresh])
+
+    try:
+        for name, kind, fingerprint, records in sources:
+            offset = checkpoint.start(name, fingerprint)
+            records = iter(records)
+            if offset:
+                print(f"  {name}: resuming after {offset} records")
+                records = islice(records, offset, None)
+                totals["resumed"] += offset
+
+            # Chunks are written in read order; reading pauses while max_in_flight are pending
+            in_flight = deque()
+            for chunk in _chunks(records, chunk_size):
+                if executor is None:
+                    in_flight.append((len(chunk), normalize_chunk(kind, chunk)))
+                else:
+                    in_flight.append((len(chunk), executor.submit(normalize_chunk, kind, chunk)))
+                while len(in_flight) >= max_in_flight:
+                    offset = _write_next(in_flight, write, checkpoint, name, fingerprint, offset)
+            while in_flight:
+                offset = _write_next(in_flight, write, checkpoint, name, fingerprint, offset)
+            checkpoint.finish(name, fingerprint, offset)
+            print(f"  {name}: {offset} records")
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        checkpoint.close()
+
+    totals["seconds"] = round(time.perf_counter() - started, 3)
+    return totals
+
+
+def _write_next(in_flight: deque, write, checkpoint: Checkpoint, name: str, fingerprint: str,
+                offset: int) -> int:
+    chunk_len, pending = in_flight.popleft()
+    write(chunk_len, pending if isinstance(pending, tuple) else pending.result())
+    offset += chunk_len
+    checkpoint.save(name, fingerprint, offset)
+    return offset
+
+
+def import_snapshot(snapshot_dir: str, collection=None, batch_size: int = DEFAULT_CHUNK_SIZE,
+                    checkpoint: Optional[Checkpoint] = None) -> Dict:
+    """Stream a backup snapshot into the events collection (None for a dry run)."""
+    return run_import([snapshot_source(snapshot_dir, batch_size)], collection, checkpoint,
+                      chunk_size=batch_size, workers=0)
+
+
+def connect(uri: str = MONGO_URI, mock: bool = False):
+    """The events collection of the database in `uri` (or of an in-memory mongomock client)."""
+    if mock:
+        import mongomock
+
+        client = mongomock.MongoClient(uri)
+    else:
+        from pymongo import MongoClient
+
+        client = MongoClient(uri)
+    collection = client.get_default_database("hacktrack")["events"]
+    collection.create_index([("platform", 1), ("externalId", 1)], unique=True)
+    return collection
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("snapshot", nargs="?", help="Import a backup snapshot (backup.py) instead of the caches")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="Directory holding the scraper caches")
+    parser.add_argument("--uri", default=MONGO_URI)
+    parser.add_argument("--mongomock", action="store_true", help="Write to an in-memory mongomock database")
+    parser.add_argument("--chunk-size", "--batch-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--max-in-flight", type=int, default=None)
+    parser.add_argument("--checkpoint", help="Checkpoint file to resume from and update")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Normalize and dedupe without writing (the checkpoint is not read or updated)")
+    args = parser.parse_args()
+
+    if args.snapshot:
+        sources = [snapshot_source(args.snapshot, args.chunk_size)]
+    else:
+        sources = cache_sources(args.data_dir)
+    if not sources:
+        raise SystemExit(f"No cached events found in {args.data_dir}")
+
+    collection = None if args.dry_run else connect(args.uri, args.mongomock)
+    checkpoint = None if args.dry_run else Checkpoint(args.checkpoint)
+    totals = run_import(sources, collection, checkpoint, args.chunk_size,
+                        args.workers, args.max_in_flight)
+    print(f"Imported {totals['records']} records in {totals['seconds']}s: {totals['upserted']} new, "
+          f"{totals['modified']} modified, {totals['duplicates']} duplicates, "
+          f"{totals['skipped']} skipped (no title or start date)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,119 @@
 import requests
 import json
 import csv
+import hashlib
+import math
+import os
+import random
 import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import List, Dict, Optional
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "python"))
+
+from event_stats import EventStats  # noqa: E402
+from instrumentation import timed, timer  # noqa: E402
+from ndjson_cache import iter_records, write_cache  # noqa: E402
+
+# Status codes worth retrying: rate limited or transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Fields that change on every crawl without the hackathon itself changing
+VOLATILE_FIELDS = ('time_left_to_submission',)
+
+# HTML tags, currency symbols and thousands separators in prize strings
+PRIZE_NOISE = re.compile(r'<[^>]+>|[$€£,]')
+
+
+def record_hash(record: Dict) -> str:
+    """Content hash of an extracted record, ignoring volatile fields."""
+    stable = {k: v for k, v in record.items() if k not in VOLATILE_FIELDS}
+    return hashlib.sha1(json.dumps(stable, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+class RateLimiter:
+    """
+    Per-host request spacing shared by all worker threads.
+
+    Each host gets at most `requests_per_second` request starts per second;
+    callers block in wait() until their slot comes up.
+    """
+
+    def __init__(self, requests_per_second: float = 5.0):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host: str):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
 
 class DevpostScraper:
     """
     Scraper for Devpost hackathons using their public API
     """
     
-    def __init__(self):
-        self.api_url = "https://devpost.com/api/hackathons"
+    def __init__(self, api_url: str = "https://devpost.com/api/hackathons", max_retries: int = 3,
+                 backoff: float = 1.0, requests_per_second: float = 5.0, pool_size: int = 8):
+        self.api_url = api_url
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'application/json',
             'Referer': 'https://devpost.com/hackathons'
         }
         self.hackathons = []
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.rate_limiter = RateLimiter(requests_per_second)
+
+        # One pooled session so pages reuse keep-alive connections
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _retry_delay(self, attempt: int, response=None) -> float:
+        """Seconds to wait before retrying: Retry-After if given, else exponential backoff with jitter."""
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return self.backoff * (2 ** attempt) * (0.5 + random.random() / 2)
+
+    def _get(self, params: Dict, headers: Dict = None) -> requests.Response:
+        """GET the API with per-host rate limiting and retries on 429/5xx and connection errors."""
+        host = urlparse(self.api_url).netloc
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.wait(host)
+            try:
+                response = self.session.get(self.api_url, params=params, headers=headers, timeout=10)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self._retry_delay(attempt))
+                continue
+
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                time.sleep(self._retry_delay(attempt, response))
+                continue
+
+            response.raise_for_status()
+            return response
     
+    @timed("devpost.fetch_hackathons")
     def fetch_hackathons(self, page: int = 1, per_page: int = 50) -> Optional[Dict]:
         """
         Fetch hackathons from the API
@@ -37,12 +132,47 @@ class DevpostScraper:
         }
         
         try:
-            response = requests.get(self.api_url, headers=self.headers, params=params, timeout=10)
-            response.raise_for_status()
-            return response.json()
+            return self._get(params).json()
+        except requests.exceptions.RequestException as e:
+            print(f"Error fetching page {page}: {e}")
+            return None
+    
+    @timed("devpost.fetch_hackathons")
+    def fetch_hackathons_conditional(self, page: int, validators: Dict = None,
+                                     per_page: int = 50) -> Optional[Dict]:
+        """
+        Fetch a page with If-None-Match / If-Modified-Since from a previous crawl
+        
+        Args:
+            page: Page number to fetch
+            validators: {'etag': ..., 'last_modified': ...} saved for this page
+            per_page: Number of results per page
+        
+        Returns:
+            {'not_modified': bool, 'data': dict or None, 'validators': dict},
+            or None if the request failed
+        """
+        params = {'page': page, 'per_page': per_page, 'order_by': 'submission_period_dates'}
+        headers = {}
+        if validators:
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+        
+        try:
+            response = self._get(params, headers=headers)
         except requests.exceptions.RequestException as e:
             print(f"Error fetching page {page}: {e}")
             return None
+        
+        new_validators = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+        }
+        if response.status_code == 304:
+            return {'not_modified': True, 'data': None, 'validators': validators or new_validators}
+        return {'not_modified': False, 'data': response.json(), 'validators': new_validators}
     
     def extract_hackathon_data(self, hackathon: Dict) -> Dict:
         """
@@ -116,14 +246,9 @@ class DevpostScraper:
         # Convert to string if not already
         prize_str = str(prize_str)
         
-        # Remove HTML tags
-        prize_str = re.sub(r'<[^>]+>', '', prize_str)
-        
-        # Remove currency symbols and commas
-        prize_str = prize_str.replace('$', '').replace(',', '').replace('€', '').replace('£', '')
-        
-        # Remove any whitespace
-        prize_str = prize_str.strip()
+        # Remove HTML tags, currency symbols and commas in one pass, then
+        # surrounding whitespace (internal spaces still make it unparseable)
+        prize_str = PRIZE_NOISE.sub('', prize_str).strip()
         
         # Try to convert to float
         try:
@@ -131,16 +256,20 @@ class DevpostScraper:
         except (ValueError, TypeError):
             return 0.0
     
-    def scrape_all_hackathons(self, max_pages: int = None) -> List[Dict]:
+    def scrape_all_hackathons(self, max_pages: int = None, concurrency: int = 1) -> List[Dict]:
         """
         Scrape all available hackathons
         
         Args:
             max_pages: Maximum number of pages to scrape (None for all)
+            concurrency: Number of pages fetched in parallel (1 = sequential)
         
         Returns:
             List of all hackathon data
         """
+        if concurrency > 1:
+            return self._scrape_concurrent(max_pages, concurrency)
+
         print("Starting Devpost hackathons scraping...")
         page = 1
         total_scraped = 0
@@ -162,10 +291,11 @@ class DevpostScraper:
                 print("No more hackathons found.")
                 break
             
-            for hackathon in hackathons:
-                extracted = self.extract_hackathon_data(hackathon)
-                self.hackathons.append(extracted)
-                total_scraped += 1
+            with timer("devpost.parse"):
+                for hackathon in hackathons:
+                    extracted = self.extract_hackathon_data(hackathon)
+                    self.hackathons.append(extracted)
+                    total_scraped += 1
             
             print(f"Scraped {len(hackathons)} hackathons from page {page} (Total: {total_scraped})")
             
@@ -182,6 +312,175 @@ class DevpostScraper:
         print(f"\nTotal hackathons scraped: {len(self.hackathons)}")
         return self.hackathons
     
+    def _scrape_concurrent(self, max_pages: Optional[int], concurrency: int) -> List[Dict]:
+        """
+        Fetch page 1 to learn meta.total_count, then the remaining pages in
+        parallel. Results are appended in page order.
+        """
+        print(f"Starting Devpost hackathons scraping ({concurrency} concurrent requests)...")
+        first = self.fetch_hackathons(page=1)
+        if not first:
+            print("Failed to fetch data, stopping...")
+            return self.hackathons
+
+        first_page = first.get('hackathons', [])
+        total_count = first.get('meta', {}).get('total_count', 0)
+        per_page = len(first_page) or 1
+        pages = max(1, math.ceil(total_count / per_page))
+        if max_pages:
+            pages = min(pages, max_pages)
+        print(f"Found {total_count} hackathons across {pages} pages")
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            # executor.map yields in submission order, so output stays in page order
+            rest = executor.map(lambda page: (page, self.fetch_hackathons(page=page)), range(2, pages + 1))
+            for page, data in [(1, first), *rest]:
+                if not data:
+                    print(f"Skipping page {page} after repeated failures")
+                    continue
+                with timer("devpost.parse"):
+                    for hackathon in data.get('hackathons', []):
+                        self.hackathons.append(self.extract_hackathon_data(hackathon))
+
+        print(f"\nTotal hackathons scraped: {len(self.hackathons)}")
+        return self.hackathons
+    
+    def load_sync_state(self, state_file: str) -> Dict:
+        """Load record hashes and per-page validators saved by the last sync."""
+        if os.path.exists(state_file):
+            with open(state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return {'records': {}, 'pages': {}}
+    
+    def save_sync_state(self, state: Dict, state_file: str):
+        tmp_file = state_file + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_file, state_file)
+    
+    def incremental_sync(self, state_file: str = "devpost_sync_state.json",
+                         max_pages: int = None, full: bool = False) -> Dict:
+        """
+        Fetch only what changed since the last sync
+        
+        Pages are requested conditionally with the ETag/Last-Modified seen last
+        time. Pagination stops early at the first page that is either not
+        modified or whose records all match their stored content hash. Removed
+        records can only be detected when the crawl reaches the last page, so
+        run with full=True now and then to reconcile deletions.
+        
+        Args:
+            state_file: JSON file holding record hashes and page validators
+            max_pages: Maximum number of pages to scan (None for all)
+            full: Scan every page instead of stopping early
+        
+        Returns:
+            Delta: {'added': [...], 'changed': [...], 'removed': [ids],
+                    'complete': bool, 'pages_fetched': int, 'pages_not_modified': int}
+        """
+        state = self.load_sync_state(state_file)
+        known = state.get('records', {})
+        pages = state.get('pages', {})
+        
+        delta = {'added': [], 'changed': [], 'removed': [], 'complete': False,
+                 'pages_fetched': 0, 'pages_not_modified': 0}
+        seen = set()
+        total_count = state.get('total_count', 0)
+        page = 1
+        
+        print("Starting incremental Devpost sync...")
+        while not max_pages or page <= max_pages:
+            result = self.fetch_hackathons_conditional(page, pages.get(str(page)))
+            if result is None:
+                print("Failed to fetch data, stopping...")
+                break
+            
+            previous = pages.get(str(page)) or {}
+            if result['not_modified']:
+                delta['pages_not_modified'] += 1
+                seen.update(previous.get('ids', []))
+                if not full:
+                    print(f"Page {page} not modified, stopping early.")
+                    break
+                if total_count and len(seen) >= total_count:
+                    delta['complete'] = True
+                    break
+                page += 1
+                continue
+            
+            delta['pages_fetched'] += 1
+            data = result['data'] or {}
+            raw = data.get('hackathons', [])
+            pages[str(page)] = {**result['validators'],
+                                'ids': [str(h.get('id')) for h in raw if h.get('id') is not None]}
+            if not raw:
+                delta['complete'] = True
+                break
+            
+            page_changed = False
+            for hackathon in raw:
+                record = self.extract_hackathon_data(hackathon)
+                record_id = str(record.get('id'))
+                if record.get('id') is None:
+                    continue
+                seen.add(record_id)
+                digest = record_hash(record)
+                if record_id not in known:
+                    delta['added'].append(record)
+                    page_changed = True
+                elif known[record_id] != digest:
+                    delta['changed'].append(record)
+                    page_changed = True
+                known[record_id] = digest
+                self.hackathons.append(record)
+            
+            if not page_changed and not full:
+                print(f"Page {page} unchanged, stopping early.")
+                break
+            
+            # Without a reported total we can't tell the listing was fully walked,
+            # and marking it complete would drop every record not seen yet
+            page_total = (data.get('meta') or {}).get('total_count')
+            if page_total is not None:
+                total_count = page_total
+                if len(seen) >= total_count:
+                    delta['complete'] = True
+                    break
+            page += 1
+        
+        if delta['complete']:
+            delta['removed'] = [record_id for record_id in known if record_id not in seen]
+            for record_id in delta['removed']:
+                del known[record_id]
+        
+        state['records'] = known
+        state['pages'] = pages
+        state['total_count'] = total_count
+        self.save_sync_state(state, state_file)
+        
+        print(f"Sync done: {len(delta['added'])} added, {len(delta['changed'])} changed, "
+              f"{len(delta['removed'])} removed ({delta['pages_fetched']} pages fetched)")
+        return delta
+    
+    @staticmethod
+    def apply_delta(records: List[Dict], delta: Dict) -> List[Dict]:
+        """
+        Merge an incremental_sync delta into previously saved records by id
+        
+        Args:
+            records: Hackathons from the last full crawl or merge
+            delta: Result of incremental_sync
+        
+        Returns:
+            Records with changed ones replaced in place, removed ones dropped
+            and new ones appended
+        """
+        updates = {str(r['id']): r for r in delta['changed'] + delta['added']}
+        removed = set(delta['removed'])
+        merged = [updates.pop(str(r.get('id')), r) for r in records if str(r.get('id')) not in removed]
+        merged.extend(updates.values())
+        return merged
+    
     def save_to_json(self, filename: str = "devpost_hackathons.json"):
         """
         Save scraped data to JSON file
@@ -189,10 +488,32 @@ class DevpostScraper:
         Args:
             filename: Output JSON filename
         """
-        with open(filename, 'w', encoding='utf-8') as f:
+        tmp_file = filename + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
             json.dump(self.hackathons, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_file, filename)
         print(f"Data saved to {filename}")
     
+    def save_to_ndjson(self, filename: str = "devpost_hackathons.ndjson"):
+        """
+        Save scraped data as an NDJSON cache (one hackathon per line)
+        
+        Args:
+            filename: Output NDJSON filename
+        """
+        count = write_cache(filename, self.hackathons, source="devpost", url=self.api_url)
+        print(f"{count} hackathons saved to {filename}")
+    
+    @staticmethod
+    def iter_saved(filename: str = "devpost_hackathons.ndjson"):
+        """
+        Stream hackathons back out of an NDJSON cache without loading it whole
+        
+        Args:
+            filename: NDJSON file written by save_to_ndjson
+        """
+        return iter_records(filename)
+    
     def save_to_csv(self, filename: str = "devpost_hackathons.csv"):
         """
         Save scraped data to CSV file
@@ -235,38 +556,23 @@ class DevpostScraper:
         """
         if not self.hackathons:
             return {}
+        return EventStats.from_records(self.hackathons).summary()
+    
+    def get_detailed_statistics(self, freq: str = "M", top: int = 10) -> Dict:
+        """
+        Grouped statistics: per state, theme and organization, prize
+        percentiles, registration histogram and start-date trends
         
-        total = len(self.hackathons)
-        online = sum(1 for h in self.hackathons if h.get('is_online'))
-        featured = sum(1 for h in self.hackathons if h.get('featured'))
-        
-        # Count by state
-        states = {}
-        for h in self.hackathons:
-            state = h.get('open_state', 'unknown')
-            states[state] = states.get(state, 0) + 1
-        
-        # Total prize money (prize_amount is already float)
-        total_prizes = sum(
-            h.get('prize_amount', 0) or 0
-            for h in self.hackathons
-        )
-        
-        # Total registrations
-        total_registrations = sum(
-            int(h.get('registrations_count', 0) or 0) 
-            for h in self.hackathons
-        )
+        Args:
+            freq: Trend bucket ("W", "M", "Q" or "Y")
+            top: Number of themes/organizations to keep
         
-        return {
-            'total_hackathons': total,
-            'online_hackathons': online,
-            'in_person_hackathons': total - online,
-            'featured_hackathons': featured,
-            'states': states,
-            'total_prize_money': total_prizes,
-            'total_registrations': total_registrations
-        }
+        Returns:
+            Dictionary containing the full statistics report
+        """
+        if not self.hackathons:
+            return {}
+        return EventStats.from_records(self.hackathons).report(freq=freq, top=top)
     
     def print_statistics(self):
         """
@@ -298,14 +604,24 @@ def main():
     """
     scraper = DevpostScraper()
     
+    if "--incremental" in sys.argv:
+        delta = scraper.incremental_sync(full="--full" in sys.argv)
+        with open("devpost_delta.json", 'w', encoding='utf-8') as f:
+            json.dump(delta, f, indent=2, ensure_ascii=False)
+        print("Delta saved to devpost_delta.json")
+        if os.path.exists("devpost_hackathons.ndjson") and (delta['added'] or delta['changed'] or delta['removed']):
+            scraper.hackathons = scraper.apply_delta(list(scraper.iter_saved()), delta)
+            scraper.save_to_ndjson("devpost_hackathons.ndjson")
+        return
+    
     # Scrape all hackathons (or limit with max_pages parameter)
-    hackathons = scraper.scrape_all_hackathons(max_pages=5)  # Remove max_pages to get all
+    hackathons = scraper.scrape_all_hackathons(max_pages=5, concurrency=4)  # Remove max_pages to get all
     
     # Print statistics
     scraper.print_statistics()
     
     # Save data
-    scraper.save_to_json("devpost_hackathons.json")
+    scraper.save_to_ndjson("devpost_hackathons.ndjson")
     scraper.save_to_csv("devpost_hackathons.csv")
     
     # Print first few hackathons as example
@@ -0,0 +1,269 @@
+"""
+Columnar statistics over scraped hackathons.
+
+Records are loaded once into a pandas DataFrame (categoricals for the
+low-cardinality string columns, float/int arrays for the numbers, a
+datetime column for the start date) plus a long-form theme table, and every
+aggregate is a vectorized groupby or NumPy reduction over those columns.
+Works with both the snake_case records from DevpostScraper and the
+normalized events served by app.py.
+"""
+from typing import Dict, Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+PERCENTILES = (10, 25, 50, 75, 90, 99)
+
+# Registration histogram edges: 0, then log-spaced buckets
+REGISTRATION_BINS = (0, 1, 10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, np.inf)
+
+MONTHS = {m: i for i, m in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], 1)}
+
+PERIOD_PATTERN = (r"^(?P<m1>[A-Za-z]{3})\w*\s+(?P<d1>\d{1,2})(?:,\s*(?P<y1>\d{4}))?\s+-\s+"
+                  r"(?:(?P<m2>[A-Za-z]{3})\w*\s+)?(?P<d2>\d{1,2}),\s*(?P<y2>\d{4})")
+
+
+def parse_prize_amounts(values: pd.Series) -> pd.Series:
+    """Vectorized prize parsing: strip HTML tags, currency symbols, commas and outer whitespace, then to float."""
+    if pd.api.types.is_numeric_dtype(values):
+        return values.fillna(0).astype("float64")
+    text = values.fillna("").astype(str)
+    text = text.str.replace(r"<[^>]+>|[$€£,]", "", regex=True).str.strip()
+    return pd.to_numeric(text, errors="coerce").fillna(0.0)
+
+
+def parse_period_starts(periods: pd.Series) -> pd.Series:
+    """
+    Start dates of Devpost submission periods ("Aug 31 - Nov 19, 2025").
+    Each distinct period string is parsed once and broadcast back.
+    """
+    codes, uniques = pd.factorize(periods.fillna("").astype(str))
+    starts = _parse_unique_periods(pd.Series(uniques, dtype=object))
+    return pd.Series(starts.to_numpy()[codes], index=periods.index)
+
+
+def _parse_unique_periods(periods: pd.Series) -> pd.Series:
+    parts = periods.str.extract(PERIOD_PATTERN)
+    start_month = parts["m1"].str.lower().map(MONTHS)
+    end_month = parts["m2"].fillna(parts["m1"]).str.lower().map(MONTHS)
+    end_year = pd.to_numeric(parts["y2"], errors="coerce")
+    start_year = pd.to_numeric(parts["y1"], errors="coerce")
+    # A period without a start year that wraps the new year started the year before
+    start_year = start_year.fillna(end_year - (start_month > end_month).astype(int))
+    return pd.to_datetime(
+        pd.DataFrame({"year": start_year, "month": start_month, "day": pd.to_numeric(parts["d1"], errors="coerce")}),
+        errors="coerce",
+    )
+
+
+def _theme_table(theme_lists) -> pd.DataFrame:
+    """Long-form (row, theme) table from per-record theme lists (dicts or names)."""
+    rows, names = [], []
+    for row, themes in enumerate(theme_lists):
+        if isinstance(themes, list):
+            for theme in themes:
+                name = theme.get("name") if isinstance(theme, dict) else theme
+                if name:
+                    rows.append(row)
+                    names.append(name)
+    return pd.DataFrame({"row": np.asarray(rows, dtype=np.int64), "theme": pd.Categorical(names)})
+
+
+def _json_counts(series: pd.Series) -> Dict:
+    return {str(k): int(v) for k, v in series.items() if v}
+
+
+def _rows(grouped: pd.DataFrame) -> Dict:
+    """Aggregated frame -> {group: {column: plain int/float}} for JSON."""
+    columns = {name: grouped[name].to_numpy().tolist() for name in grouped.columns}
+    return {str(key): {name: values[i] for name, values in columns.items()}
+            for i, key in enumerate(grouped.index)}
+
+
+class EventStats:
+    """
+    Aggregates over a columnar snapshot of events.
+
+        stats = EventStats.from_records(scraper.hackathons)
+        stats.summary()
+        stats.group("organization", top=10)
+        stats.trends("M")
+    """
+
+    def __init__(self, frame: pd.DataFrame, themes: pd.DataFrame):
+        self.frame = frame
+        self.themes = themes
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict]) -> "EventStats":
+        """
+        Build the columnar snapshot from DevpostScraper records (snake_case)
+        or app.py API events; whichever column names are present are used.
+        """
+        raw = pd.DataFrame.from_records(list(records))
+        n = len(raw)
+
+        def column(*names, default=None):
+            for name in names:
+                if name in raw:
+                    return raw[name]
+            return pd.Series([default] * n, index=raw.index, dtype=object)
+
+        if "start_date" in raw:
+            start = pd.to_datetime(raw["start_date"], errors="coerce", format="%Y-%m-%d")
+        else:
+            start = parse_period_starts(column("submission_period_dates", "date"))
+
+        frame = pd.DataFrame({
+            "source": column("source", default="devpost").fillna("devpost").astype("category"),
+            "state": column("status", "open_state", default="unknown").fillna("unknown").astype("category"),
+            "organization": column("organization", "organization_name", default="").fillna("").astype("category"),
+            "is_online": column("is_online", default=False).fillna(False).astype(bool),
+            "featured": column("featured", default=False).fillna(False).astype(bool),
+            "prize_amount": parse_prize_amounts(column("prize_amount", default=0)),
+            "registrations": pd.to_numeric(column("registration_count", "registrations_count", default=0),
+                                           errors="coerce").fillna(0).astype("int64"),
+            "start_date": start,
+        })
+
+        return cls(frame, _theme_table(column("themes").to_numpy()))
+
+    @classmethod
+    def from_snapshot(cls, snapshot) -> "EventStats":
+        """
+        Build the frame straight from a snapshot (scripts/snapshot.py): string
+        columns become categoricals over the mapped dictionary codes and
+        numeric columns are read from the mapped arrays, with no JSON parsing.
+        """
+        def categorical(name, default):
+            if name not in snapshot.columns:
+                return pd.Categorical([default] * len(snapshot))
+            categories = list(snapshot.dictionary(name))
+            if default not in categories:
+                categories.append(default)
+            codes = np.asarray(snapshot.codes(name))
+            if (codes < 0).any():
+                codes = np.where(codes < 0, categories.index(default), codes)
+            return pd.Categorical.from_codes(codes, categories=categories)
+
+        def numeric(name, dtype):
+            if name not in snapshot.columns:
+                return np.zeros(len(snapshot), dtype=dtype)
+            return np.nan_to_num(np.asarray(snapshot.values(name))).astype(dtype, copy=False)
+
+        frame = pd.DataFrame({
+            "source": categorical("source", "devpost"),
+            "state": categorical("status", "unknown"),
+            "organization": categorical("organization", ""),
+            "is_online": numeric("is_online", bool),
+            "featured": numeric("featured", bool),
+            "prize_amount": numeric("prize_amount", "float64"),
+            "registrations": numeric("registration_count", "int64"),
+            "start_date": pd.to_datetime(pd.Series(snapshot.column("start_date")), errors="coerce",
+                                         format="%Y-%m-%d"),
+        })
+
+        rows, names = np.zeros(0, dtype=np.int64), pd.Categorical([])
+        if snapshot.columns.get("themes") == "dict_list":
+            offsets = np.asarray(snapshot.offsets("themes"))
+            rows = np.repeat(np.arange(len(snapshot), dtype=np.int64), np.diff(offsets))
+            names = pd.Categorical.from_codes(np.asarray(snapshot.codes("themes")),
+                                              categories=snapshot.dictionary("themes"))
+        return cls(frame, pd.DataFrame({"row": rows, "theme": names}))
+
+    def __len__(self):
+        return len(self.frame)
+
+    def summary(self) -> Dict:
+        """Headline totals (the keys DevpostScraper.get_statistics has always returned)."""
+        f = self.frame
+        online = int(f["is_online"].sum())
+        return {
+            "total_hackathons": len(f),
+            "online_hackathons": online,
+            "in_person_hackathons": len(f) - online,
+            "featured_hackathons": int(f["featured"].sum()),
+            "states": _json_counts(f["state"].value_counts(sort=False)),
+            "total_prize_money": float(f["prize_amount"].sum()),
+            "total_registrations": int(f["registrations"].sum()),
+        }
+
+    def group(self, by: str, top: Optional[int] = None) -> Dict:
+        """
+        Count, online count, prize total/mean and registrations per value of
+        a column ("source", "state", "organization") or "theme".
+
+        Args:
+            by: Column to group by
+            top: Keep only the `top` groups by count
+        """
+        if by == "theme":
+            values = self.frame.iloc[self.themes["row"].to_numpy()].reset_index(drop=True)
+            values["theme"] = self.themes["theme"].to_numpy()
+        elif by in ("source", "state", "organization"):
+            values = self.frame
+        else:
+            raise ValueError(f"Cannot group by '{by}'")
+
+        grouped = values.groupby(by, observed=True).agg(
+            count=("prize_amount", "size"),
+            online=("is_online", "sum"),
+            total_prize=("prize_amount", "sum"),
+            average_prize=("prize_amount", "mean"),
+            registrations=("registrations", "sum"),
+        )
+        # Largest groups first; ties by name so the order doesn't depend on category order
+        grouped = grouped.iloc[np.lexsort((grouped.index.astype(str), -grouped["count"].to_numpy()))]
+        if top:
+            grouped = grouped.head(top)
+        return _rows(grouped.assign(average_prize=grouped["average_prize"].round(2)))
+
+    def prize_percentiles(self, percentiles: Sequence[float] = PERCENTILES) -> Dict:
+        """Percentiles of the prize amount over events that have a prize."""
+        prizes = self.frame["prize_amount"].to_numpy()
+        prizes = prizes[prizes > 0]
+        if not len(prizes):
+            return {}
+        values = np.percentile(prizes, percentiles)
+        return {f"p{p:g}": round(float(v), 2) for p, v in zip(percentiles, values)}
+
+    def registration_histogram(self, bins: Sequence[float] = REGISTRATION_BINS) -> Dict:
+        counts, edges = np.histogram(self.frame["registrations"].to_numpy(), bins=np.asarray(bins, dtype=float))
+        labels = [f"{int(lo)}+" if np.isinf(hi) else f"{int(lo)}-{int(hi) - 1}" for lo, hi in zip(edges, edges[1:])]
+        return {"buckets": labels, "counts": counts.tolist()}
+
+    def trends(self, freq: str = "M") -> Dict:
+        """
+        Events, prize money and registrations per start-date bucket.
+
+        Args:
+            freq: Pandas period alias: "W" (week), "M" (month), "Q" or "Y"
+        """
+        dated = self.frame[self.frame["start_date"].notna()]
+        if dated.empty:
+            return {}
+        try:
+            periods = dated["start_date"].dt.to_period(freq)
+        except ValueError:
+            raise ValueError(f"Unsupported trend frequency '{freq}'")
+        grouped = dated.groupby(periods).agg(
+            count=("prize_amount", "size"),
+            total_prize=("prize_amount", "sum"),
+            registrations=("registrations", "sum"),
+            online=("is_online", "sum"),
+        )
+        return _rows(grouped)
+
+    def report(self, freq: str = "M", top: int = 10) -> Dict:
+        return {
+            **self.summary(),
+            "by_source": self.group("source"),
+            "by_state": self.group("state"),
+            "by_theme": self.group("theme", top=top),
+            "by_organization": self.group("organization", top=top),
+            "prize_percentiles": self.prize_percentiles(),
+            "registration_histogram": self.registration_histogram(),
+            "trends": self.trends(freq),
+        }
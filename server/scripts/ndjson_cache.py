@@ -0,0 +1,139 @@
+"""
+Newline-delimited JSON cache files shared by the scrapers.
+
+Layout: the first line is a header record, every following line is one
+event. The header is padded to a fixed width so its `count` can be filled in
+after the records have been streamed out:
+
+    {"format": "hacktrack-ndjson", "version": 1, "source": "mlh", "timestamp": ..., "count": 124}
+    {"url": "...", "title": "...", ...}
+    ...
+
+Writes go to a temp file in the same directory that is renamed over the
+target, so readers never see a half-written cache. Readers stream records
+through a generator instead of loading the whole file.
+"""
+import json
+import os
+import tempfile
+import time
+from typing import Dict, Iterable, Iterator, Optional
+
+FORMAT = "hacktrack-ndjson"
+VERSION = 1
+HEADER_WIDTH = 1024
+
+
+def _header_line(header: Dict) -> str:
+    # ASCII-only so the padded width is the same in characters and bytes
+    line = json.dumps(header)
+    if len(line) >= HEADER_WIDTH:
+        raise ValueError("Cache header too large")
+    return line.ljust(HEADER_WIDTH - 1) + "\n"
+
+
+class NdjsonWriter:
+    """
+    Stream records into a cache file atomically.
+
+        with NdjsonWriter(path, source="mlh") as writer:
+            for event in events:
+                writer.write(event)
+
+    The target is only replaced when the block exits without an exception
+    and discard() was not called.
+    """
+
+    def __init__(self, path: str, source: str, **header):
+        self.path = path
+        self.header = {"format": FORMAT, "version": VERSION, "source": source, **header}
+        self.count = 0
+        self.discarded = False
+        self._file = None
+        self._tmp_path = None
+
+    def __enter__(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, self._tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".ndjson", dir=directory)
+        self._file = os.fdopen(fd, "w", encoding="utf-8")
+        try:
+            self._file.write(_header_line({"timestamp": int(time.time()), **self.header, "count": None}))
+        except Exception:
+            # __exit__ doesn't run when __enter__ fails
+            self._file.close()
+            os.remove(self._tmp_path)
+            raise
+        return self
+
+    def write(self, record: Dict):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.count += 1
+
+    def write_many(self, records: Iterable[Dict]):
+        for record in records:
+            self.write(record)
+
+    def discard(self):
+        """Drop everything written so far and leave the existing file untouched."""
+        self.discarded = True
+
+    def __exit__(self, exc_type, exc, tb):
+        commit = exc_type is None and not self.discarded
+        try:
+            if commit:
+                # Fill in the final count in the fixed-width header slot
+                self._file.seek(0)
+                self._file.write(_header_line({"timestamp": int(time.time()), **self.header, "count": self.count}))
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            self._file.close()
+            if commit:
+                os.chmod(self._tmp_path, 0o644)
+                os.replace(self._tmp_path, self.path)
+        finally:
+            if os.path.exists(self._tmp_path):
+                os.remove(self._tmp_path)
+        return False
+
+
+def write_cache(path: str, records: Iterable[Dict], source: str, **header) -> int:
+    """Atomically write records (any iterable) to path. Returns the record count."""
+    with NdjsonWriter(path, source, **header) as writer:
+        writer.write_many(records)
+    return writer.count
+
+
+def append_records(path: str, records: Iterable[Dict]) -> int:
+    """Append records to an existing cache (the header count is not updated)."""
+    appended = 0
+    with open(path, "a", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            appended += 1
+    return appended
+
+
+def read_header(path: str) -> Optional[Dict]:
+    """Header of a cache file without reading its records (None if missing)."""
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        first = f.readline()
+    try:
+        header = json.loads(first)
+    except json.JSONDecodeError:
+        return None
+    return header if isinstance(header, dict) and header.get("format") == FORMAT else None
+
+
+def iter_records(path: str) -> Iterator[Dict]:
+    """Yield records one at a time, skipping the header and blank lines."""
+    with open(path, "r", encoding="utf-8") as f:
+        header = f.readline()
+        if not header.lstrip().startswith("{") or '"format"' not in header:
+            raise ValueError(f"{path} is not an NDJSON cache")
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
@@ -0,0 +1,235 @@
+"""
+Columnar snapshot format for event archives.
+
+A snapshot is a directory with one file per column:
+
+    manifest.json              format, count, column encodings, embedding info
+    <col>.codes.npy            int32 codes into <col>.dict.json   (strings)
+    <col>.offsets.npy          int64 row offsets into the codes   (string lists)
+    <col>.npy                  bool / int64 / float64 values        (scalars)
+    embeddings.npy             float32 (count, dim) vectors, row-aligned
+
+String columns are dictionary-encoded, so repeated values (sources,
+statuses, organizations, locations) are stored once. Every .npy file is
+opened with mmap_mode="r": reading a column or the embedding block maps the
+file instead of parsing it, and pandas/NumPy consumers can work on the
+mapped arrays directly. Snapshots are written to a temp directory and
+renamed into place.
+"""
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+FORMAT = "hacktrack-snapshot"
+VERSION = 1
+MANIFEST = "manifest.json"
+EMBEDDINGS = "embeddings.npy"
+
+
+def _encoding_for(values: List) -> str:
+    present = [v for v in values if v is not None]
+    if not present:
+        return "dict"
+    if all(isinstance(v, bool) for v in present):
+        return "bool"
+    if all(isinstance(v, int) and not isinstance(v, bool) for v in present) and len(present) == len(values):
+        return "int64"
+    if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+        return "float64"
+    if all(isinstance(v, str) for v in present):
+        return "dict"
+    if all(isinstance(v, list) and all(isinstance(x, str) for x in v) for v in present):
+        return "dict_list"
+    return "json"
+
+
+def _dictionary_encode(values: Iterable) -> Tuple[np.ndarray, List[str]]:
+    """Codes (-1 for None) and the dictionary, in first-seen order."""
+    lookup = {}
+    codes = []
+    for value in values:
+        if value is None:
+            codes.append(-1)
+            continue
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(lookup)
+        codes.append(code)
+    return np.asarray(codes, dtype=np.int32), list(lookup)
+
+
+def write_snapshot(directory: str, events: List[Dict], embeddings: Optional[np.ndarray] = None,
+                   **metadata) -> Dict:
+    """
+    Write events (and optional row-aligned embeddings) as a snapshot directory.
+
+    Args:
+        directory: Target directory (replaced atomically if it exists)
+        events: Flat event dicts; every key becomes a column
+        embeddings: Optional (len(events), dim) array, stored as float32
+        metadata: Extra manifest fields (sources, model name, ...)
+
+    Returns:
+        The manifest that was written
+    """
+    if embeddings is not None and len(embeddings) != len(events):
+        raise ValueError("embeddings must have one row per event")
+
+    parent = os.path.dirname(os.path.abspath(directory))
+    os.makedirs(parent, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(prefix=".tmp-snapshot-", dir=parent)
+    try:
+        names = list(dict.fromkeys(key for event in events for key in event))
+        columns = {}
+        for name in names:
+            values = [event.get(name) for event in events]
+            encoding = _encoding_for(values)
+            path = os.path.join(tmp_dir, name)
+
+            if encoding == "bool":
+                np.save(path + ".npy", np.asarray([bool(v) for v in values], dtype=np.bool_))
+            elif encoding == "int64":
+                np.save(path + ".npy", np.asarray(values, dtype=np.int64))
+            elif encoding == "float64":
+                np.save(path + ".npy", np.asarray([np.nan if v is None else v for v in values], dtype=np.float64))
+            elif encoding == "dict_list":
+                lengths = [len(v) if v else 0 for v in values]
+                offsets = np.zeros(len(values) + 1, dtype=np.int64)
+                np.cumsum(lengths, out=offsets[1:])
+                codes, dictionary = _dictionary_encode(x for v in values if v for x in v)
+                np.save(path + ".offsets.npy", offsets)
+                np.save(path + ".codes.npy", codes)
+                with open(path + ".dict.json", "w", encoding="utf-8") as f:
+                    json.dump(dictionary, f, ensure_ascii=False)
+            else:
+                if encoding == "json":
+                    values = [None if v is None else json.dumps(v, sort_keys=True) for v in values]
+                codes, dictionary = _dictionary_encode(values)
+                np.save(path + ".codes.npy", codes)
+                with open(path + ".dict.json", "w", encoding="utf-8") as f:
+                    json.dump(dictionary, f, ensure_ascii=False)
+            columns[name] = encoding
+
+        manifest = {
+            "format": FORMAT,
+            "version": VERSION,
+            "created": int(time.time()),
+            "count": len(events),
+            "columns": columns,
+            "embeddings": None,
+            **metadata,
+        }
+        if embeddings is not None:
+            embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+            np.save(os.path.join(tmp_dir, EMBEDDINGS), embeddings)
+            manifest["embeddings"] = {"dim": int(embeddings.shape[1]) if embeddings.ndim == 2 else 0,
+                                      "dtype": "float32"}
+
+        with open(os.path.join(tmp_dir, MANIFEST), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+
+        # Swap the finished snapshot into place
+        if os.path.isdir(directory):
+            old_dir = tempfile.mkdtemp(prefix=".old-snapshot-", dir=parent)
+            os.rmdir(old_dir)
+            os.replace(directory, old_dir)
+            os.replace(tmp_dir, directory)
+            shutil.rmtree(old_dir, ignore_errors=True)
+        else:
+            os.replace(tmp_dir, directory)
+        return manifest
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+class Snapshot:
+    """
+    Read-only view of a snapshot directory. Arrays are memory-mapped.
+
+        snap = Snapshot("data/snapshot")
+        snap.codes("source"), snap.dictionary("source")   # zero-copy column access
+        snap.embeddings                                    # (count, dim) float32 memmap
+        for batch in snap.iter_batches(500): ...
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, MANIFEST), "r", encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        if self.manifest.get("format") != FORMAT:
+            raise ValueError(f"{directory} is not a {FORMAT} directory")
+        self.columns = self.manifest["columns"]
+        self._dictionaries = {}
+
+    def __len__(self):
+        return self.manifest["count"]
+
+    def _load(self, name: str, suffix: str) -> np.ndarray:
+        path = os.path.join(self.directory, name + suffix)
+        try:
+            return np.load(path, mmap_mode="r")
+        except ValueError:
+            # Zero-length arrays cannot be mapped
+            return np.load(path)
+
+    def values(self, name: str) -> np.ndarray:
+        """Memory-mapped bool/int64/float64 column."""
+        return self._load(name, ".npy")
+
+    def codes(self, name: str) -> np.ndarray:
+        """Memory-mapped int32 dictionary codes of a string column (-1 = missing)."""
+        return self._load(name, ".codes.npy")
+
+    def offsets(self, name: str) -> np.ndarray:
+        return self._load(name, ".offsets.npy")
+
+    def dictionary(self, name: str) -> List[str]:
+        if name not in self._dictionaries:
+            with open(os.path.join(self.directory, name + ".dict.json"), "r", encoding="utf-8") as f:
+                self._dictionaries[name] = json.load(f)
+        return self._dictionaries[name]
+
+    @property
+    def embeddings(self) -> Optional[np.ndarray]:
+        if not self.manifest.get("embeddings"):
+            return None
+        return self._load("embeddings", ".npy")
+
+    def column(self, name: str, start: int = 0, stop: Optional[int] = None) -> List:
+        """Decoded Python values of one column for rows [start, stop)."""
+        encoding = self.columns[name]
+        stop = len(self) if stop is None else min(stop, len(self))
+        if encoding in ("bool", "int64", "float64"):
+            values = self.values(name)[start:stop].tolist()
+            if encoding == "float64":
+                values = [None if v != v else v for v in values]
+            return values
+
+        # Index -1 (missing) lands on the trailing None
+        dictionary = np.asarray(self.dictionary(name) + [None], dtype=object)
+        if encoding == "dict_list":
+            offsets = self.offsets(name)[start:stop + 1]
+            flat = dictionary[self.codes(name)[offsets[0]:offsets[-1]]].tolist()
+            base = offsets[0]
+            return [flat[lo - base:hi - base] for lo, hi in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+
+        values = dictionary[self.codes(name)[start:stop]].tolist()
+        if encoding == "json":
+            values = [None if v is None else json.loads(v) for v in values]
+        return values
+
+    def iter_batches(self, batch_size: int = 1000) -> Iterator[List[Dict]]:
+        """Yield events as lists of dicts, `batch_size` rows at a time."""
+        names = list(self.columns)
+        for start in range(0, len(self), batch_size):
+            stop = min(start + batch_size, len(self))
+            decoded = [self.column(name, start, stop) for name in names]
+            yield [dict(zip(names, row)) for row in zip(*decoded)]
+
+    def size_bytes(self) -> int:
+        return sum(os.path.getsize(os.path.join(self.directory, f)) for f in os.listdir(self.directory))
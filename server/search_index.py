@@ -0,0 +1,383 @@
+"""
+Hybrid keyword + semantic search over hackathons.
+
+BM25Index is an inverted index over title, description, organization and
+themes. SemanticIndex holds one L2-normalized MiniLM vector per event,
+computed by the embedding service (server/python/embedding_service.py) in a
+background thread so loading the API never waits on it. HybridSearch keeps
+both in step with the event store via `sync()` — only new or changed events
+are re-tokenized and re-embedded — and fuses their rankings per query.
+"""
+import base64
+import hashlib
+import math
+import os
+import re
+import threading
+from collections import Counter, OrderedDict, defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+import requests
+
+EMBEDDING_URL = os.getenv("EMBEDDING_API_URL")
+EMBED_TIMEOUT = float(os.getenv("SEARCH_EMBED_TIMEOUT", 5))
+EMBED_CHUNK = int(os.getenv("SEARCH_EMBED_CHUNK", 256))
+DEFAULT_ALPHA = float(os.getenv("SEARCH_ALPHA", 0.5))
+CANDIDATES = int(os.getenv("SEARCH_CANDIDATES", 200))
+RRF_K = 60
+
+# Title terms count double
+FIELD_WEIGHTS = (("title", 2), ("description", 1), ("organization", 1), ("themes", 1))
+
+STOPWORDS = {"a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it",
+             "of", "on", "or", "the", "to", "with"}
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in re.findall(r"[a-z0-9]+", (text or "").lower()) if t not in STOPWORDS]
+
+
+def event_text(event: Dict) -> str:
+    """Text embedded for an event: title, organization, themes and description."""
+    parts = [event.get("title"), event.get("organization"), ", ".join(event.get("themes") or []),
+             event.get("description")]
+    return ". ".join(p for p in parts if p)
+
+
+def event_terms(event: Dict) -> Counter:
+    terms = Counter()
+    for field, weight in FIELD_WEIGHTS:
+        value = event.get(field)
+        if isinstance(value, list):
+            value = " ".join(value)
+        for term in tokenize(value):
+            terms[term] += weight
+    return terms
+
+
+def embed_texts(texts: List[str]) -> np.ndarray:
+    """Embed texts through the embedding service's /embed_batch in base64 float32."""
+    rows = []
+    for start in range(0, len(texts), EMBED_CHUNK):
+        response = requests.post(f"{EMBEDDING_URL}/embed_batch", timeout=EMBED_TIMEOUT * 12, json={
+            "texts": texts[start:start + EMBED_CHUNK], "encoding": "base64",
+        })
+        response.raise_for_status()
+        payload = response.json()["embeddings"]
+        rows.append(np.frombuffer(base64.b64decode(payload["data"]), dtype="<f4").reshape(payload["shape"]))
+    return np.vstack(rows).astype(np.float32)
+
+
+class BM25Index:
+    """Inverted index with Okapi BM25 scoring; add/remove keep the corpus statistics current."""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings = defaultdict(dict)
+        self._lengths = {}
+        self._total_length = 0
+
+    def __len__(self):
+        return len(self._lengths)
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self._postings)
+
+    def add(self, doc_id: str, terms: Counter):
+        """Index a new document (remove the old version of a changed one first)."""
+        for term, tf in terms.items():
+            self._postings[term][doc_id] = tf
+        length = sum(terms.values())
+        self._lengths[doc_id] = length
+        self._total_length += length
+
+    def remove(self, doc_id: str, terms: Optional[Iterable[str]] = None):
+        """Remove a document; pass its terms to avoid scanning the whole vocabulary."""
+        length = self._lengths.pop(doc_id, None)
+        if length is None:
+            return
+        self._total_length -= length
+        for term in terms if terms is not None else list(self._postings):
+            postings = self._postings.get(term)
+            if postings and postings.pop(doc_id, None) is not None and not postings:
+                del self._postings[term]
+
+    def search(self, query: str, allow: Optional[Set[str]] = None) -> Dict[str, float]:
+        """BM25 score for every document containing at least one query term."""
+        n = len(self._lengths)
+        if not n:
+            return {}
+        avgdl = self._total_length / n
+        scores = defaultdict(float)
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf in postings.items():
+                if allow is not None and doc_id not in allow:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / avgdl)
+                scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+        return scores
+
+
+class SemanticIndex:
+    """Dense matrix of unit-length event vectors with swap-remove deletes."""
+
+    def __init__(self):
+        self._matrix = None
+        self._ids = []
+        self._rows = {}
+
+    def __len__(self):
+        return len(self._ids)
+
+    def upsert(self, ids: List[str], vectors: np.ndarray):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        vectors = vectors / norms
+        if self._matrix is None:
+            self._matrix = np.zeros((max(1024, len(ids)), vectors.shape[1]), dtype=np.float32)
+        needed = len(self._ids) + len(ids)
+        if needed > len(self._matrix):
+            grown = np.zeros((max(needed, 2 * len(self._matrix)), self._matrix.shape[1]), dtype=np.float32)
+            grown[:len(self._ids)] = self._matrix[:len(self._ids)]
+            self._matrix = grown
+        for doc_id, vector in zip(ids, vectors):
+            row = self._rows.get(doc_id)
+            if row is None:
+                row = len(self._ids)
+                self._ids.append(doc_id)
+                self._rows[doc_id] = row
+            self._matrix[row] = vector
+
+    def remove(self, doc_id: str):
+        row = self._rows.pop(doc_id, None)
+        if row is None:
+            return
+        last = len(self._ids) - 1
+        if row != last:
+            moved = self._ids[last]
+            self._matrix[row] = self._matrix[last]
+            self._ids[row] = moved
+            self._rows[moved] = row
+        self._ids.pop()
+
+    def search(self, query: np.ndarray, k: int, allow: Optional[Set[str]] = None) -> Dict[str, float]:
+        """Cosine scores of the k nearest events (restricted to `allow` when given)."""
+        if not self._ids:
+            return {}
+        query = np.asarray(query, dtype=np.float32)
+        query = query / (np.linalg.norm(query) or 1.0)
+        if allow is not None:
+            rows = np.fromiter((self._rows[i] for i in allow if i in self._rows), dtype=np.int64)
+            if not len(rows):
+                return {}
+            scores = self._matrix[rows] @ query
+        else:
+            rows = None
+            scores = self._matrix[:len(self._ids)] @ query
+        k = min(k, len(scores))
+        best = np.argpartition(-scores, k - 1)[:k]
+        positions = rows[best] if rows is not None else best
+        return {self._ids[p]: float(scores[i]) for p, i in zip(positions, best)}
+
+
+class HybridSearch:
+    """
+    BM25 + embedding search kept in sync with the event store.
+
+        search.sync(events)          # at load and on every refresh
+        search.search("climate ai", alpha=0.5)
+    """
+
+    def __init__(self, query_cache_size: int = 512):
+        self.bm25 = BM25Index()
+        self.semantic = SemanticIndex()
+        self._lock = threading.RLock()
+        self._terms = {}
+        self._hashes = {}
+        self._pending = OrderedDict()
+        self._embed_event = threading.Event()
+        self._embedder = None
+        self._query_cache = OrderedDict()
+        self._query_cache_size = query_cache_size
+        self._preloaded = None
+        self.embed_error = None
+        # Bumped whenever search results could change (documents or vectors)
+        self.version = 0
+
+    @property
+    def semantic_enabled(self) -> bool:
+        return bool(EMBEDDING_URL)
+
+    def preload_vectors(self, text_hashes: List[str], vectors: np.ndarray):
+        """
+        Offer stored embeddings (e.g. a backup snapshot's mapped block) to the
+        next sync(): events whose text hash matches reuse the vector instead of
+        being queued for the embedding service.
+        """
+        self._preloaded = ({digest: row for row, digest in enumerate(text_hashes)}, vectors)
+
+    def sync(self, events: Iterable[Dict]) -> Dict:
+        """Index new and changed events, drop missing ones. Returns what changed."""
+        added, changed = 0, 0
+        preloaded, self._preloaded = self._preloaded or ({}, None), None
+        reused_ids, reused_rows = [], []
+        with self._lock:
+            seen = set()
+            for event in events:
+                doc_id = event["id"]
+                seen.add(doc_id)
+                text = event_text(event)
+                digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+                if self._hashes.get(doc_id) == digest:
+                    continue
+                if doc_id in self._hashes:
+                    changed += 1
+                    self.bm25.remove(doc_id, self._terms[doc_id])
+                else:
+                    added += 1
+                terms = event_terms(event)
+                self.bm25.add(doc_id, terms)
+                self._terms[doc_id] = list(terms)
+                self._hashes[doc_id] = digest
+                if digest in preloaded[0]:
+                    reused_ids.append(doc_id)
+                    reused_rows.append(preloaded[0][digest])
+                    self._pending.pop(doc_id, None)
+                elif self.semantic_enabled:
+                    self._pending[doc_id] = text
+
+            removed = [doc_id for doc_id in self._hashes if doc_id not in seen]
+            for doc_id in removed:
+                self.bm25.remove(doc_id, self._terms.pop(doc_id))
+                self.semantic.remove(doc_id)
+                del self._hashes[doc_id]
+                self._pending.pop(doc_id, None)
+            if reused_ids:
+                self.semantic.upsert(reused_ids, np.asarray(preloaded[1][reused_rows], dtype=np.float32))
+            if added or changed or removed:
+                self.version += 1
+
+        if self._pending and self.semantic_enabled:
+            self._start_embedder()
+        return {"added": added, "changed": changed, "removed": len(removed)}
+
+    def _start_embedder(self):
+        self._embed_event.set()
+        if self._embedder is None or not self._embedder.is_alive():
+            self._embedder = threading.Thread(target=self._embed_loop, name="search-embedder", daemon=True)
+            self._embedder.start()
+
+    def _embed_loop(self):
+        while self._embed_event.wait(timeout=60):
+            self._embed_event.clear()
+            with self._lock:
+                batch = list(self._pending.items())[:EMBED_CHUNK]
+            if not batch:
+                continue
+            try:
+                vectors = embed_texts([text for _, text in batch])
+                self.embed_error = None
+            except Exception as e:
+                self.embed_error = str(e)
+                print(f"Event embedding failed, retrying later: {e}")
+                threading.Timer(30, self._embed_event.set).start()
+                continue
+            with self._lock:
+                # Skip events that changed or vanished while the batch was in flight
+                fresh = [(doc_id, vector) for (doc_id, text), vector in zip(batch, vectors)
+                         if self._pending.get(doc_id) == text]
+                if fresh:
+                    self.semantic.upsert([doc_id for doc_id, _ in fresh], np.stack([v for _, v in fresh]))
+                    self.version += 1
+                for doc_id, _ in fresh:
+                    del self._pending[doc_id]
+                if self._pending:
+                    self._embed_event.set()
+
+    def _embed_query(self, query: str) -> Optional[np.ndarray]:
+        key = " ".join(query.lower().split())
+        with self._lock:
+            if key in self._query_cache:
+                self._query_cache.move_to_end(key)
+                return self._query_cache[key]
+        try:
+            response = requests.post(f"{EMBEDDING_URL}/embed", json={"text": query}, timeout=EMBED_TIMEOUT)
+            response.raise_for_status()
+            vector = np.asarray(response.json()["embedding"], dtype=np.float32)
+        except Exception as e:
+            print(f"Query embedding failed, using keyword scores only: {e}")
+            return None
+        with self._lock:
+            self._query_cache[key] = vector
+            if len(self._query_cache) > self._query_cache_size:
+                self._query_cache.popitem(last=False)
+        return vector
+
+    def search(self, query: str, limit: int = 20, alpha: float = DEFAULT_ALPHA, mode: str = "linear",
+               allow: Optional[Set[str]] = None) -> Tuple[List[Tuple[str, float, float, float]], bool]:
+        """
+        Rank events for a free-text query.
+
+        Args:
+            query: Search text
+            limit: Number of results
+            alpha: Weight of the keyword ranking (1 = BM25 only, 0 = embeddings only)
+            mode: "linear" (weighted sum of max-normalized BM25 and cosine) or
+                  "rrf" (weighted reciprocal rank fusion)
+            allow: Optional set of event ids the results must come from
+
+        Returns:
+            ([(event id, fused score, bm25 score, cosine score)], whether embeddings were used)
+        """
+        if mode not in ("linear", "rrf"):
+            raise ValueError("mode must be 'linear' or 'rrf'")
+        alpha = min(max(alpha, 0.0), 1.0)
+
+        query_vector = self._embed_query(query) if self.semantic_enabled and alpha < 1 else None
+        with self._lock:
+            keyword = self.bm25.search(query, allow) if alpha > 0 or query_vector is None else {}
+            if len(keyword) > CANDIDATES:
+                keyword = dict(sorted(keyword.items(), key=lambda item: -item[1])[:CANDIDATES])
+            semantic = self.semantic.search(query_vector, CANDIDATES, allow) if query_vector is not None else {}
+
+        if query_vector is None:
+            alpha = 1.0
+        candidates = set(keyword) | set(semantic)
+        if mode == "rrf":
+            keyword_rank = {doc_id: r for r, doc_id in enumerate(sorted(keyword, key=keyword.get, reverse=True))}
+            semantic_rank = {doc_id: r for r, doc_id in enumerate(sorted(semantic, key=semantic.get, reverse=True))}
+            fused = {
+                doc_id: alpha * (1 / (RRF_K + keyword_rank[doc_id]) if doc_id in keyword_rank else 0)
+                + (1 - alpha) * (1 / (RRF_K + semantic_rank[doc_id]) if doc_id in semantic_rank else 0)
+                for doc_id in candidates
+            }
+        else:
+            top = max(keyword.values(), default=0) or 1.0
+            fused = {
+                doc_id: alpha * keyword.get(doc_id, 0) / top + (1 - alpha) * max(semantic.get(doc_id, 0), 0)
+                for doc_id in candidates
+            }
+
+        ranked = sorted(fused, key=fused.get, reverse=True)[:limit]
+        return [(doc_id, fused[doc_id], keyword.get(doc_id, 0.0), semantic.get(doc_id, 0.0))
+                for doc_id in ranked], query_vector is not None
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "documents": len(self.bm25),
+                "terms": self.bm25.vocabulary_size,
+                "embedded": len(self.semantic),
+                "pending_embeddings": len(self._pending),
+                "semantic_enabled": self.semantic_enabled,
+                "embed_error": self.embed_error,
+                "version": self.version,
+            }
@@ -1,5 +1,9 @@
 import User from "../models/User.js";
-import { getEmbedding } from "../utils/embeddingClient.js";
+import {
+  getEmbedding,
+  upsertProfileVectors,
+  deleteProfileVectors,
+} from "../utils/embeddingClient.js";
 
 export const getMyProfile = async (req, res) => {
   try {
@@ -132,6 +136,17 @@ export const updateMyProfile = async (req, res) => {
     }
 
     console.log(`✅ Profile updated successfully for: ${user.name}`);
+
+    // Keep the teammate search index in sync (best effort, never blocks the response)
+    if (embedding.length > 0) {
+      upsertProfileVectors([{ id: String(user._id), vector: embedding }]).catch((err) =>
+        console.warn(`⚠️ Search index upsert failed: ${err.message}`)
+      );
+    } else if (embeddingTextParts.length === 0) {
+      deleteProfileVectors([String(user._id)]).catch((err) =>
+        console.warn(`⚠️ Search index delete failed: ${err.message}`)
+      );
+    }
     
     res.json({ 
       success: true, 
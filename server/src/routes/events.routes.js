@@ -20,6 +20,7 @@ import { fetchClist } from "../services/clist.js";
 import { DevpostService } from "../services/devpost.service.js";
 import * as mlhService from "../services/mlhService.js";
 import { normalizeMLHEvent } from "../services/mlhService.js";
+import { recommendEvents } from "../utils/embeddingClient.js";
 
 const router = express.Router();
 
@@ -54,6 +55,29 @@ router.get('/test/mlh', async (req, res) => {
 router.get("/me/bookmarks", auth, myBookmarks);
 router.post("/:id/bookmark", auth, bookmark);
 
+// Upcoming hackathons ranked against the user's profile embedding
+// ?k=10&online=true|false&start_after=YYYY-MM-DD&start_before=YYYY-MM-DD
+router.get("/recommended", auth, async (req, res) => {
+  try {
+    const vector = req.user.profileEmbedding;
+    if (!vector?.length) {
+      return res.status(400).json({ success: false, message: "Complete your profile to get recommendations" });
+    }
+
+    const { k, online, start_after, start_before } = req.query;
+    const ranked = await recommendEvents(String(req.user._id), vector, {
+      k: k ? Number(k) : 10,
+      ...(online !== undefined && { online: online === "true" }),
+      ...(start_after && { start_after }),
+      ...(start_before && { start_before }),
+    });
+    res.json({ success: true, events: ranked.results });
+  } catch (error) {
+    console.error("Recommendation error:", error.message);
+    res.status(502).json({ success: false, message: "Recommendations unavailable" });
+  }
+});
+
 // Debug and test routes
 router.get('/test/devpost', async (req, res) => {
   try {
@@ -1,7 +1,12 @@
 import express from "express";
 import auth from "../middleware/auth.js";
 import User from "../models/User.js";
-import { getEmbedding, getSimilarity } from "../utils/embeddingClient.js";
+import {
+  getEmbedding,
+  getSimilarityMatrix,
+  searchProfiles,
+  upsertProfileVectors,
+} from "../utils/embeddingClient.js";
 
 const router = express.Router();
 
@@ -15,6 +20,37 @@ function cosine(a, b) {
   return dot / (magA * magB);
 }
 
+const TEAMMATE_FIELDS =
+  "name email bio skills interests college location graduationYear domainInterest preferredRoles";
+
+/* --------------------------------------------------------
+   Helper: rank candidates with the embedding service index
+   (one matrix-vector product instead of a JS loop over
+   every profile embedding)
+-------------------------------------------------------- */
+async function rankWithSearchService(queryEmb, candidateIds, k) {
+  let ranked = await searchProfiles(queryEmb, candidateIds, k);
+
+  // Index is in-memory on the service: backfill profiles it has not seen yet
+  if (ranked.missing?.length) {
+    const missingUsers = await User.find(
+      { _id: { $in: ranked.missing } },
+      "profileEmbedding"
+    ).lean();
+    await upsertProfileVectors(
+      missingUsers.map((u) => ({ id: String(u._id), vector: u.profileEmbedding }))
+    );
+    ranked = await searchProfiles(queryEmb, candidateIds, k);
+  }
+
+  const scores = new Map(ranked.results.map((r) => [r.id, r.score]));
+  const users = await User.find({ _id: { $in: [...scores.keys()] } }, TEAMMATE_FIELDS).lean();
+
+  return users
+    .map((user) => ({ ...user, similarity: scores.get(String(user._id)) }))
+    .sort((a, b) => b.similarity - a.similarity);
+}
+
 /* -------------------------------------------
    🔍 1. Search Teammates by Keyword + Filters
 ------------------------------------------- */
@@ -88,14 +124,11 @@ router.post("/find", auth, async (req, res) => {
       }
     }
 
-    // Fetch users with embeddings and apply filters
-    const users = await User.find(
-      userQuery,
-      "name email bio skills interests college location graduationYear domainInterest preferredRoles profileEmbedding"
-    ).lean();
+    // Fetch only the ids of users matching the filters
+    const candidates = await User.find(userQuery, "_id").lean();
 
     // If no users found with filters, return empty results
-    if (users.length === 0) {
+    if (candidates.length === 0) {
       return res.json({ 
         success: true, 
         results: [],
@@ -103,28 +136,40 @@ router.post("/find", auth, async (req, res) => {
       });
     }
 
-    // Compute similarity scores
-    const results = users.map((user) => {
-      const similarity = cosine(queryEmb, user.profileEmbedding);
-      return {
-        ...user,
-        similarity: similarity,
-        // Remove embedding from response to reduce payload size
-        profileEmbedding: undefined
-      };
-    });
-
-    // Sort by similarity score (descending)
-    results.sort((a, b) => b.similarity - a.similarity);
+    let topResults;
+    try {
+      // Return top 15 results (increased from 10 for better filtering)
+      topResults = await rankWithSearchService(
+        queryEmb,
+        candidates.map((u) => String(u._id)),
+        15
+      );
+    } catch (searchErr) {
+      console.warn("Search service unavailable → ranking locally:", searchErr.message);
+
+      const users = await User.find(userQuery, `${TEAMMATE_FIELDS} profileEmbedding`).lean();
+
+      // Compute similarity scores
+      const results = users.map((user) => {
+        const similarity = cosine(queryEmb, user.profileEmbedding);
+        return {
+          ...user,
+          similarity: similarity,
+          // Remove embedding from response to reduce payload size
+          profileEmbedding: undefined
+        };
+      });
 
-    // Return top 15 results (increased from 10 for better filtering)
-    const topResults = results.slice(0, 15);
+      // Sort by similarity score (descending)
+      results.sort((a, b) => b.similarity - a.similarity);
+      topResults = results.slice(0, 15);
+    }
 
     res.json({ 
       success: true, 
       results: topResults,
       count: topResults.length,
-      totalMatches: results.length
+      totalMatches: candidates.length
     });
 
   } catch (err) {
@@ -234,15 +279,18 @@ router.post("/recommend", auth, async (req, res) => {
 
     console.log(`🎯 Computing recommendations from ${users.length} potential matches...`);
 
+    // Profile similarity against every candidate in one request
+    const [similarities] = await getSimilarityMatrix(
+      currentUser.profileEmbedding,
+      users.map((user) => user.profileEmbedding)
+    );
+
     // Compute scores for each user
     const results = await Promise.all(
-      users.map(async (user) => {
+      users.map(async (user, i) => {
         try {
           // 1. Profile similarity (40% weight)
-          const profileSimilarity = await getSimilarity(
-            currentUser.profileEmbedding, 
-            user.profileEmbedding
-          );
+          const profileSimilarity = similarities[i];
 
           // 2. Skills complementarity (30% weight)
           const userSkills = new Set(user.skills || []);
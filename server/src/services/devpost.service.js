@@ -10,6 +10,7 @@ const __dirname = dirname(__filename);
 const CACHE_FILE = path.resolve(__dirname, "../../data/devpost_hackathons_cache.json");
 const CACHE_EXPIRY = 6 * 60 * 60 * 1000; // 6 hours
 let backgroundRefreshRunning = false;
+let coldScrapeInFlight = null;
 
 export class DevpostService {
   constructor() {
@@ -298,18 +299,14 @@ export async function fetchDevpostEvents() {
       }
     }
 
-    console.log("📂 No valid Devpost cache found — scraping fresh data...");
-    const events = await service.scrapeAllHackathons(3);
-    
-    if (events.length === 0) {
-      console.warn("⚠️ No events scraped from Devpost - API may be blocked");
-      // Test API connectivity
-      const apiTest = await service.testAPI();
-      console.log("🔍 API Test Result:", apiTest);
+    // Concurrent callers with no usable cache share one scrape
+    if (!coldScrapeInFlight) {
+      console.log("📂 No valid Devpost cache found — scraping fresh data...");
+      coldScrapeInFlight = scrapeAndCache(service).finally(() => {
+        coldScrapeInFlight = null;
+      });
     }
-    
-    saveCache(events);
-    return events;
+    return await coldScrapeInFlight;
   } catch (err) {
     console.error("❌ Error in fetchDevpostEvents:", err.message);
     
@@ -330,6 +327,20 @@ export async function fetchDevpostEvents() {
   }
 }
 
+async function scrapeAndCache(service) {
+  const events = await service.scrapeAllHackathons(3);
+
+  if (events.length === 0) {
+    console.warn("⚠️ No events scraped from Devpost - API may be blocked");
+    // Test API connectivity
+    const apiTest = await service.testAPI();
+    console.log("🔍 API Test Result:", apiTest);
+  }
+
+  saveCache(events);
+  return events;
+}
+
 /* 🧠 Background Cache Refresh */
 async function refreshDevpostCacheInBackground(serviceInstance) {
   if (backgroundRefreshRunning) {
@@ -365,11 +376,10 @@ function saveCache(events) {
       events: events
     };
     
-    fs.writeFileSync(
-      CACHE_FILE,
-      JSON.stringify(cacheData, null, 2),
-      "utf-8"
-    );
+    // Write to a temp file and rename so readers never see a partial cache
+    const tmpFile = `${CACHE_FILE}.${process.pid}.tmp`;
+    fs.writeFileSync(tmpFile, JSON.stringify(cacheData, null, 2), "utf-8");
+    fs.renameSync(tmpFile, CACHE_FILE);
     console.log(`💾 Devpost cache saved (${events.length} events)`);
     
     // Verify the cache was written correctly
@@ -1,7 +1,8 @@
 import fs from "fs";
 import path from "path";
 import os from "os";
-import { exec } from "child_process";
+import readline from "readline";
+import { spawn } from "child_process";
 import { fileURLToPath } from "url";
 import { dirname, join } from "path";
 
@@ -10,9 +11,66 @@ const __filename = fileURLToPath(import.meta.url);
 const __dirname = dirname(__filename);
 
 // ✅ Properly resolve absolute paths (cross-platform safe)
-const CACHE_FILE = path.resolve(__dirname, "../../data/mlh_hackathons_cache.json");
+const CACHE_FILE = path.resolve(__dirname, "../../data/mlh_hackathons_cache.ndjson");
 const PYTHON_SCRIPT = join(__dirname, "mlh_scraper.py");
 const CACHE_EXPIRY = 6 * 60 * 60 * 1000; // 6 hours
+const PYTHON_BIN = process.env.PYTHON_BIN || "python";
+// Seasons scraped concurrently on each refresh, e.g. "2026,2025"
+const MLH_SEASONS = (process.env.MLH_SEASONS || "2026").split(",").map((s) => s.trim()).filter(Boolean);
+const SCRAPE_TIMEOUT = 5 * 60 * 1000;
+// The NDJSON cache header is padded to this many bytes (see scripts/ndjson_cache.py)
+const CACHE_HEADER_BYTES = 1024;
+
+/**
+ * Read only the header line of the NDJSON cache (timestamp, count, ...).
+ */
+function readCacheHeader() {
+  const fd = fs.openSync(CACHE_FILE, "r");
+  try {
+    const buffer = Buffer.alloc(CACHE_HEADER_BYTES);
+    const bytes = fs.readSync(fd, buffer, 0, CACHE_HEADER_BYTES, 0);
+    const line = buffer.toString("utf-8", 0, bytes).split("\n", 1)[0];
+    return JSON.parse(line);
+  } finally {
+    fs.closeSync(fd);
+  }
+}
+
+/**
+ * Stream events out of the NDJSON cache one line at a time.
+ */
+async function readCacheEvents() {
+  const events = [];
+  const lines = readline.createInterface({
+    input: fs.createReadStream(CACHE_FILE, { encoding: "utf-8" }),
+    crlfDelay: Infinity,
+  });
+
+  let isHeader = true;
+  for await (const line of lines) {
+    if (isHeader) {
+      isHeader = false;
+      continue;
+    }
+    if (line.trim()) events.push(JSON.parse(line));
+  }
+  return events;
+}
+
+let refreshInFlight = null;
+
+/**
+ * Refresh the MLH cache. Callers arriving while a refresh is running share
+ * it instead of each starting their own scrape.
+ */
+function refreshMLHCache() {
+  if (!refreshInFlight) {
+    refreshInFlight = runPythonScraper().finally(() => {
+      refreshInFlight = null;
+    });
+  }
+  return refreshInFlight;
+}
 
 /**
  * Fetch MLH hackathons, using cache if fresh.
@@ -21,25 +79,25 @@ export async function fetchMLHEvents() {
   try {
     // Check if cached data exists
     if (fs.existsSync(CACHE_FILE)) {
-      const data = JSON.parse(fs.readFileSync(CACHE_FILE, "utf-8"));
-      const age = Date.now() - data.timestamp * 1000;
+      const header = readCacheHeader();
+      const age = Date.now() - header.timestamp * 1000;
 
       if (age < CACHE_EXPIRY) {
         console.log(`Using cached MLH data (${(age / 3600000).toFixed(1)} hours old)`);
-        return data.events || [];
+        return await readCacheEvents();
       }
 
-      console.log("MLH cache expired — refreshing data...");
-    } else {
-      console.log("No MLH cache found — running scraper for fresh data...");
+      // Serve the stale cache while a single shared refresh runs
+      console.log("MLH cache expired — serving stale data and refreshing in background...");
+      refreshMLHCache().catch((err) => console.error("Background MLH refresh failed:", err.message));
+      return await readCacheEvents();
     }
 
-    // Run the Python scraper
-    await runPythonScraper();
+    console.log("No MLH cache found — running scraper for fresh data...");
+    await refreshMLHCache();
 
     // Reload updated cache
-    const freshData = JSON.parse(fs.readFileSync(CACHE_FILE, "utf-8"));
-    return freshData.events || [];
+    return await readCacheEvents();
   } catch (err) {
     console.error("Error loading MLH cache:", err.message);
     return [];
@@ -55,16 +113,16 @@ export function getMLHCacheMetadata() {
       return { exists: false, lastUpdated: null, ageHours: null };
     }
 
-    const data = JSON.parse(fs.readFileSync(CACHE_FILE, "utf-8"));
-    const lastUpdated = new Date(data.timestamp * 1000);
-    const ageMs = Date.now() - data.timestamp * 1000;
+    const header = readCacheHeader();
+    const lastUpdated = new Date(header.timestamp * 1000);
+    const ageMs = Date.now() - header.timestamp * 1000;
     const ageHours = (ageMs / 3600000).toFixed(2);
 
     return {
       exists: true,
       lastUpdated,
       ageHours,
-      eventsCount: data.count || (data.events?.length || 0),
+      eventsCount: header.count || 0,
     };
   } catch (err) {
     console.error("Failed to read MLH cache metadata:", err.message);
@@ -100,24 +158,89 @@ export function normalizeMLHEvent(event) {
   };
 }
 
+/* -------------------------------------------------------------
+   Persistent Python scraper worker
+
+   The scraper runs as one long-lived `mlh_scraper.py --worker`
+   process so refreshes don't pay interpreter startup, imports and
+   a new Cloudflare handshake each time. Requests go in as JSON
+   lines on stdin; events stream back as NDJSON on stdout.
+------------------------------------------------------------- */
+let worker = null;
+let nextRequestId = 1;
+const pendingRequests = new Map();
+
+function getWorker() {
+  if (worker) return worker;
+
+  console.log("Starting MLH Python scraper worker...");
+  const child = spawn(PYTHON_BIN, [PYTHON_SCRIPT, "--worker"], {
+    stdio: ["pipe", "pipe", "pipe"],
+  });
+
+  readline.createInterface({ input: child.stdout }).on("line", (line) => {
+    let message;
+    try {
+      message = JSON.parse(line);
+    } catch {
+      return console.warn("MLH worker sent a non-JSON line:", line);
+    }
+
+    const request = pendingRequests.get(message.id);
+    if (!request) {
+      if (message.type === "error") console.error("MLH worker error:", message.error);
+      return;
+    }
+
+    if (message.type === "event") {
+      request.events.push(message.event);
+    } else if (message.type === "done") {
+      pendingRequests.delete(message.id);
+      clearTimeout(request.timer);
+      message.errors?.forEach((e) => console.warn(`MLH scrape failed for ${e.url}: ${e.error}`));
+      console.log(`MLH worker scraped ${message.count} events in ${message.seconds}s`);
+      if (message.cached === false) {
+        // The worker kept the previous cache; don't report a partial scrape as fresh
+        request.reject(new Error(`MLH scrape incomplete (${message.errors?.length || 0} season(s) failed)`));
+      } else {
+        request.resolve(request.events);
+      }
+    }
+  });
+
+  readline.createInterface({ input: child.stderr }).on("line", (line) => console.log(`[mlh-scraper] ${line}`));
+
+  const fail = (err) => {
+    console.error("MLH scraper worker stopped:", err.message);
+    worker = null;
+    for (const [id, request] of pendingRequests) {
+      clearTimeout(request.timer);
+      request.reject(err);
+      pendingRequests.delete(id);
+    }
+  };
+  child.on("error", fail);
+  child.on("exit", (code) => fail(new Error(`worker exited with code ${code}`)));
+
+  worker = child;
+  return worker;
+}
+
 /**
- * Run the Python MLH scraper script to refresh cache.
+ * Ask the scraper worker to refresh the cache for the configured seasons.
+ * Resolves with the scraped events once the worker has written the cache.
  */
-function runPythonScraper() {
+function runPythonScraper(seasons = MLH_SEASONS) {
   return new Promise((resolve, reject) => {
-    console.log("Running MLH Python scraper...");
-
-    // Execute the Python script
-    exec(`python "${PYTHON_SCRIPT}"`, { encoding: "utf-8" }, (error, stdout, stderr) => {
-      if (error) {
-        console.error("Python scraper error:", error.message);
-        console.error(stderr);
-        return reject(error);
-      }
+    const child = getWorker();
+    const id = nextRequestId++;
 
-      console.log("Python scraper output:");
-      console.log(stdout);
-      resolve(stdout);
-    });
+    const timer = setTimeout(() => {
+      pendingRequests.delete(id);
+      reject(new Error("MLH scraper timed out"));
+    }, SCRAPE_TIMEOUT);
+
+    pendingRequests.set(id, { events: [], resolve, reject, timer });
+    child.stdin.write(JSON.stringify({ id, seasons }) + "\n");
   });
 }
@@ -0,0 +1,112 @@
+"""
+Compare MLH parser backends on the saved season fixture.
+
+    python mlh_parser_bench.py [--runs 5] [--repeat 1]
+
+Each backend runs in its own subprocess so peak memory is not polluted by
+the others. Output is checked against the html.parser result and the
+events stored in data/mlh_hackathons_cache.ndjson before anything is timed.
+"""
+import argparse
+import json
+import os
+import re
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from mlh_scraper import MLHHackathonScraper, PARSER_BACKENDS, iter_records
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data")
+FIXTURE = os.path.join(DATA_DIR, "fixtures", "mlh_events_2026.html")
+EXPECTED = os.path.join(DATA_DIR, "mlh_hackathons_cache.ndjson")
+
+
+def load_fixture(repeat: int = 1) -> str:
+    """Fixture HTML, optionally with its event list repeated to mimic bigger pages."""
+    with open(FIXTURE, "r", encoding="utf-8") as f:
+        html = f.read()
+    if repeat <= 1:
+        return html
+    match = re.search(r'(<div class="row">\n)(.*)(\n    </div>\n  </div>\n  <footer)', html, re.S)
+    return html[:match.start(2)] + match.group(2) * repeat + html[match.end(2):]
+
+
+def run_backend(backend: str, runs: int, repeat: int) -> dict:
+    """Time one backend in this process (called in the child)."""
+    html = load_fixture(repeat)
+    scraper = MLHHackathonScraper(parser=backend)
+
+    tracemalloc.start()
+    events = scraper.parse_events(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        scraper.parse_events(html)
+        timings.append(time.perf_counter() - started)
+
+    return {
+        "backend": backend,
+        "events": len(events),
+        "best_ms": round(min(timings) * 1000, 2),
+        "mean_ms": round(sum(timings) / len(timings) * 1000, 2),
+        "python_peak_kb": round(peak / 1024, 1),
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def check_parity(backends) -> list:
+    """Backends whose output matches html.parser and the stored cache exactly."""
+    html = load_fixture()
+    expected = list(iter_records(EXPECTED))
+
+    reference = MLHHackathonScraper(parser="html.parser").parse_events(html)
+    if reference != expected:
+        raise SystemExit("html.parser output does not match the stored cache events")
+
+    usable = []
+    for backend in backends:
+        try:
+            output = MLHHackathonScraper(parser=backend).parse_events(html)
+        except ImportError as e:
+            print(f"  {backend:<12} skipped ({e.name or e} not installed)")
+            continue
+        if output != reference:
+            raise SystemExit(f"{backend} output differs from html.parser")
+        usable.append(backend)
+    return usable
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=1, help="Repeat the fixture events N times")
+    parser.add_argument("--backend", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.backend:
+        print(json.dumps(run_backend(args.backend, args.runs, args.repeat)))
+        return
+
+    print("Checking output parity on the fixture...")
+    backends = check_parity(PARSER_BACKENDS)
+
+    print(f"\n{'backend':<12} {'events':>7} {'best ms':>9} {'mean ms':>9} {'py peak KB':>11} {'max RSS MB':>11}")
+    for backend in backends:
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--backend", backend,
+             "--runs", str(args.runs), "--repeat", str(args.repeat)],
+            capture_output=True, text=True, check=True,
+        )
+        r = json.loads(out.stdout.strip().splitlines()[-1])
+        print(f"{r['backend']:<12} {r['events']:>7} {r['best_ms']:>9} {r['mean_ms']:>9} "
+              f"{r['python_peak_kb']:>11} {r['max_rss_mb']:>11}")
+
+
+if __name__ == "__main__":
+    main()
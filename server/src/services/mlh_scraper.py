@@ -1,32 +1,90 @@
 import json
 import os
+import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import redirect_stdout
 from datetime import datetime
 from typing import List, Dict
-from bs4 import BeautifulSoup
-import cloudscraper
+from bs4 import BeautifulSoup, SoupStrainer
 
-# Cache file path and expiry (6 hours)
-CACHE_FILE = r"C:\Users\sharm\OneDrive\Desktop\hacktrack_project\server\data\mlh_hackathons_cache.json"
+SERVER_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+sys.path[:0] = [os.path.join(SERVER_DIR, "scripts"), os.path.join(SERVER_DIR, "python")]
+
+from instrumentation import timed  # noqa: E402
+from ndjson_cache import NdjsonWriter, iter_records, read_header, write_cache  # noqa: E402
+
+# Cache file path (server/data, same file mlhService.js reads) and expiry (6 hours)
+CACHE_FILE = os.getenv("MLH_CACHE_FILE") or os.path.join(SERVER_DIR, "data", "mlh_hackathons_cache.ndjson")
 CACHE_EXPIRY = 6 * 60 * 60  # 6 hours in seconds
 
+SEASON_URL = "https://mlh.io/seasons/{season}/events"
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/123.0.0.0 Safari/537.36"
+)
+
+# HTML parsing backends, all producing identical event dicts:
+#   html.parser - BeautifulSoup with the pure-Python parser (always available)
+#   lxml        - BeautifulSoup with the C lxml parser
+#   strainer    - BeautifulSoup that only builds div.event subtrees (lxml if installed)
+#   selectolax  - selectolax/lexbor CSS selectors, no BeautifulSoup tree at all
+#   auto        - fastest one installed
+PARSER_BACKENDS = ("html.parser", "lxml", "strainer", "selectolax")
+DEFAULT_PARSER = os.getenv("MLH_PARSER", "auto")
+
+
+def _installed(module: str) -> bool:
+    try:
+        __import__(module)
+        return True
+    except ImportError:
+        return False
+
+
+def _has_lxml() -> bool:
+    return _installed("lxml")
+
+
+def resolve_parser(parser: str) -> str:
+    if parser != "auto":
+        return parser
+    if _installed("selectolax"):
+        return "selectolax"
+    return "strainer"
+
+
+def _node_text(node) -> str:
+    """selectolax equivalent of BeautifulSoup's get_text(strip=True)."""
+    return node.text(deep=True, separator="", strip=True)
+
+
+def create_session():
+    """New Cloudflare-capable session (cloudscraper is imported only when needed)."""
+    import cloudscraper
+
+    return cloudscraper.create_scraper()
+
 
 class MLHHackathonScraper:
-    def __init__(self, url: str = "https://mlh.io/seasons/2026/events"):
+    def __init__(self, url: str = "https://mlh.io/seasons/2026/events", parser: str = DEFAULT_PARSER,
+                 session=None):
+        parser = resolve_parser(parser)
+        if parser not in PARSER_BACKENDS:
+            raise ValueError(f"Unknown parser '{parser}', expected one of {', '.join(PARSER_BACKENDS)}")
         self.url = url
+        self.parser = parser
+        self.session = session
         self.hackathons = []
 
+    @timed("mlh.fetch_page")
     def fetch_page(self) -> str:
         """Fetch the HTML content from MLH using Cloudflare-safe scraper."""
         try:
-            headers = {
-                "User-Agent": (
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/123.0.0.0 Safari/537.36"
-                )
-            }
-            scraper = cloudscraper.create_scraper()
+            headers = {"User-Agent": USER_AGENT}
+            scraper = self.session or create_session()
             response = scraper.get(self.url, headers=headers)
             response.raise_for_status()
             return response.text
@@ -71,6 +129,59 @@ class MLHHackathonScraper:
 
         return hackathon
 
+    def parse_hackathon_selectolax(self, node) -> Dict:
+        """selectolax counterpart of parse_hackathon; must return the same dict."""
+        hackathon = {}
+        try:
+            link = node.css_first("a.event-link")
+            hackathon["url"] = link.attributes.get("href") or "" if link else ""
+            hackathon["title"] = link.attributes.get("title") or "" if link else ""
+
+            name_elem = node.css_first("h3.event-name")
+            hackathon["name"] = _node_text(name_elem) if name_elem else ""
+
+            date_elem = node.css_first("p.event-date")
+            hackathon["dates"] = _node_text(date_elem) if date_elem else ""
+
+            start_date = node.css_first('meta[itemprop="startDate"]')
+            end_date = node.css_first('meta[itemprop="endDate"]')
+            hackathon["start_date"] = start_date.attributes.get("content") or "" if start_date else ""
+            hackathon["end_date"] = end_date.attributes.get("content") or "" if end_date else ""
+
+            location_div = node.css_first("div.event-location")
+            if location_div:
+                city = location_div.css_first('span[itemprop="city"]')
+                state = location_div.css_first('span[itemprop="state"]')
+                hackathon["city"] = _node_text(city) if city else ""
+                hackathon["state"] = _node_text(state) if state else ""
+                hackathon["location"] = f"{hackathon['city']}, {hackathon['state']}".strip(", ")
+
+            img_tag = node.css_first("div.image-wrap")
+            if img_tag:
+                img = img_tag.css_first("img")
+                hackathon["image"] = img.attributes.get("src") or "" if img else ""
+
+        except Exception as e:
+            print(f"Error parsing hackathon: {e}")
+
+        return hackathon
+
+    @timed("mlh.parse")
+    def parse_events(self, html: str) -> List[Dict]:
+        """Parse every div.event in a season page with the configured backend."""
+        if self.parser == "selectolax":
+            from selectolax.lexbor import LexborHTMLParser
+
+            return [self.parse_hackathon_selectolax(node) for node in LexborHTMLParser(html).css("div.event")]
+
+        if self.parser == "strainer":
+            features = "lxml" if _has_lxml() else "html.parser"
+            soup = BeautifulSoup(html, features, parse_only=SoupStrainer("div", class_="event"))
+        else:
+            soup = BeautifulSoup(html, self.parser)
+
+        return [self.parse_hackathon(div) for div in soup.find_all("div", class_="event")]
+
     def scrape(self) -> List[Dict]:
         """Scrape all MLH hackathons from the website."""
         html = self.fetch_page()
@@ -78,56 +189,153 @@ class MLHHackathonScraper:
             print("Failed to fetch HTML content.")
             return []
 
-        soup = BeautifulSoup(html, "html.parser")
-        events = soup.find_all("div", class_="event")
+        events = self.parse_events(html)
         print(f"Found {len(events)} hackathons.")
 
-        for div in events:
-            data = self.parse_hackathon(div)
+        for data in events:
             if data:
                 self.hackathons.append(data)
 
         return self.hackathons
 
     def save_cache(self):
-        """Save results to cache file."""
-        data = {
-            "timestamp": int(time.time()),
-            "count": len(self.hackathons),
-            "events": self.hackathons,
-        }
-        os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
-        with open(CACHE_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        print(f"Cache updated at {CACHE_FILE}")
+        """Atomically save results to the NDJSON cache file."""
+        count = write_cache(CACHE_FILE, self.hackathons, source="mlh", url=self.url)
+        print(f"Cache updated at {CACHE_FILE} ({count} events)")
+
+    def cached_header(self) -> Dict:
+        """Cache header if the cache exists and is still valid, else None."""
+        header = read_header(CACHE_FILE)
+        if header is None:
+            print("No cache found. Scraping fresh data...")
+            return None
+
+        age = time.time() - header.get("timestamp", 0)
+        if age >= CACHE_EXPIRY:
+            print("Cache expired. Re-scraping new data...")
+            return None
+
+        print(f"Using cached MLH data ({round(age / 3600, 1)} hours old).")
+        return header
+
+    def iter_cache(self):
+        """Stream cached events one at a time."""
+        return iter_records(CACHE_FILE)
 
     def load_cache(self) -> List[Dict]:
         """Load cached events if available and still valid."""
-        if os.path.exists(CACHE_FILE):
-            with open(CACHE_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                age = time.time() - data.get("timestamp", 0)
-                if age < CACHE_EXPIRY:
-                    print(f"Using cached MLH data ({round(age / 3600, 1)} hours old).")
-                    self.hackathons = data.get("events", [])
-                    return self.hackathons
-                else:
-                    print("Cache expired. Re-scraping new data...")
-        else:
-            print("No cache found. Scraping fresh data...")
+        if self.cached_header() is None:
+            return None
+        self.hackathons = list(self.iter_cache())
+        return self.hackathons
+
 
-        return None
+class ScraperWorker:
+    """
+    Long-lived scraper process driven over stdin/stdout.
+
+    Started once by mlhService.js with `--worker`, it keeps the interpreter,
+    imports and one cloudscraper session per thread warm between refreshes.
+    Each stdin line is a JSON request {"id": ..., "seasons": [...]} (or
+    "urls"); the reply is newline-delimited JSON on stdout:
+
+        {"id": ..., "type": "event", "url": ..., "event": {...}}   per event
+        {"id": ..., "type": "season", "url": ..., "count": N}     per season
+        {"id": ..., "type": "done", "count": N, "errors": [...], "seconds": ...}
+
+    Seasons are scraped concurrently and the combined events are written to
+    the cache file before "done" is sent, unless a season failed, in which
+    case the previous cache is kept ("cached": false). Log output goes to
+    stderr.
+    """
+
+    def __init__(self, concurrency: int = 4, out=None):
+        self.out = out or sys.stdout
+        self.executor = ThreadPoolExecutor(max_workers=concurrency)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = create_session()
+        return session
+
+    def _emit(self, message: Dict):
+        line = json.dumps(message, ensure_ascii=False)
+        with self._write_lock:
+            self.out.write(line + "\n")
+            self.out.flush()
+
+    def _scrape_url(self, url: str) -> List[Dict]:
+        scraper = MLHHackathonScraper(url=url, session=self._session())
+        html = scraper.fetch_page()
+        if not html:
+            raise RuntimeError(f"Failed to fetch {url}")
+        return [event for event in scraper.parse_events(html) if event]
+
+    def handle(self, request: Dict):
+        request_id = request.get("id")
+        urls = request.get("urls") or [SEASON_URL.format(season=s) for s in request.get("seasons", [2026])]
+        started = time.perf_counter()
+        errors = []
+
+        futures = {self.executor.submit(self._scrape_url, url): url for url in urls}
+        # Each season is streamed out and into the cache as soon as it finishes
+        with NdjsonWriter(CACHE_FILE, source="mlh", urls=urls) as writer:
+            for future in as_completed(futures):
+                url = futures[future]
+                try:
+                    season_events = future.result()
+                except Exception as e:
+                    errors.append({"url": url, "error": str(e)})
+                    continue
+                for event in season_events:
+                    self._emit({"id": request_id, "type": "event", "url": url, "event": event})
+                writer.write_many(season_events)
+                self._emit({"id": request_id, "type": "season", "url": url, "count": len(season_events)})
+
+            # A failed season would otherwise drop that season's events from the
+            # cache: keep the previous cache whole until every season succeeds
+            cached = bool(writer.count) and not errors
+            if cached:
+                print(f"Cache updated at {CACHE_FILE} ({writer.count} events)")
+            else:
+                print(f"Keeping the previous cache ({len(errors)} of {len(urls)} seasons failed)")
+                writer.discard()
+
+        self._emit({"id": request_id, "type": "done", "count": writer.count, "cached": cached,
+                    "errors": errors, "seconds": round(time.perf_counter() - started, 3)})
+
+    def serve(self, stdin=None):
+        print("MLH scraper worker ready.", file=sys.stderr)
+        for line in stdin or sys.stdin:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as e:
+                self._emit({"id": None, "type": "error", "error": f"Invalid request: {e}"})
+                continue
+            # Keep stray print() output from the scraper off the protocol stream
+            with redirect_stdout(sys.stderr):
+                self.handle(request)
 
 
 def main():
+    if "--worker" in sys.argv:
+        ScraperWorker(concurrency=int(os.getenv("MLH_SCRAPER_CONCURRENCY", 4)), out=sys.stdout).serve()
+        return
+
     print("Starting MLH Hackathon Scraper with Cache System...")
     print("=" * 60)
 
     scraper = MLHHackathonScraper()
-    cached_data = scraper.load_cache()
+    header = scraper.cached_header()
 
-    if cached_data:
-        print(f"Loaded {len(cached_data)} cached hackathons.")
+    if header:
+        print(f"Loaded {header.get('count')} cached hackathons.")
         return
 
     # Fresh scrape
@@ -2,11 +2,34 @@ import fetch from "node-fetch";
 
 const EMBEDDING_URL = process.env.EMBEDDING_API_URL; // Railway URL
 
+// Ask the service for raw little-endian float32 rows instead of JSON float lists
+const BINARY_HEADERS = {
+  "Content-Type": "application/json",
+  Accept: "application/octet-stream, application/json;q=0.5",
+  "X-Embedding-Dtype": "float32",
+};
+
+/**
+ * Decode an embedding response into an array of plain number arrays.
+ * Falls back to JSON for services that do not speak the binary format.
+ */
+async function readEmbeddingRows(response, jsonKey) {
+  if (!response.headers.get("content-type")?.includes("application/octet-stream")) {
+    const data = await response.json();
+    return jsonKey === "embedding" ? [data.embedding] : data[jsonKey];
+  }
+
+  const [rows, dim] = response.headers.get("x-embedding-shape").split(",").map(Number);
+  const buffer = await response.arrayBuffer();
+  const values = new Float32Array(buffer, 0, rows * dim);
+  return Array.from({ length: rows }, (_, i) => Array.from(values.subarray(i * dim, (i + 1) * dim)));
+}
+
 export async function getEmbedding(text) {
   try {
     const response = await fetch(`${EMBEDDING_URL}/embed`, {
       method: "POST",
-      headers: { "Content-Type": "application/json" },
+      headers: BINARY_HEADERS,
       body: JSON.stringify({ text }),
     });
 
@@ -14,14 +37,86 @@ export async function getEmbedding(text) {
       throw new Error(`Embedding service error: ${response.status}`);
     }
 
-    const data = await response.json();
-    return data.embedding;
+    const [embedding] = await readEmbeddingRows(response, "embedding");
+    return embedding;
   } catch (err) {
     console.error("Embedding service error:", err.message);
     throw new Error("Embedding service unavailable");
   }
 }
 
+export async function getEmbeddings(texts) {
+  try {
+    const response = await fetch(`${EMBEDDING_URL}/embed_batch`, {
+      method: "POST",
+      headers: BINARY_HEADERS,
+      body: JSON.stringify({ texts }),
+    });
+
+    if (!response.ok) {
+      throw new Error(`Embedding service error: ${response.status}`);
+    }
+
+    return await readEmbeddingRows(response, "embeddings");
+  } catch (err) {
+    console.error("Embedding service error:", err.message);
+    throw new Error("Embedding service unavailable");
+  }
+}
+
+export async function upsertProfileVectors(items) {
+  const response = await fetch(`${EMBEDDING_URL}/index/upsert`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ items }),
+  });
+
+  if (!response.ok) throw new Error(`Index upsert error: ${response.status}`);
+  return response.json();
+}
+
+export async function deleteProfileVectors(ids) {
+  const response = await fetch(`${EMBEDDING_URL}/index/delete`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ ids }),
+  });
+
+  if (!response.ok) throw new Error(`Index delete error: ${response.status}`);
+  return response.json();
+}
+
+/**
+ * Top-k profile search in the embedding service.
+ * Returns { results: [{ id, score }], missing: [ids not yet indexed] }.
+ */
+export async function searchProfiles(vector, ids, k = 15) {
+  const response = await fetch(`${EMBEDDING_URL}/search`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ vector, ids, k }),
+  });
+
+  if (!response.ok) throw new Error(`Search service error: ${response.status}`);
+  return response.json();
+}
+
+/**
+ * Top-k upcoming hackathons for a profile vector from the embedding service.
+ * Passing userId lets the service cache the user's scores between calls.
+ * Options: { k, online, start_after, start_before, exclude }.
+ * Returns { results: [{ id, score, title, url, source, start_date, ... }], cached, events }.
+ */
+export async function recommendEvents(userId, vector, options = {}) {
+  const response = await fetch(`${EMBEDDING_URL}/recommend`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ user_id: userId, vector, ...options }),
+  });
+
+  if (!response.ok) throw new Error(`Recommend service error: ${response.status}`);
+  return response.json();
+}
 
 export async function getSimilarity(vec1, vec2) {
   try {
@@ -41,6 +136,29 @@ export async function getSimilarity(vec1, vec2) {
   }
 }
 
+/**
+ * Similarity of one vector (or several) against many in a single request.
+ * Returns a matrix of scores with one row per vector in `a`.
+ */
+export async function getSimilarityMatrix(a, b) {
+  try {
+    const response = await fetch(`${EMBEDDING_URL}/similarity_matrix`, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ a, b }),
+    });
+
+    if (!response.ok) throw new Error("Similarity service error");
+
+    const data = await response.json();
+    return data.scores;
+  } catch (err) {
+    console.warn("Similarity service down → using local fallback");
+    const rows = Array.isArray(a[0]) ? a : [a];
+    return rows.map((row) => b.map((vec) => computeCosineSimilarity(row, vec)));
+  }
+}
+
 function computeCosineSimilarity(vec1, vec2) {
   const minLen = Math.min(vec1.length, vec2.length);
   const a = vec1.slice(0, minLen);
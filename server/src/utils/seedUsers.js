@@ -1,6 +1,6 @@
 import mongoose from "mongoose";
 import User from "../models/User.js";
-import { getEmbedding } from "./embeddingClient.js";
+import { getEmbeddings } from "./embeddingClient.js";
 import dotenv from "dotenv";
 dotenv.config();
 
@@ -89,18 +89,20 @@ async function seedUsers() {
     console.log("🧠 Generating embeddings via Flask service...");
     const createdUsers = [];
 
-    for (const user of mockUsers) {
-      try {
-        // Combine all text fields for embedding
-        const combinedText = [
-          user.bio,
-          ...user.skills,
-          ...user.interests,
-          ...user.preferredRoles,
-        ].join(" ");
+    // Combine all text fields for embedding and encode every user in one request
+    const combinedTexts = mockUsers.map((user) =>
+      [
+        user.bio,
+        ...user.skills,
+        ...user.interests,
+        ...user.preferredRoles,
+      ].join(" ")
+    );
+    const embeddings = await getEmbeddings(combinedTexts);
 
-        const embedding = await getEmbedding(combinedText);
-        user.profileEmbedding = embedding;
+    for (const [i, user] of mockUsers.entries()) {
+      try {
+        user.profileEmbedding = embeddings[i];
         user.googleId = undefined; // avoid unique null duplicate
         user.githubId = undefined; // avoid unique null duplicate
 
@@ -0,0 +1,5 @@
+import os
+import sys
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [SERVER_DIR, os.path.join(SERVER_DIR, "scripts"), os.path.join(SERVER_DIR, "src", "services")]
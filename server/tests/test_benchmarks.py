@@ -0,0 +1,48 @@
+import json
+
+from benchmarks.harness import compare, load_metrics, metric, run_load, save_results
+
+
+def test_compare_flags_regressions_in_the_metrics_direction():
+    baseline = {
+        "api.p50_ms": metric(10, "ms"),
+        "api.throughput_rps": metric(100, "req/s", "higher"),
+        "api.error_rate": metric(0, "ratio"),
+        "encode.texts_per_s": metric(50, "texts/s", "higher"),
+        "gone.p50_ms": metric(1, "ms"),
+    }
+    current = {
+        "api.p50_ms": metric(13, "ms"),  # 30% slower
+        "api.throughput_rps": metric(90, "req/s", "higher"),  # 10% less, within tolerance
+        "api.error_rate": metric(0.01, "ratio"),
+        "encode.texts_per_s": metric(30, "texts/s", "higher"),
+        "new.p50_ms": metric(1, "ms"),
+    }
+    rows = {row["name"]: row for row in compare(baseline, current, tolerance=0.2)}
+
+    assert set(rows) == {"api.p50_ms", "api.throughput_rps", "api.error_rate", "encode.texts_per_s"}
+    assert rows["api.p50_ms"]["regression"]
+    assert not rows["api.throughput_rps"]["regression"]
+    assert rows["api.error_rate"]["regression"]
+    assert rows["encode.texts_per_s"]["regression"]
+    assert abs(rows["api.p50_ms"]["change"] - 0.3) < 1e-9
+
+
+def test_run_load_counts_every_request_and_error():
+    result = run_load(lambda i: i % 10 != 0, requests=100, concurrency=4)
+    assert len(result["latencies"]) == 100
+    assert result["errors"] == 10
+
+    metrics = load_metrics("x", result)
+    assert metrics["x.error_rate"]["value"] == 0.1
+    assert metrics["x.p50_ms"]["value"] <= metrics["x.p99_ms"]["value"]
+    assert metrics["x.throughput_rps"]["better"] == "higher"
+
+
+def test_results_round_trip(tmp_path):
+    path = tmp_path / "baseline.json"
+    save_results(str(path), {"b": metric(2, "ms"), "a": metric(1, "ms")}, {"runs": 3})
+    payload = json.loads(path.read_text())
+    assert list(payload["metrics"]) == ["a", "b"]
+    assert payload["config"] == {"runs": 3}
+    assert payload["environment"]["cpu_count"]
@@ -0,0 +1,77 @@
+import os
+
+import pytest
+
+mongomock = pytest.importorskip("mongomock")
+pytest.importorskip("pymongo")
+
+from data_import import Checkpoint, run_import  # noqa: E402
+
+
+def make_events(n, prize=1000):
+    return [{"id": f"devpost-{i}", "source": "devpost", "title": f"Hack {i}",
+             "start_date": "2026-03-01", "deadline": "2026-03-03", "prize_amount": prize}
+            for i in range(n)]
+
+
+def interrupted(records, after):
+    """Yield the first `after` records, then fail like a crashed read."""
+    for i, record in enumerate(records):
+        if i == after:
+            raise RuntimeError("interrupted")
+        yield record
+
+
+@pytest.fixture
+def collection():
+    collection = mongomock.MongoClient().db.events
+    collection.create_index([("platform", 1), ("externalId", 1)], unique=True)
+    return collection
+
+
+def run(collection, checkpoint_path, records, fingerprint="v1"):
+    return run_import([("devpost", "events", fingerprint, records)], collection,
+                      Checkpoint(checkpoint_path), chunk_size=3, workers=0)
+
+
+def test_interrupted_import_resumes_from_the_saved_offset(collection, tmp_path):
+    path = str(tmp_path / "import.ckpt")
+    # devpost-1 appears again after the interruption: still a duplicate on resume
+    records = make_events(10) + [make_events(2, prize=5)[1]]
+
+    with pytest.raises(RuntimeError):
+        run(collection, path, interrupted(records, 7))
+    assert collection.count_documents({}) == 6
+
+    totals = run(collection, path, records)
+    assert totals["resumed"] == 6
+    assert totals["written"] == 4 and totals["duplicates"] == 1
+    assert collection.count_documents({}) == 10
+    assert collection.find_one({"externalId": "1"})["prize"] == 1000
+    # Keys are dropped once the source is finished
+    assert os.path.getsize(path + ".keys") == 0
+
+
+def test_changed_source_is_imported_again_with_its_updates(collection, tmp_path):
+    path = str(tmp_path / "import.ckpt")
+    run(collection, path, make_events(5))
+
+    unchanged = run(collection, path, make_events(5))
+    assert unchanged["resumed"] == 5 and unchanged["written"] == 0
+
+    refreshed = make_events(5)
+    refreshed[2]["prize_amount"] = 2500
+    totals = run(collection, path, refreshed, fingerprint="v2")
+    assert totals["resumed"] == 0
+    assert totals["written"] == 5 and totals["duplicates"] == 0
+    assert collection.find_one({"externalId": "2"})["prize"] == 2500
+
+
+def test_upserts_are_idempotent(collection, tmp_path):
+    first = run(collection, None, make_events(5))
+    assert first["upserted"] == 5
+
+    again = run(collection, None, make_events(5), fingerprint="v2")
+    assert again["upserted"] == 0 and again["written"] == 5
+    assert collection.count_documents({}) == 5
+    assert collection.count_documents({"platform": "devpost", "createdAt": {"$exists": True}}) == 5
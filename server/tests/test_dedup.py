@@ -0,0 +1,134 @@
+import random
+
+import numpy as np
+
+from dedup import EventDeduper, minhash, shingles, title_core
+
+
+def event(event_id, title, source, start_date="2026-01-17", url="", **fields):
+    return {"id": event_id, "title": title, "source": source, "start_date": start_date, "url": url,
+            "description": "", "themes": [], **fields}
+
+
+def test_title_core_drops_years_and_generic_words():
+    assert title_core("Hoya Hacks 2026") == "hoya"
+    assert title_core("nwHacks") == "nw"
+    assert title_core("Hack the North") == "north"
+
+
+def test_minhash_is_deterministic_and_tracks_jaccard():
+    a, b = shingles("hacksussexgamejam"), shingles("sussexgamejam")
+    assert np.array_equal(minhash(a), minhash(set(a)))
+    agreement = (minhash(a) == minhash(b)).mean()
+    jaccard = len(a & b) / len(a | b)
+    assert abs(agreement - jaccard) < 0.25
+
+
+def test_merges_cross_source_duplicates_with_provenance():
+    events = [
+        event("mlh-a", "nwHacks", "mlh", url="https://nwhacks.io/", location="Vancouver"),
+        event("devpost-1", "nwHacks 2026", "devpost", url="https://nwhacks-2026.devpost.com/",
+              prize_amount=5000, themes=["Beginner Friendly"]),
+        event("mlh-b", "Hack the North", "mlh", start_date="2025-09-12"),
+    ]
+    merged = EventDeduper(use_embeddings=False).update(events)
+
+    # The group takes the place of its first member
+    assert [e["id"] for e in merged] == ["devpost-1", "mlh-b"]
+    canonical = next(e for e in merged if e["id"] == "devpost-1")
+    assert canonical["sources"] == ["devpost", "mlh"]
+    assert canonical["location"] == "Vancouver"  # filled in from the MLH listing
+    assert canonical["prize_amount"] == 5000
+    assert [(p["source"], p["id"]) for p in canonical["provenance"]] == [("devpost", "devpost-1"), ("mlh", "mlh-a")]
+    assert canonical["provenance"][1]["score"] >= 0.85
+
+
+def test_does_not_merge_same_source_or_distant_dates():
+    events = [
+        event("mlh-a", "Hoya Hacks", "mlh"),
+        event("mlh-b", "Hoya Hacks 2026", "mlh"),
+        event("devpost-1", "Hoya Hacks 2026", "devpost", start_date="2026-03-01"),
+    ]
+    deduper = EventDeduper(use_embeddings=False)
+    assert len(deduper.update(events)) == 3
+    assert deduper.stats()["groups"] == 0
+
+
+def test_same_source_listings_are_not_chained_through_a_shared_match():
+    events = [
+        event("mlh-a", "Hoya Hacks", "mlh"),
+        event("mlh-b", "Hoya Hacks 2026", "mlh"),
+        event("devpost-1", "Hoya Hacks", "devpost"),
+    ]
+    deduper = EventDeduper(use_embeddings=False)
+    merged = deduper.update(events)
+
+    # devpost-1 matches both MLH listings but only merges with one of them
+    assert len(merged) == 2
+    canonical = next(e for e in merged if e["id"] == "devpost-1")
+    assert [p["id"] for p in canonical["provenance"]] == ["devpost-1", "mlh-a"]
+    assert any(e["id"] == "mlh-b" and "provenance" not in e for e in merged)
+    assert deduper.stats()["groups"] == 1
+
+
+def test_missing_date_still_matches():
+    events = [event("mlh-a", "Hoya Hacks", "mlh"), event("devpost-1", "Hoya Hacks 2026", "devpost", start_date=None)]
+    assert len(EventDeduper(use_embeddings=False).update(events)) == 1
+
+
+def test_update_only_rechecks_new_or_changed_events():
+    rng = random.Random(3)
+    words = ["alpha", "bravo", "delta", "ember", "flux", "gamma", "helix", "ion", "jolt", "kilo", "lumen", "nova"]
+    events = []
+    for i in range(200):
+        title = f"{rng.choice(words).title()}{rng.choice(words)} Hacks {i}"
+        events.append(event(f"mlh-{i}", title, "mlh", start_date=f"2026-{1 + i % 12:02d}-{1 + i % 28:02d}"))
+    events.append(event("devpost-dup", events[10]["title"], "devpost", start_date=events[10]["start_date"]))
+
+    deduper = EventDeduper(use_embeddings=False)
+    first = deduper.update(events)
+    assert len(first) == len(events) - 1
+    assert deduper.stats()["checked"] == len(events)
+
+    # Non-matching fields changing does not trigger a re-check
+    events[5] = {**events[5], "registration_count": 99}
+    second = deduper.update(events)
+    assert deduper.stats()["checked"] == 0
+    assert next(e for e in second if e["id"] == "mlh-5")["registration_count"] == 99
+
+    # Retitling the duplicate splits the group again; removing an event drops it
+    events[-1] = {**events[-1], "title": "Completely Different"}
+    del events[0]
+    third = deduper.update(events)
+    assert deduper.stats()["checked"] == 1
+    assert deduper.stats()["removed"] == 1
+    assert len(third) == len(events)
+    assert deduper.stats()["groups"] == 0
+
+
+def test_gray_zone_uses_embeddings(monkeypatch):
+    import dedup
+
+    vectors = {"Quantum Jam": [1.0, 0.0], "Quantum Jam Live": [1.0, 0.0]}
+    monkeypatch.setattr(dedup, "embed_texts", lambda texts: np.array([vectors[t] for t in texts], dtype=np.float32))
+    events = [event("mlh-a", "Quantum Jam", "mlh"), event("devpost-1", "Quantum Jam Live", "devpost")]
+
+    without = EventDeduper(use_embeddings=False)
+    assert len(without.update(events)) == 2
+
+    with_embeddings = EventDeduper(use_embeddings=True)
+    assert len(with_embeddings.update(events)) == 1
+    assert with_embeddings.stats()["embeddings_used"]
+
+
+def test_embedding_failure_falls_back_to_strings(monkeypatch):
+    import dedup
+
+    def fail(texts):
+        raise ConnectionError("down")
+
+    monkeypatch.setattr(dedup, "embed_texts", fail)
+    deduper = EventDeduper(use_embeddings=True)
+    events = [event("mlh-a", "Quantum Jam", "mlh"), event("devpost-1", "Quantum Jam Live", "devpost")]
+    assert len(deduper.update(events)) == 2
+    assert deduper.stats()["embed_error"] == "down"
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from devpost_scraper import DevpostScraper
+
+
+def hackathon(n, title=None):
+    return {"id": n, "title": title or f"Hack {n}", "prize_amount": f"${n},000"}
+
+
+class StubDevpost:
+    """
+    Devpost API stand-in on localhost: serves `pages` (lists of hackathons),
+    answers If-None-Match with 304, and replays queued error statuses per page.
+    """
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.failures = {}
+        self.requests = []
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                page = int(parse_qs(urlparse(self.path).query)["page"][0])
+                with stub._lock:
+                    stub.requests.append((time.monotonic(), page, self.headers.get("If-None-Match")))
+                    queued = stub.failures.get(page)
+                    status = queued.pop(0) if queued else 200
+                if status != 200:
+                    self.send_response(status)
+                    if status == 429:
+                        self.send_header("Retry-After", "0")
+                    self.end_headers()
+                    return
+                hackathons = stub.pages[page - 1] if page <= len(stub.pages) else []
+                body = json.dumps({"hackathons": hackathons,
+                                   "meta": {"total_count": sum(map(len, stub.pages))}}).encode()
+                etag = '"%s"' % hashlib.sha1(body).hexdigest()
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/api/hackathons"
+        threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+
+    def requested_pages(self):
+        return [page for _, page, _ in self.requests]
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub():
+    stub = StubDevpost([[hackathon(3 * p + i) for i in range(1, 4)] for p in range(6)])
+    yield stub
+    stub.close()
+
+
+def test_concurrent_scrape_keeps_page_order_and_retries(stub):
+    stub.failures = {2: [429], 3: [503, 500], 5: [500, 502, 504]}
+    scraper = DevpostScraper(api_url=stub.url, max_retries=2, backoff=0.01, requests_per_second=0)
+
+    hackathons = scraper.scrape_all_hackathons(concurrency=4)
+
+    # Page 5 failed past max_retries and is skipped; everything else arrives in page order
+    assert [h["id"] for h in hackathons] == [n for n in range(1, 19) if n not in (13, 14, 15)]
+    assert hackathons[0]["prize_amount"] == 1000.0
+    pages = stub.requested_pages()
+    assert pages.count(2) == 2 and pages.count(3) == 3 and pages.count(5) == 3
+    assert pages.count(4) == 1 and pages[0] == 1
+
+
+def test_requests_are_spaced_by_the_rate_limit(stub):
+    scraper = DevpostScraper(api_url=stub.url, requests_per_second=20)
+
+    scraper.scrape_all_hackathons(concurrency=6)
+
+    starts = sorted(t for t, _, _ in stub.requests)
+    assert len(starts) == 6
+    # Six requests at 20/s need at least five 50 ms intervals, however many threads run
+    assert starts[-1] - starts[0] >= 5 * 0.05 * 0.8
+
+
+def test_incremental_sync_uses_etags_and_merges_changes_by_id(stub, tmp_path):
+    state_file = str(tmp_path / "sync_state.json")
+    stub.pages = [[hackathon(1), hackathon(2), hackathon(3)], [hackathon(4), hackathon(5), hackathon(6)]]
+    scraper = DevpostScraper(api_url=stub.url, requests_per_second=0)
+
+    first = scraper.incremental_sync(state_file)
+    assert [r["id"] for r in first["added"]] == [1, 2, 3, 4, 5, 6]
+    assert first["complete"] and first["pages_fetched"] == 2
+    saved = DevpostScraper.apply_delta([], first)
+
+    # Nothing changed: page 1 answers 304 to its ETag and the sync stops there
+    stub.requests.clear()
+    second = DevpostScraper(api_url=stub.url, requests_per_second=0).incremental_sync(state_file)
+    assert second["pages_not_modified"] == 1 and second["pages_fetched"] == 0
+    assert second["added"] == second["changed"] == second["removed"] == []
+    assert stub.requests[0][2] is not None and stub.requested_pages() == [1]
+
+    # Hack 2 is renamed, hack 5 removed and hack 7 published on a new page
+    stub.pages = [[hackathon(1), hackathon(2, "Renamed"), hackathon(3)], [hackathon(4), hackathon(6)], [hackathon(7)]]
+    third = DevpostScraper(api_url=stub.url, requests_per_second=0).incremental_sync(state_file, full=True)
+    assert [r["id"] for r in third["changed"]] == [2]
+    assert [r["id"] for r in third["added"]] == [7]
+    assert third["removed"] == ["5"] and third["complete"]
+
+    merged = DevpostScraper.apply_delta(saved, third)
+    assert [r["id"] for r in merged] == [1, 2, 3, 4, 6, 7]
+    assert merged[1]["title"] == "Renamed"
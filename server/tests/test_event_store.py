@@ -0,0 +1,186 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from event_store import BULK_THRESHOLD, EventStore, normalize_devpost, normalize_mlh
+
+
+def make_events(n, seed=0):
+    rng = random.Random(seed)
+    base = date(2025, 1, 1)
+    return [{
+        "id": f"e{i:04d}",
+        "title": f"Event {i}",
+        "source": rng.choice(["devpost", "mlh"]),
+        "status": rng.choice(["open", "upcoming", "ended"]),
+        "is_online": rng.random() < 0.4,
+        "prize_amount": rng.choice([0, 500, 5000, 20000, 80000]),
+        # Some events share a start date, some have none
+        "start_date": None if i % 17 == 0 else (base + timedelta(days=rng.randrange(60))).isoformat(),
+    } for i in range(n)]
+
+
+def expected(events, filters, start_from=None, start_to=None):
+    def sort_key(event):
+        start = event["start_date"]
+        return (date.fromisoformat(start).toordinal() if start else date.max.toordinal(), event["id"])
+
+    def matches(event):
+        if any(event.get(field) != value for field, value in filters.items()):
+            return False
+        start = event["start_date"] and date.fromisoformat(event["start_date"])
+        if start_from and (not start or start < start_from):
+            return False
+        return not (start_to and (not start or start > start_to))
+
+    return [event["id"] for event in sorted(filter(matches, events), key=sort_key)]
+
+
+def walk(store, filters, limit, **dates):
+    ids, cursor, pages = [], None, 0
+    while True:
+        page, cursor, total = store.query(filters, cursor=cursor, limit=limit, **dates)
+        ids.extend(event["id"] for event in page)
+        pages += 1
+        if cursor is None:
+            return ids, total, pages
+
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {"source": "mlh"},
+    {"source": "devpost", "is_online": True},
+    {"status": "open", "is_online": False, "source": "mlh"},
+])
+@pytest.mark.parametrize("limit", [1, 7, 1000])
+def test_cursor_pages_cover_every_match_once_in_order(filters, limit):
+    events = make_events(300)
+    store = EventStore()
+    store.upsert_many(events)
+
+    ids, total, pages = walk(store, filters, limit)
+    assert ids == expected(events, filters)
+    assert total == len(ids)
+    assert pages == max(1, -(-len(ids) // limit))
+
+
+def test_date_range_and_prize_bucket_filters():
+    events = make_events(300)
+    store = EventStore()
+    store.upsert_many(events)
+    start_from, start_to = date(2025, 1, 10), date(2025, 2, 5)
+
+    ids, total, _ = walk(store, {"is_online": True}, 5, start_from=start_from, start_to=start_to)
+    assert ids == expected(events, {"is_online": True}, start_from, start_to)
+    assert total == len(ids)
+
+    page, _, total = store.query({"prize_bucket": "50k+"}, limit=1000)
+    assert {e["id"] for e in page} == {e["id"] for e in events if e["prize_amount"] >= 50000}
+
+
+def test_unknown_filter_is_rejected():
+    with pytest.raises(ValueError):
+        EventStore().query({"organization": "x"})
+
+
+@pytest.mark.parametrize("batch", [5, BULK_THRESHOLD + 50])
+def test_updates_and_deletes_keep_posting_lists_consistent(batch):
+    events = make_events(300)
+    store = EventStore()
+    store.upsert_many(events)
+
+    rng = random.Random(1)
+    changed = []
+    for event in rng.sample(events, batch):
+        event = {**event, "source": "mlh" if event["source"] == "devpost" else "devpost",
+                 "start_date": (date(2025, 3, 1) + timedelta(days=rng.randrange(10))).isoformat()}
+        changed.append(event)
+    store.upsert_many(changed)
+    current = {e["id"]: e for e in events}
+    current.update((e["id"], e) for e in changed)
+
+    deleted = rng.sample(sorted(current), batch)
+    assert store.delete(deleted + ["missing"]) == batch
+    for event_id in deleted:
+        del current[event_id]
+
+    for filters in ({}, {"source": "mlh"}, {"source": "devpost", "status": "open"}):
+        ids, total, _ = walk(store, filters, 11)
+        assert ids == expected(list(current.values()), filters)
+        assert total == len(ids)
+    assert store.statistics()["total"] == len(current)
+
+
+def test_cursor_stays_valid_across_concurrent_inserts():
+    events = make_events(100)
+    store = EventStore()
+    store.upsert_many(events)
+    page, cursor, _ = store.query({}, limit=10)
+
+    # An event sorting before the cursor must not shift the next page
+    store.upsert({"id": "a-early", "title": "Early", "source": "mlh", "status": "open",
+                  "is_online": False, "prize_amount": 0, "start_date": "2024-01-01"})
+    next_page, _, _ = store.query({}, cursor=cursor, limit=10)
+    assert next_page[0]["id"] == expected(events, {})[10]
+
+
+def test_replace_all_skips_unchanged_and_drops_missing():
+    events = make_events(50)
+    store = EventStore()
+    store.replace_all(events)
+    version = store.version
+    assert store.replace_all(events) == 0 and store.version == version
+
+    assert store.replace_all(events[:40] + [{**events[40], "title": "Renamed"}]) == 1
+    assert len(store) == 41
+    assert store.get(events[40]["id"])["title"] == "Renamed"
+
+
+def test_normalizers_map_cached_records():
+    devpost = normalize_devpost({"devpostId": 7, "title": "Hack", "submissionPeriodDates": "Dec 28 - Jan 03, 2026",
+                                 "displayedLocation": "Online", "themes": [{"name": "AI"}]})
+    assert devpost["id"] == "devpost-7"
+    assert devpost["start_date"] == "2025-12-28" and devpost["deadline"] == "2026-01-03"
+    assert devpost["is_online"] and devpost["themes"] == ["AI"]
+
+    mlh = normalize_mlh({"name": "HackX", "url": "https://hackx.io", "start_date": "2026-02-01",
+                         "end_date": "2026-02-02", "location": "Digital"})
+    assert mlh["id"] == "mlh-https://hackx.io" and mlh["is_online"]
+
+
+def test_statuses_roll_over_with_the_date():
+    today = date.today()
+    store = EventStore()
+    store.upsert_many([
+        normalize_mlh({"url": "https://a", "name": "A", "start_date": (today + timedelta(days=1)).isoformat(),
+                       "end_date": (today + timedelta(days=2)).isoformat()}),
+        {"id": "undated", "title": "Undated", "source": "mlh", "status": "open", "is_online": False,
+         "prize_amount": 0, "start_date": None},
+    ])
+    assert store.get("mlh-https://a")["status"] == "upcoming"
+    assert store.refresh_statuses(today) == 0
+
+    version = store.version
+    assert store.refresh_statuses(today + timedelta(days=1)) == 1
+    assert store.get("mlh-https://a")["status"] == "open"
+    assert store.statistics()["by_status"] == {"open": 2}
+    assert store.version > version
+
+    assert store.refresh_statuses(today + timedelta(days=5)) == 1
+    assert store.query({"status": "ended"})[2] == 1
+    assert store.get("undated")["status"] == "open"
+
+
+def test_devpost_json_timestamp_is_cached_by_mtime(tmp_path):
+    import json
+    import os
+
+    from event_store import _devpost_json_timestamp
+
+    path = tmp_path / "devpost.json"
+    path.write_text(json.dumps({"timestamp": 100, "events": []}))
+    assert _devpost_json_timestamp(str(path)) == 100
+    path.write_text(json.dumps({"timestamp": 200, "events": []}))
+    os.utime(path, (1, 1))
+    assert _devpost_json_timestamp(str(path)) == 200
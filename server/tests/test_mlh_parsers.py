@@ -0,0 +1,26 @@
+import pytest
+
+from mlh_parser_bench import EXPECTED, load_fixture
+from mlh_scraper import PARSER_BACKENDS, MLHHackathonScraper, iter_records
+
+# Backends that need an optional package; strainer falls back to html.parser without lxml
+REQUIRES = {"lxml": "lxml", "selectolax": "selectolax"}
+
+
+@pytest.fixture(scope="module")
+def html():
+    return load_fixture()
+
+
+@pytest.fixture(scope="module")
+def expected():
+    return list(iter_records(EXPECTED))
+
+
+@pytest.mark.parametrize("backend", PARSER_BACKENDS)
+def test_every_backend_parses_the_fixture_identically(backend, html, expected):
+    if backend in REQUIRES:
+        pytest.importorskip(REQUIRES[backend])
+    events = MLHHackathonScraper(parser=backend).parse_events(html)
+    assert len(events) == len(expected) > 0
+    assert events == expected
@@ -0,0 +1,70 @@
+import json
+import os
+
+import pytest
+
+from ndjson_cache import HEADER_WIDTH, NdjsonWriter, append_records, iter_records, read_header, write_cache
+
+
+def test_round_trip_fills_in_count_and_keeps_header_width(tmp_path):
+    path = str(tmp_path / "cache.ndjson")
+    records = [{"title": f"Hack {i}", "name": "ünïcode"} for i in range(5)]
+    assert write_cache(path, iter(records), source="mlh", seasons=["2026"]) == 5
+
+    header = read_header(path)
+    assert header["count"] == 5 and header["source"] == "mlh" and header["seasons"] == ["2026"]
+    with open(path, "rb") as f:
+        assert len(f.readline()) == HEADER_WIDTH
+    assert list(iter_records(path)) == records
+
+
+def test_failed_write_leaves_previous_cache_and_no_temp_files(tmp_path):
+    path = str(tmp_path / "cache.ndjson")
+    write_cache(path, [{"title": "old"}], source="mlh")
+
+    with pytest.raises(RuntimeError):
+        with NdjsonWriter(path, source="mlh") as writer:
+            writer.write({"title": "new"})
+            raise RuntimeError("scrape failed")
+
+    assert [r["title"] for r in iter_records(path)] == ["old"]
+    assert os.listdir(tmp_path) == ["cache.ndjson"]
+
+
+def test_discard_keeps_previous_cache(tmp_path):
+    path = str(tmp_path / "cache.ndjson")
+    write_cache(path, [{"title": "old"}], source="mlh")
+    with NdjsonWriter(path, source="mlh") as writer:
+        writer.write({"title": "new"})
+        writer.discard()
+    assert [r["title"] for r in iter_records(path)] == ["old"]
+    assert os.listdir(tmp_path) == ["cache.ndjson"]
+
+
+def test_readers_see_the_old_file_until_commit(tmp_path):
+    path = str(tmp_path / "cache.ndjson")
+    write_cache(path, [{"title": "old"}], source="mlh")
+    with NdjsonWriter(path, source="mlh") as writer:
+        writer.write({"title": "new"})
+        assert [r["title"] for r in iter_records(path)] == ["old"]
+    assert [r["title"] for r in iter_records(path)] == ["new"]
+
+
+def test_append_and_invalid_files(tmp_path):
+    path = str(tmp_path / "cache.ndjson")
+    write_cache(path, [{"title": "a"}], source="devpost")
+    assert append_records(path, [{"title": "b"}]) == 1
+    assert [r["title"] for r in iter_records(path)] == ["a", "b"]
+
+    plain = tmp_path / "plain.json"
+    plain.write_text(json.dumps({"events": []}))
+    assert read_header(str(plain)) is None
+    assert read_header(str(tmp_path / "missing.ndjson")) is None
+    with pytest.raises(ValueError):
+        list(iter_records(str(plain)))
+
+
+def test_oversized_header_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        write_cache(str(tmp_path / "c.ndjson"), [], source="mlh", note="x" * HEADER_WIDTH)
+    assert os.listdir(tmp_path) == []
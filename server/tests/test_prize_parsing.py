@@ -0,0 +1,36 @@
+import re
+
+import pandas as pd
+import pytest
+
+from devpost_scraper import DevpostScraper
+from event_stats import parse_prize_amounts
+
+# Prize strings as Devpost has served them, including ones that never parsed
+SAMPLES = [
+    "$10,000", "<span data-currency-value>5,000</span>", "€2,500", "£ 750", " $1,500.50 ",
+    "10 000", "5k in prizes", "$5 000", "<b>$</b>", "", None, 0, 1200, "12,345.67",
+]
+
+
+def legacy_parse(prize_str):
+    """_parse_prize_amount before it was precompiled: tags, symbols and commas out, then strip()."""
+    if not prize_str:
+        return 0.0
+    prize_str = re.sub(r'<[^>]+>', '', str(prize_str))
+    prize_str = prize_str.replace('$', '').replace(',', '').replace('€', '').replace('£', '').strip()
+    try:
+        return float(prize_str)
+    except (ValueError, TypeError):
+        return 0.0
+
+
+@pytest.mark.parametrize("prize", SAMPLES)
+def test_prize_parsing_matches_the_legacy_parser(prize):
+    assert DevpostScraper()._parse_prize_amount(prize) == legacy_parse(prize)
+
+
+def test_vectorized_prize_parsing_matches_the_legacy_parser():
+    parsed = parse_prize_amounts(pd.Series(SAMPLES, dtype=object))
+    assert parsed.tolist() == [legacy_parse(prize) for prize in SAMPLES]
+    assert legacy_parse("10 000") == 0.0 and legacy_parse("$10,000") == 10000.0
@@ -0,0 +1,42 @@
+from flask import Flask, jsonify
+
+from response_cache import ResponseCache
+
+
+def make_app():
+    app = Flask(__name__)
+    cache = ResponseCache()
+    state = {"calls": 0, "degraded": False}
+
+    @app.route("/search")
+    @cache.cached(lambda: 1)
+    def search():
+        state["calls"] += 1
+        response = jsonify({"semantic": not state["degraded"], "call": state["calls"]})
+        if state["degraded"]:
+            response.headers["Cache-Control"] = "no-store"
+        return response
+
+    return app.test_client(), cache, state
+
+
+def test_responses_are_cached_per_version():
+    client, cache, state = make_app()
+    first = client.get("/search?q=ai")
+    second = client.get("/search?q=ai")
+    assert first.get_json() == second.get_json() == {"semantic": True, "call": 1}
+    assert cache.hits == 1
+    assert client.get("/search?q=ai", headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+
+
+def test_no_store_responses_are_not_cached():
+    client, cache, state = make_app()
+    state["degraded"] = True
+    degraded = client.get("/search?q=ai")
+    assert degraded.get_json()["semantic"] is False
+    assert "ETag" not in degraded.headers
+
+    # The dependency recovered: the next request is rebuilt, not served from the cache
+    state["degraded"] = False
+    assert client.get("/search?q=ai").get_json() == {"semantic": True, "call": 2}
+    assert cache.stats()["entries"] == 1